@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+ETL performance benchmark — runs the data-loader against fixtures/csv/ repeatedly
+and fails when it got slower than the stored baseline.
+
+Each run resets a dedicated emulator project (`demo-project-bench`), then runs
+`main.py --to-firestore` exactly like the `pipeline_result` fixture, streamed through
+tests/_etl_log.py so per-stage durations come from the same parser the tests use.
+Warmup runs are discarded; the measured runs are reduced to medians:
+
+  wall seconds, extract / transform / load / verify seconds,
+  records/sec and products/sec (from the loader's own "N records" / "N products" lines),
+  peak RSS of the data-loader process tree
+
+Every benchmark is appended to benchmarks/pipeline_history.json together with the
+data-loader source fingerprint. Baselines are kept per host and input data set
+(timings are only comparable on the same machine and CSVs). The first benchmark
+of a host / data set pair becomes its baseline; `--update-baseline` replaces it,
+accepting an intended slowdown: the regressions are listed but the run exits 0.
+
+A regression fails the benchmark (exit code 1) if any of these medians exceeds the
+baseline by more than `--threshold` (default 0.10 = 10%): wall time, or a stage
+whose absolute increase is also above MIN_STAGE_DELTA seconds (so short stages
+do not fail on noise).
+
+Usage:
+    python scripts/bench_pipeline.py [--runs 5] [--warmup 1] [--threshold 0.10]
+                                     [--input-dir fixtures/csv] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Allow `python scripts/bench_pipeline.py` to import the shared test helpers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT       = INTEGRATION_DIR.parent
+DATA_LOADER_DIR = REPO_ROOT / "grohe-neo-data-loader"
+FIXTURES_CSV    = INTEGRATION_DIR / "fixtures" / "csv"
+HISTORY_FILE    = INTEGRATION_DIR / "benchmarks" / "pipeline_history.json"
+RUNS_DIR        = INTEGRATION_DIR / "reports" / "bench"
+
+if platform.system() == "Windows":
+    DATA_LOADER_PYTHON = DATA_LOADER_DIR / ".venv" / "Scripts" / "python.exe"
+else:
+    DATA_LOADER_PYTHON = DATA_LOADER_DIR / ".venv" / "bin" / "python"
+if not DATA_LOADER_PYTHON.exists():
+    DATA_LOADER_PYTHON = Path(sys.executable)
+
+BENCH_PROJECT   = "demo-project-bench"
+RUN_TIMEOUT     = 1800
+MIN_STAGE_DELTA = 5.0   # seconds — stage regressions smaller than this are noise
+STAGES          = ("extract:", "transform", "load:", "verify")
+
+
+# ── One run ───────────────────────────────────────────────────────────────────
+
+def run_once(client, input_dir: Path, label: str, host: str) -> dict:
+    from tests._etl_log import run_streamed
+    from tests._reset import reset_firestore
+
+    reset_firestore(client)
+    env = {
+        **os.environ,
+        "FIRESTORE_EMULATOR_HOST": host,
+        "GCLOUD_PROJECT":          BENCH_PROJECT,
+        "PYTHONUTF8":              "1",
+    }
+    proc = run_streamed(
+        [str(DATA_LOADER_PYTHON), "main.py",
+         "--input-dir", str(input_dir),
+         "--to-firestore", "--firestore-emulator",
+         "--log-level", "INFO"],
+        cwd=DATA_LOADER_DIR, env=env,
+        log_dir=RUNS_DIR / label, timeout=RUN_TIMEOUT,
+    )
+    s = proc.summary
+    if proc.returncode != 0 or not s.completed:
+        raise RuntimeError(f"{label}: data-loader failed\n{s}")
+
+    metrics = {"wall": s.seconds}
+    for prefix in STAGES:
+        metrics[prefix.rstrip(":")] = s.stage_seconds(prefix)
+    metrics["records"]  = s.records
+    metrics["products"] = s.products
+    metrics["records_per_sec"]  = round(s.records / s.seconds, 1) if s.records else None
+    metrics["products_per_sec"] = round(s.products / s.seconds, 1) if s.products else None
+    metrics["peak_rss_mb"]      = s.peak_rss_mb
+    return metrics
+
+
+def medians(runs: list) -> dict:
+    out = {}
+    for key in runs[0]:
+        values = [r[key] for r in runs if r.get(key) is not None]
+        out[key] = round(statistics.median(values), 3) if values else None
+    if len(runs) > 1:
+        out["wall_stdev"] = round(statistics.stdev(r["wall"] for r in runs), 3)
+    return out
+
+
+# ── History ───────────────────────────────────────────────────────────────────
+
+def load_history() -> dict:
+    try:
+        return json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"baselines": {}, "history": []}
+
+
+def save_history(history: dict) -> None:
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    HISTORY_FILE.write_text(json.dumps(history, indent=2), encoding="utf-8")
+
+
+def regressions(current: dict, baseline: dict, threshold: float) -> list:
+    """Human-readable regression lines; empty when within threshold."""
+    found = []
+    for key in ("wall", *(p.rstrip(":") for p in STAGES)):
+        now, then = current.get(key), baseline.get(key)
+        if now is None or not then:
+            continue
+        delta = now - then
+        if delta / then > threshold and (key == "wall" or delta > MIN_STAGE_DELTA):
+            found.append(f"{key}: {then:.1f}s → {now:.1f}s (+{delta / then:.0%}, threshold {threshold:.0%})")
+    return found
+
+
+def print_table(current: dict, baseline: dict) -> None:
+    def fmt(value) -> str:
+        return "-" if value is None else f"{value:,.2f}"
+
+    print(f"  {'metric':<18} {'median':>12} {'baseline':>12} {'change':>8}")
+    for key, now in current.items():
+        then = baseline.get(key) if baseline else None
+        change = f"{(now - then) / then:+.0%}" if now is not None and then else ""
+        print(f"  {key:<18} {fmt(now):>12} {fmt(then):>12} {change:>8}")
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ETL pipeline against a stored baseline.")
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="Discarded warmup runs (default: 1)")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed median slowdown vs baseline, as a fraction (default: 0.10)")
+    parser.add_argument("--input-dir", type=Path, default=FIXTURES_CSV,
+                        help="CSV directory passed to main.py (default: fixtures/csv)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store this result as the new baseline for this host and data set")
+    parser.add_argument("--host", default=os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080"),
+                        help="Firestore emulator host:port (default: localhost:8080)")
+    args = parser.parse_args()
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+
+    os.environ["FIRESTORE_EMULATOR_HOST"] = args.host
+    from google.cloud import firestore
+
+    from tests._etl_cache import fixtures_fingerprint, source_fingerprint
+
+    client = firestore.Client(project=BENCH_PROJECT)
+    input_dir = args.input_dir.resolve()
+
+    runs = []
+    for i in range(args.warmup + args.runs):
+        warm = i < args.warmup
+        label = f"warmup-{i + 1}" if warm else f"run-{i - args.warmup + 1}"
+        start = time.perf_counter()
+        metrics = run_once(client, input_dir, label, args.host)
+        print(f"→ {label:<9} {time.perf_counter() - start:7.1f}s  "
+              f"transform={metrics['transform']}s load={metrics['load']}s", flush=True)
+        if not warm:
+            runs.append(metrics)
+
+    current = medians(runs)
+    node = platform.node()
+    entry = {
+        "time":      time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host":      node,
+        "python":    platform.python_version(),
+        "input_dir": str(input_dir),
+        "source":    source_fingerprint(DATA_LOADER_DIR)[:16],
+        "fixtures":  fixtures_fingerprint(input_dir)[:16],
+        "runs":      runs,
+        "median":    current,
+    }
+
+    history = load_history()
+    baseline_key = f"{node}/{entry['fixtures']}"
+    baseline = history["baselines"].get(baseline_key)
+
+    print(f"\nETL benchmark — {args.runs} runs after {args.warmup} warmup, host {node}")
+    print_table(current, baseline["median"] if baseline else None)
+
+    found = regressions(current, baseline["median"], args.threshold) if baseline else []
+    entry["regressions"] = found
+    history["history"].append(entry)
+    if args.update_baseline or not baseline:
+        history["baselines"][baseline_key] = entry
+        print("✓ Stored as baseline for this host.")
+    save_history(history)
+
+    if found:
+        verdict = "! Slowdown accepted" if args.update_baseline else "✗ Performance regression"
+        print(f"\n{verdict} against the previous baseline "
+              f"({baseline['time']}, source {baseline['source']}):")
+        for line in found:
+            print(f"  {line}")
+        return 0 if args.update_baseline else 1
+    print(f"\n✓ No regression. History: {HISTORY_FILE.relative_to(INTEGRATION_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
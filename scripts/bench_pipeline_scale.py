@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+ETL scaling benchmark — how data-loader runtime and peak memory grow with the
+batch size.
+
+For every scale factor (default 1 2 5 10) a batch is generated from fixtures/csv/
+by scripts/scale_fixtures.py (fixtures/csv-scale/x<scale>/, reused while the source
+and seed are unchanged) and loaded with the same run as `make bench-pipeline`
+(scripts/bench_pipeline.py: dedicated `demo-project-bench` emulator project,
+streamed output, per-stage timings, peak RSS of the loader's process tree).
+
+Results:
+  reports/bench/scale.json   one entry per scale — products, medians of every metric
+  reports/bench/scale.svg    runtime and peak memory against products, log-log
+
+A flat products/sec column means linear scaling; a falling one shows where the
+loader or the emulator stops keeping up.
+
+Usage:
+    python scripts/bench_pipeline_scale.py [--scales 1 2 5 10] [--runs 1] [--seed 1]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+# Allow `python scripts/bench_pipeline_scale.py` to import the shared test helpers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pipeline import BENCH_PROJECT, FIXTURES_CSV, RUNS_DIR, medians, run_once   # noqa: E402
+from scale_fixtures import BatchModel, ensure_batch   # noqa: E402
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+RESULT_FILE     = RUNS_DIR / "scale.json"
+PLOT_FILE       = RUNS_DIR / "scale.svg"
+
+
+# ── Plot ──────────────────────────────────────────────────────────────────────
+
+PANEL_W, PANEL_H, MARGIN = 420, 280, 56
+SERIES = (("wall", "runtime (s)", "#1f77b4"), ("peak_rss_mb", "peak RSS (MB)", "#d62728"))
+
+
+def _log_ticks(lo: float, hi: float) -> list:
+    ticks = [m * 10 ** e for e in range(math.floor(math.log10(lo)), math.ceil(math.log10(hi)) + 1)
+             for m in (1, 2, 5)]
+    return [t for t in ticks if lo <= t <= hi] or [lo, hi]
+
+
+def render_svg(points: list) -> str:
+    """Two log-log panels — runtime and peak RSS against products — as standalone SVG."""
+    parts = []
+    width = len(SERIES) * (PANEL_W + MARGIN) + MARGIN
+    for i, (key, label, colour) in enumerate(SERIES):
+        data = [(p["products"], p[key]) for p in points if p.get(key) and p.get("products")]
+        x0, y0 = MARGIN + i * (PANEL_W + MARGIN), MARGIN
+        parts.append(f'<text x="{x0 + PANEL_W / 2}" y="{y0 - 20}" text-anchor="middle" '
+                     f'font-weight="bold">{label} vs products</text>')
+        parts.append(f'<rect x="{x0}" y="{y0}" width="{PANEL_W}" height="{PANEL_H}" fill="none" stroke="#888"/>')
+        if not data:
+            parts.append(f'<text x="{x0 + PANEL_W / 2}" y="{y0 + PANEL_H / 2}" text-anchor="middle">no data</text>')
+            continue
+        xs, ys = [d[0] for d in data], [d[1] for d in data]
+        xlo, xhi = min(xs) / 1.3, max(xs) * 1.3
+        ylo, yhi = min(ys) / 1.3, max(ys) * 1.3
+
+        def px(x, lo=xlo, hi=xhi):
+            return x0 + PANEL_W * (math.log(x / lo) / math.log(hi / lo))
+
+        def py(y, lo=ylo, hi=yhi):
+            return y0 + PANEL_H * (1 - math.log(y / lo) / math.log(hi / lo))
+
+        for t in _log_ticks(xlo, xhi):
+            parts.append(f'<line x1="{px(t):.1f}" y1="{y0}" x2="{px(t):.1f}" y2="{y0 + PANEL_H}" stroke="#eee"/>')
+            parts.append(f'<text x="{px(t):.1f}" y="{y0 + PANEL_H + 16}" text-anchor="middle">{t:,.0f}</text>')
+        for t in _log_ticks(ylo, yhi):
+            parts.append(f'<line x1="{x0}" y1="{py(t):.1f}" x2="{x0 + PANEL_W}" y2="{py(t):.1f}" stroke="#eee"/>')
+            parts.append(f'<text x="{x0 - 6}" y="{py(t) + 4:.1f}" text-anchor="end">{t:g}</text>')
+        line = " ".join(f"{px(x):.1f},{py(y):.1f}" for x, y in data)
+        parts.append(f'<polyline points="{line}" fill="none" stroke="{colour}" stroke-width="2"/>')
+        for x, y in data:
+            parts.append(f'<circle cx="{px(x):.1f}" cy="{py(y):.1f}" r="4" fill="{colour}">'
+                         f'<title>{x:,} products: {y:g}</title></circle>')
+    height = PANEL_H + 2 * MARGIN
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'font-family="sans-serif" font-size="11">\n'
+            f'<rect width="100%" height="100%" fill="white"/>\n' + "\n".join(parts) + "\n</svg>\n")
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ETL runtime and peak memory against batch size.")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 2, 5, 10],
+                        help="Scale factors vs fixtures/csv (default: 1 2 5 10)")
+    parser.add_argument("--runs", type=int, default=1, help="Measured runs per scale (default: 1)")
+    parser.add_argument("--seed", type=int, default=1, help="Generator seed (default: 1)")
+    parser.add_argument("--host", default=os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080"),
+                        help="Firestore emulator host:port (default: localhost:8080)")
+    args = parser.parse_args()
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+
+    os.environ["FIRESTORE_EMULATOR_HOST"] = args.host
+    from google.cloud import firestore
+
+    client = firestore.Client(project=BENCH_PROJECT)
+    source = FIXTURES_CSV.resolve()
+
+    points = []
+    for scale in sorted(set(args.scales)):
+        batch = ensure_batch(source, scale, args.seed)
+        if scale == 1:
+            products = BatchModel(batch).stats()["skus"]
+        else:
+            products = json.loads((batch / "scale.json").read_text(encoding="utf-8"))["generated"]["skus"]
+        runs = []
+        for i in range(args.runs):
+            label = f"scale-x{scale:g}-{i + 1}"
+            start = time.perf_counter()
+            runs.append(run_once(client, batch, label, args.host))
+            print(f"→ {label:<16} {time.perf_counter() - start:8.1f}s  peak {runs[-1]['peak_rss_mb']} MB", flush=True)
+        point = {"scale": scale, "input_dir": str(batch), **medians(runs), "products": products}
+        points.append(point)
+
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    RESULT_FILE.write_text(json.dumps({
+        "time":   time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed":   args.seed,
+        "runs":   args.runs,
+        "points": points,
+    }, indent=2), encoding="utf-8")
+    PLOT_FILE.write_text(render_svg(points), encoding="utf-8")
+
+    def fmt(value, spec=",.1f") -> str:
+        return "-" if value is None else format(value, spec)
+
+    print(f"\nETL scaling — {args.runs} run(s) per scale")
+    print(f"  {'scale':>6} {'products':>10} {'wall s':>9} {'load s':>9} {'products/s':>11} {'peak MB':>9}")
+    for p in points:
+        rate = p["products"] / p["wall"] if p.get("products") and p.get("wall") else None
+        print(f"  {p['scale']:>6g} {fmt(p['products'], ',d'):>10} {fmt(p['wall']):>9} {fmt(p.get('load')):>9} "
+              f"{fmt(rate):>11} {fmt(p.get('peak_rss_mb'), ',.0f'):>9}")
+    print(f"\n✓ Plot: {PLOT_FILE.relative_to(INTEGRATION_DIR)}  Data: {RESULT_FILE.relative_to(INTEGRATION_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Sync benchmark — sync_product_index.py at catalog scale, with a chosen mix of the
+four scenarios of tests/sync/_data.py.
+
+For each size N (default 10k 50k 200k) a dedicated emulator project
+(`demo-project-bench-sync`) is reset and seeded with N products through a generated
+seed manifest (tests/_seeding.py). Consecutive base-SKU ranges hold the scenarios
+in the ratios given (tests/sync/_data.py build_manifest):
+
+  new        ProductIndexData only                       → Update record created
+  changed    both; products-index-updates hash is stale  → Update record rewritten
+  unchanged  both; hash matches ($sha256_of)             → no write
+  deleted    products-index-updates only                 → operation set to Delete
+
+The sync runs once per size, streamed like the ETL (tests/_etl_log.py), so wall
+time and peak RSS of its process tree are recorded. Writes are observed, not
+inferred, in two ways (tests/_rewrites.py):
+
+  issued     writes the sync sent, counted in its process by the write-count hook
+             (write_count_env) per collection, and per products-index-updates
+             document — a rewrite of identical data counts, although Firestore
+             keeps its update_time
+  created / rewritten / deleted
+             products-index-updates documents whose update_time changed
+
+Both are attributed to a scenario by base SKU. The expected column shows what a
+correct sync writes; `!` marks a scenario where the observed writes differ from it,
+e.g. issued writes for unchanged products. The resulting queue is then checked
+document by document against tests/sync/_oracle.py's expected state.
+
+Results are appended to reports/bench/sync.json:
+  wall seconds, seed seconds, products/sec, peak RSS, issued writes per collection,
+  per scenario: documents, issued, created, rewritten, deleted, unchanged
+  oracle: seconds and mismatching documents per rule
+
+Usage:
+    python scripts/bench_sync.py [--sizes 10000 50000 200000] [--ratios 25 25 40 10]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Allow `python scripts/bench_sync.py` to import the shared test helpers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_pipeline import DATA_LOADER_DIR, DATA_LOADER_PYTHON, RUNS_DIR   # noqa: E402
+from tests._history import append_history   # noqa: E402
+from tests.sync._data import QUEUE, SCENARIOS, build_manifest, scenario_of, scenario_ranges   # noqa: E402
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+RESULT_FILE     = RUNS_DIR / "sync.json"
+
+SYNC_PROJECT   = "demo-project-bench-sync"
+SYNC_DATABASE  = "(default)"    # Named databases not supported by the gcloud emulator
+DEFAULT_RATIOS = (25, 25, 40, 10)
+# Writes a correct sync leaves in products-index-updates, per scenario
+EXPECTED       = {"new": "created", "changed": "rewritten", "unchanged": None, "deleted": "rewritten"}
+MIN_TIMEOUT    = 600            # seconds; grows with N at MIN_RATE products/sec
+MIN_RATE       = 50
+
+
+# ── Observed writes ───────────────────────────────────────────────────────────
+
+def observed_writes(before: dict, after: dict, ranges: dict, issued: dict = None) -> dict:
+    """
+    {scenario: {documents, issued, created, rewritten, deleted, unchanged}} of
+    products-index-updates. `issued` is issued_documents() of the run; None leaves
+    the issued column unknown.
+    """
+    writes = {s: {"documents": count, "issued": None if issued is None else 0,
+                  "created": 0, "rewritten": 0, "deleted": 0, "unchanged": 0}
+              for s, (_, count) in ranges.items()}
+    for doc_id, n in (issued or {}).items():
+        scenario = scenario_of(doc_id, ranges)
+        if scenario is not None:
+            writes[scenario]["issued"] += n
+    for doc_id in before.keys() | after.keys():
+        scenario = scenario_of(doc_id, ranges)
+        if scenario is None:
+            continue
+        if doc_id not in before:
+            writes[scenario]["created"] += 1
+        elif doc_id not in after:
+            writes[scenario]["deleted"] += 1
+        elif before[doc_id] != after[doc_id]:
+            writes[scenario]["rewritten"] += 1
+        else:
+            writes[scenario]["unchanged"] += 1
+    return writes
+
+
+def unexpected(scenario: str, writes: dict) -> bool:
+    """True when the scenario's writes differ from a correct sync: one write per document, or none."""
+    counts = writes[scenario]
+    expected = EXPECTED[scenario]
+    written = counts["created"] + counts["rewritten"] + counts["deleted"]
+    wanted = counts["documents"] if expected else 0
+    if counts["issued"] is not None and counts["issued"] != wanted:
+        return True
+    return written != (counts[expected] if expected else 0) or bool(expected and counts[expected] != counts["documents"])
+
+
+# ── One size ──────────────────────────────────────────────────────────────────
+
+def run_size(client, size: int, ratios, host: str) -> dict:
+    from tests._etl_log import run_streamed
+    from tests._id_index import CollectionIdIndex
+    from tests._reset import reset_firestore
+    from tests._rewrites import issued_documents, issued_writes, update_times, write_count_env
+    from tests._seeding import seed_manifest
+    from tests.sync._oracle import prior_from_manifest, verify_sync
+
+    label = f"sync-n{size}"
+    ranges = scenario_ranges(size, ratios)
+    manifest = RUNS_DIR / label / "manifest.json"
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(json.dumps(build_manifest(ranges), indent=2), encoding="utf-8")
+
+    reset_firestore(client)
+    seeded = seed_manifest(client, manifest)
+    before = update_times(client, CollectionIdIndex(client), [QUEUE])[QUEUE]
+
+    counts_dir = RUNS_DIR / label / "writes"
+    env = {
+        **os.environ,
+        "FIRESTORE_EMULATOR_HOST": host,
+        "GCLOUD_PROJECT":          SYNC_PROJECT,
+        "PYTHONUTF8":              "1",
+        **write_count_env(counts_dir, documents=[QUEUE]),
+    }
+    proc = run_streamed(
+        [str(DATA_LOADER_PYTHON), "sync_product_index.py",
+         "--use-emulator",
+         "--sync-database", SYNC_DATABASE,
+         "--log-level", "INFO"],
+        cwd=DATA_LOADER_DIR, env=env,
+        log_dir=RUNS_DIR / label, timeout=max(MIN_TIMEOUT, size / MIN_RATE),
+    )
+    s = proc.summary
+    if proc.returncode != 0:
+        raise RuntimeError(f"{label}: sync_product_index.py exited {proc.returncode}\n{s}")
+    after = update_times(client, CollectionIdIndex(client), [QUEUE])[QUEUE]
+    issued = issued_writes(counts_dir)
+    oracle = verify_sync(client, prior_from_manifest(manifest))
+    print(oracle, flush=True)
+
+    return {
+        "documents":        size,
+        "ranges":           ranges,
+        "seed_seconds":     round(seeded.seconds, 3),
+        "wall":             s.seconds,
+        "products_per_sec": round(size / s.seconds, 1) if s.seconds else None,
+        "peak_rss_mb":      s.peak_rss_mb,
+        "issued":           issued,
+        "writes":           observed_writes(before, after, ranges,
+                                            None if issued is None else issued_documents(counts_dir, QUEUE)),
+        "oracle":           {"seconds": round(oracle.seconds, 3),
+                             "mismatches": {rule: len(ids) for rule, ids in oracle.mismatches.items()}},
+    }
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def print_point(point: dict) -> None:
+    print(f"\n  N={point['documents']:,}  sync {point['wall']:.1f}s  {point['products_per_sec']} products/s  "
+          f"peak {point['peak_rss_mb']} MB  (seed {point['seed_seconds']:.1f}s)")
+    print(f"    {'scenario':<10} {'docs':>8} {'issued':>8} {'created':>8} {'rewritten':>10} {'deleted':>8} "
+          f"{'unchanged':>10}  expected")
+    for scenario, w in point["writes"].items():
+        mark = "!" if unexpected(scenario, point["writes"]) else " "
+        issued = "?" if w["issued"] is None else f"{w['issued']:,}"
+        print(f"  {mark} {scenario:<10} {w['documents']:>8,} {issued:>8} {w['created']:>8,} {w['rewritten']:>10,} "
+              f"{w['deleted']:>8,} {w['unchanged']:>10,}  {EXPECTED[scenario] or 'no write'}")
+    if point["issued"] is not None:
+        print(f"    issued per collection: {', '.join(f'{c} {n:,}' for c, n in point['issued'].items()) or 'none'}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark sync_product_index.py at catalog scale.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 200_000],
+                        help="Products per run (default: 10000 50000 200000)")
+    parser.add_argument("--ratios", type=float, nargs=4, default=DEFAULT_RATIOS,
+                        metavar=("NEW", "CHANGED", "UNCHANGED", "DELETED"),
+                        help="Relative share of each scenario (default: 25 25 40 10)")
+    parser.add_argument("--host", default=os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080"),
+                        help="Firestore emulator host:port (default: localhost:8080)")
+    args = parser.parse_args()
+    if any(r < 0 for r in args.ratios) or not sum(args.ratios):
+        parser.error("--ratios must be non-negative and not all zero")
+    if any(size < 1 for size in args.sizes):
+        parser.error("--sizes must be positive")
+
+    os.environ["FIRESTORE_EMULATOR_HOST"] = args.host
+    from google.cloud import firestore
+
+    client = firestore.Client(project=SYNC_PROJECT)
+    points = []
+    for size in sorted(set(args.sizes)):
+        print(f"→ sync benchmark N={size:,} ratios {dict(zip(SCENARIOS, args.ratios))}", flush=True)
+        points.append(run_size(client, size, args.ratios, args.host))
+        print_point(points[-1])
+
+    append_history(RESULT_FILE, {"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                 "ratios": dict(zip(SCENARIOS, args.ratios)), "points": points})
+
+    print(f"\nSync scaling — ratios new/changed/unchanged/deleted {'/'.join(f'{r:g}' for r in args.ratios)}")
+    print(f"  {'products':>10} {'sync s':>9} {'products/s':>11} {'peak MB':>9} {'issued':>9} {'changed':>9}")
+    for p in points:
+        issued = "?" if p["issued"] is None else f"{sum(p['issued'].values()):,}"
+        changed = sum(w["created"] + w["rewritten"] + w["deleted"] for w in p["writes"].values())
+        print(f"  {p['documents']:>10,} {p['wall']:>9.1f} {p['products_per_sec'] or 0:>11,.1f} "
+              f"{p['peak_rss_mb'] or 0:>9,.0f} {issued:>9} {changed:>9,}")
+    print(f"\n✓ Data: {RESULT_FILE.relative_to(INTEGRATION_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
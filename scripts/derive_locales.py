@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Clones the de/DE CSV batch into additional locales for multi-market pipeline runs.
+
+For every file with a language and a market column (4_, 5_, 10_ and the index files
+A_ … F_, H_), the rows of the source locale are written once more per target
+locale. The language / market values are rewritten, and so is any spelling of the
+source locale inside other cells (de_DE, de-DE, de_de — e.g. flow diagram URLs).
+Keys stay the same, so 40806000 becomes 40806000_en_GB next to 40806000_de_DE,
+and every foreign key still resolves within its locale.
+Files without locale columns (6_, 8_, 9_, D_, G_) apply to every market and are
+copied unchanged. Texts stay in the source language.
+
+The output directory gets locales.json (locales, rows per file and the
+configuration entries). Layer 1 reads its locale list from there
+(tests/_locales.py). `scripts/seed_config.py --locales …` adds the matching
+database_<culture> keys to configuration/config.
+
+Usage:
+    python scripts/derive_locales.py --locales en_GB fr_FR [--source fixtures/csv]
+                                     [--output fixtures/csv-locales] [--source-locale de_DE]
+"""
+import argparse
+import csv
+import json
+import shutil
+import sys
+from pathlib import Path
+
+# Allow `python scripts/derive_locales.py` to import the shared CSV helpers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests._csv_schema import csv_files, read_header   # noqa: E402
+from tests._locales import (   # noqa: E402
+    DEFAULT_LOCALE, MANIFEST, configuration_entries, culture, locale_columns, normalize, parse_locale,
+)
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SOURCE  = INTEGRATION_DIR / "fixtures" / "csv"
+DEFAULT_OUTPUT  = INTEGRATION_DIR / "fixtures" / "csv-locales"
+
+
+def _spellings(locale: str) -> list:
+    language, market = parse_locale(locale)
+    return [f"{language}_{market}", f"{language}-{market}", culture(locale)]
+
+
+def clone_file(src: Path, dst: Path, source_locale: str, targets: list) -> dict:
+    """Stream `src` to `dst` once, then once more per target locale. Returns {locale: rows}."""
+    language_col, market_col = locale_columns(read_header(src))
+    source_lang, source_market = parse_locale(source_locale)
+    rows = {}
+    with open(dst, "w", encoding="utf-8", newline="") as fout:
+        writer = None
+        for locale in [source_locale, *targets]:
+            language, market = parse_locale(locale)
+            replacements = list(zip(_spellings(source_locale), _spellings(locale)))
+            with open(src, encoding="utf-8-sig", newline="") as fin:
+                reader = csv.DictReader(fin)
+                if writer is None:
+                    writer = csv.DictWriter(fout, fieldnames=reader.fieldnames, lineterminator="\n")
+                    writer.writeheader()
+                n = 0
+                for row in reader:
+                    if locale == source_locale:
+                        writer.writerow(row)
+                        n += 1
+                        continue
+                    if (row[language_col], row[market_col].upper()) != (source_lang, source_market):
+                        continue
+                    out = {}
+                    for column, value in row.items():
+                        for old, new in replacements:
+                            if value and old in value:
+                                value = value.replace(old, new)
+                        out[column] = value
+                    out[language_col], out[market_col] = language, market
+                    writer.writerow(out)
+                    n += 1
+            rows[locale] = n
+    return rows
+
+
+def derive(source: Path, output: Path, locales: list, source_locale: str = DEFAULT_LOCALE) -> dict:
+    files = csv_files(source)
+    if not files:
+        raise SystemExit(f"No CSV files in {source}")
+    source_locale = normalize(source_locale)
+    targets = [t for t in dict.fromkeys(normalize(l) for l in locales) if t != source_locale]
+
+    if output.exists():
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+
+    counts = {}
+    for name, path in files.items():
+        if locale_columns(read_header(path)):
+            counts[name] = clone_file(path, output / name, source_locale, targets)
+        else:
+            shutil.copyfile(path, output / name)
+            counts[name] = "copied"
+
+    all_locales = [source_locale, *targets]
+    manifest = {
+        "source":        str(source),
+        "source_locale": source_locale,
+        "locales":       all_locales,
+        "rows":          counts,
+        "configuration": configuration_entries(all_locales),
+    }
+    (output / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Clone a single-locale CSV batch into more locales.")
+    parser.add_argument("--locales", nargs="+", required=True, help="Target locales, e.g. en_GB fr_FR")
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE, help="Source batch (default: fixtures/csv)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Target (default: fixtures/csv-locales)")
+    parser.add_argument("--source-locale", default=DEFAULT_LOCALE, help="Locale to clone (default: de_DE)")
+    args = parser.parse_args()
+
+    try:
+        manifest = derive(args.source.resolve(), args.output.resolve(), args.locales, args.source_locale)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"✓ {', '.join(manifest['locales'])} in {args.output}")
+    for name, rows in manifest["rows"].items():
+        print(f"  {name:<44} {rows}")
+    print(f"  configuration: {manifest['configuration']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
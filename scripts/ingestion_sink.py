@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Lightweight stand-in for WireMock on bulk indexing runs: answers the Sitecore Search
+stubs and logs every request to disk instead of the heap.
+
+WireMock keeps each request, full body included, in its in-memory journal; a
+full-catalog IndexingApi drain makes every admin call slower and can run the JVM out
+of memory. This server is a single asyncio HTTP/1.1 loop (keep-alive, stdlib only):
+
+  stubs    fixtures/mocks/sitecore-search/*.json — same request matching (method +
+           url / urlPattern / urlPath / urlPathPattern, by priority) and the same
+           status, headers and jsonBody / body
+  log      one compact JSON line per request (NDJSON, gzip with --compress), in the
+           serve-event shape of WireMock's journal: request (id, method, url,
+           loggedDate, body or bodyAsBase64), response status, stubMapping name and
+           timing.totalTime (until the response is written out). Lines are flushed
+           at least every FLUSH_SECONDS and before every admin query.
+  admin    the request-journal subset of the WireMock admin API that
+           tests/_wiremock.py uses, so WireMock(url) works against the sink unchanged:
+
+             GET    /__admin/health
+             GET    /__admin/requests[?since=ISO-8601]   serve events, oldest first
+             DELETE /__admin/requests                    truncate the log
+             POST   /__admin/requests/count              {"method", "urlPattern", "bodyPatterns"}
+             POST   /__admin/requests/find               (bodyPatterns: matchesJsonPath "$.a.b" only)
+
+           count/find stream the log from disk on a worker thread, so stubbed
+           requests keep being answered meanwhile; since= is served from the last
+           TAIL_BUFFER lines held in memory while it reaches back no further. Stub
+           mappings and scenarios are not implemented (501): fault profiles
+           (tests/indexing/_faults.py) need WireMock.
+
+In docker-compose.yml the `ingestion-sink` service (profile "sink") answers on the
+compose network as `wiremock`; `make sink-up` swaps it in for one run.
+
+Usage:
+    python scripts/ingestion_sink.py [--port 8080] [--mocks DIR] [--log FILE] [--compress]
+"""
+import argparse
+import asyncio
+import base64
+import gzip
+import json
+import os
+import re
+import signal
+import time
+import uuid
+import zlib
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+MOCKS_DIR       = INTEGRATION_DIR / "fixtures" / "mocks" / "sitecore-search"
+LOG_FILE        = INTEGRATION_DIR / "reports" / "sink" / "requests.ndjson"
+
+DEFAULT_PRIORITY = 5         # WireMock's, for stubs that set none
+FLUSH_SECONDS    = 1.0
+TAIL_BUFFER      = 20_000    # recent log lines kept for GET /__admin/requests?since=
+READ_CHUNK       = 1 << 16
+
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error", 501: "Not Implemented"}
+
+
+def _dump(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _dump_chunks(payload: dict) -> list:
+    """
+    _dump(payload) as a list of byte chunks, one per item of a list value. Encoding,
+    joining or copying a large result in one piece holds the GIL long enough to stall
+    the event loop; chunks are encoded one by one and written with drain() in between.
+    """
+    chunks = [b"{"]
+    for i, (key, value) in enumerate(payload.items()):
+        chunks.append(f"{',' if i else ''}{_dump(key)}:".encode("utf-8"))
+        if isinstance(value, list):
+            chunks.append(b"[")
+            chunks.extend(f"{',' if j else ''}{_dump(item)}".encode("utf-8") for j, item in enumerate(value))
+            chunks.append(b"]")
+        else:
+            chunks.append(_dump(value).encode("utf-8"))
+    chunks.append(b"}")
+    return chunks
+
+
+def _epoch_ms(iso: str) -> int:
+    return int(datetime.fromisoformat(iso.replace("Z", "+00:00")).timestamp() * 1000)
+
+
+# ── Stubs ─────────────────────────────────────────────────────────────────────
+
+class Stub:
+    """One fixtures/mocks mapping file: request matcher and canned response."""
+
+    def __init__(self, mapping: dict, name: str):
+        request, response = mapping["request"], mapping.get("response", {})
+        self.name = mapping.get("name", name)
+        self.priority = mapping.get("priority", DEFAULT_PRIORITY)
+        self.method = request.get("method", "ANY")
+        self.url = request.get("url")
+        self.url_path = request.get("urlPath")
+        self.url_pattern = re.compile(request["urlPattern"]) if "urlPattern" in request else None
+        self.path_pattern = re.compile(request["urlPathPattern"]) if "urlPathPattern" in request else None
+
+        self.status = response.get("status", 200)
+        self.headers = dict(response.get("headers", {}))
+        if "jsonBody" in response:
+            self.body = _dump(response["jsonBody"]).encode("utf-8")
+            self.headers.setdefault("Content-Type", "application/json")
+        elif "base64Body" in response:
+            self.body = base64.b64decode(response["base64Body"])
+        else:
+            self.body = response.get("body", "").encode("utf-8")
+
+    def matches(self, method: str, url: str) -> bool:
+        if self.method not in ("ANY", method):
+            return False
+        path = urlsplit(url).path
+        if self.url is not None and url != self.url:
+            return False
+        if self.url_path is not None and path != self.url_path:
+            return False
+        if self.url_pattern and not self.url_pattern.fullmatch(url):
+            return False
+        return not self.path_pattern or bool(self.path_pattern.fullmatch(path))
+
+
+def load_stubs(mocks_dir: Path) -> list:
+    """Mappings of `mocks_dir`, highest priority (lowest number) first."""
+    stubs = []
+    for path in sorted(mocks_dir.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if "mappings" not in data:
+            stubs.append(Stub(data, path.stem))
+            continue
+        stubs.extend(Stub(mapping, f"{path.stem}-{i}") for i, mapping in enumerate(data["mappings"]))
+    return sorted(stubs, key=lambda s: s.priority)
+
+
+# ── Request log ───────────────────────────────────────────────────────────────
+
+def _json_path(pattern: dict):
+    """Dotted path of a matchesJsonPath "$.a.b" body pattern."""
+    expr = pattern.get("matchesJsonPath")
+    if not isinstance(expr, str) or not re.fullmatch(r"\$(\.[\w-]+)+", expr):
+        raise ValueError(f"unsupported body pattern: {pattern}")
+    return expr[2:].split(".")
+
+
+def _has_path(body: str, path: list) -> bool:
+    try:
+        node = json.loads(body)
+    except ValueError:
+        return False
+    for key in path:
+        if isinstance(node, dict) and key in node:
+            node = node[key]
+        elif isinstance(node, list) and key.isdigit() and int(key) < len(node):
+            node = node[int(key)]
+        else:
+            return False
+    return True
+
+
+def request_filter(pattern: dict):
+    """Predicate over logged serve events for a WireMock request pattern."""
+    method = pattern.get("method", "ANY")
+    url = re.compile(pattern["urlPattern"]) if "urlPattern" in pattern else None
+    paths = [_json_path(p) for p in pattern.get("bodyPatterns", [])]
+
+    def matches(event: dict) -> bool:
+        request = event["request"]
+        if method != "ANY" and request["method"] != method:
+            return False
+        if url and not url.fullmatch(request["url"]):
+            return False
+        if paths:
+            body = request.get("body") or base64.b64decode(request.get("bodyAsBase64", "")).decode("utf-8", "replace")
+            return all(_has_path(body, p) for p in paths)
+        return True
+    return matches
+
+
+class RequestLog:
+    """Append-only NDJSON serve-event log, optionally gzip-compressed."""
+
+    def __init__(self, path: Path, compress: bool = False):
+        self.path = path.with_name(path.name + ".gz") if compress and path.suffix != ".gz" else path
+        self.compress = compress
+        self.total = 0
+        self._recent = deque(maxlen=TAIL_BUFFER)   # (loggedDate, line)
+        self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._open("wb")
+
+    def _open(self, mode: str):
+        return gzip.open(self.path, mode, compresslevel=1) if self.compress else open(self.path, mode)
+
+    def append(self, event: dict) -> None:
+        line = _dump(event)
+        self._file.write(line.encode("utf-8") + b"\n")
+        self._recent.append((event["request"]["loggedDate"], line))
+        self.total += 1
+        self._dirty = True
+
+    def flush(self) -> None:
+        if self._dirty:
+            self._file.flush()    # gzip: a sync flush, so the stream so far can be read back
+            self._dirty = False
+
+    def reset(self) -> None:
+        self._file.close()
+        self._file = self._open("wb")
+        self._recent.clear()
+        self.total = 0
+        self._dirty = False
+
+    def close(self) -> None:
+        self._file.close()
+
+    def snapshot(self) -> int:
+        """
+        Flush, and return how many lines a disk scan may read. Called on the event loop;
+        the scan itself can then run on another thread while requests are appended.
+        """
+        self.flush()
+        return self.total
+
+    def _lines(self, limit: int):
+        """The first `limit` logged lines, oldest first, read from disk."""
+        if not limit:
+            return
+        with open(self.path, "rb") as f:
+            # The gzip member is still open (no trailer yet), so inflate by hand
+            inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if self.compress else None
+            rest = b""
+            while chunk := f.read(READ_CHUNK):
+                rest += inflate.decompress(chunk) if inflate else chunk
+                *lines, rest = rest.split(b"\n")
+                for line in lines:
+                    yield line
+                    limit -= 1
+                    if not limit:
+                        return
+
+    def events(self, limit: int, match=None):
+        for line in self._lines(limit):
+            if line:
+                event = json.loads(line)
+                if match is None or match(event):
+                    yield event
+
+    def recent(self, since_ms: int) -> list:
+        """Serve events logged after `since_ms` (exclusive) from memory; None if the buffer does not reach back."""
+        recent = self._recent
+        if len(recent) == self.total or recent[0][0] <= since_ms:
+            return [json.loads(line) for logged, line in recent if logged > since_ms]
+        return None
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+class Sink:
+    def __init__(self, stubs: list, log: RequestLog):
+        self.stubs = stubs
+        self.log = log
+
+    # ── Admin API ──
+
+    async def _scan(self, payload):
+        """
+        `payload(limit)` as JSON chunks, built on a worker thread from the lines logged so
+        far — the scan and the encoding of a large result both stay off the event loop.
+        """
+        limit = self.log.snapshot()
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: _dump_chunks(payload(limit)))
+
+    async def admin(self, method: str, url: str, body: bytes):
+        """(status, JSON payload, or its encoded chunks) for a /__admin/ request."""
+        parts = urlsplit(url)
+        route = parts.path[len("/__admin/"):].rstrip("/")
+        try:
+            if route == "health" and method == "GET":
+                return 200, {"status": "healthy", "message": "Ingestion sink is ok"}
+            if route == "requests" and method == "DELETE":
+                self.log.reset()
+                return 200, {}
+            if route == "requests" and method == "GET":
+                since = parse_qs(parts.query).get("since")
+                since_ms = _epoch_ms(since[0]) if since else None
+                events = self.log.recent(since_ms) if since else None
+                total = self.log.total
+                if events is not None:
+                    return 200, {"requests": events, "meta": {"total": total}, "requestJournalDisabled": False}
+                return 200, await self._scan(lambda limit: {
+                    "requests": [e for e in self.log.events(limit)
+                                 if since_ms is None or e["request"]["loggedDate"] > since_ms],
+                    "meta": {"total": total}, "requestJournalDisabled": False})
+            if route in ("requests/count", "requests/find") and method == "POST":
+                match = request_filter(json.loads(body or b"{}"))
+                if route.endswith("count"):
+                    return 200, await self._scan(lambda limit: {"count": sum(1 for _ in self.log.events(limit, match))})
+                return 200, await self._scan(
+                    lambda limit: {"requests": [e["request"] for e in self.log.events(limit, match)]})
+        except ValueError as e:
+            return 400, {"errors": [{"title": str(e)}]}
+        if route.startswith(("mappings", "scenarios")):
+            return 501, {"errors": [{"title": "stub mappings and scenarios need WireMock (docker compose up -d wiremock)"}]}
+        return 404, {"errors": [{"title": f"{method} {parts.path} is not part of the ingestion sink admin API"}]}
+
+    # ── Stubbed endpoints ──
+
+    def serve(self, method: str, url: str, body: bytes, received_ms: int):
+        """
+        (status, headers, body, serve event) of the first matching stub. The caller
+        logs the event once the response is written, with its timing.totalTime.
+        """
+        stub = next((s for s in self.stubs if s.matches(method, url)), None)
+        if stub:
+            status, headers, payload = stub.status, stub.headers, stub.body
+        else:
+            status, headers = 404, {"Content-Type": "text/plain"}
+            payload = f"Request was not matched\n{method} {url}\n".encode("utf-8")
+
+        request_id = str(uuid.uuid4())
+        request = {"id": request_id, "method": method, "url": url, "loggedDate": received_ms}
+        try:
+            request["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            request["bodyAsBase64"] = base64.b64encode(body).decode("ascii")
+        event = {"id": request_id, "request": request, "response": {"status": status}, "wasMatched": bool(stub)}
+        if stub:
+            event["stubMapping"] = {"name": stub.name}
+        return status, headers, payload, event
+
+    # ── Connection loop ──
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                started, received_ms = time.perf_counter(), int(time.time() * 1000)
+                method, url, version = line.decode("latin-1").split()
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                if headers.get("expect", "").lower() == "100-continue":
+                    writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                body = await self._read_body(reader, headers)
+
+                event = None
+                if url.startswith("/__admin/"):
+                    status, payload = await self.admin(method, url, body)
+                    out = payload if isinstance(payload, list) else [_dump(payload).encode("utf-8")]
+                    out_headers = {"Content-Type": "application/json"}
+                else:
+                    status, out_headers, payload, event = self.serve(method, url, body, received_ms)
+                    out = [payload]
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+                        *(f"{k}: {v}" for k, v in out_headers.items()),
+                        f"Content-Length: {sum(map(len, out))}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + out[0])
+                await writer.drain()
+                for chunk in out[1:]:
+                    writer.write(chunk)
+                    await writer.drain()
+                if event is not None:
+                    event["timing"] = {"totalTime": int((time.perf_counter() - started) * 1000)}
+                    self.log.append(event)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, asyncio.CancelledError):
+            pass    # client went away, malformed request, or shutdown with the connection idle
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_body(reader: asyncio.StreamReader, headers: dict) -> bytes:
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass    # trailers
+            return b"".join(chunks)
+        length = int(headers.get("content-length", 0))
+        return await reader.readexactly(length) if length else b""
+
+
+async def serve(port: int, mocks_dir: Path, log_path: Path, compress: bool) -> None:
+    log = RequestLog(log_path, compress)
+    sink = Sink(load_stubs(mocks_dir), log)
+    server = await asyncio.start_server(sink.handle, "0.0.0.0", port, backlog=1024)
+    print(f"Ingestion sink on :{port} — {len(sink.stubs)} stubs from {mocks_dir}, log {log.path}", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:    # Windows
+            pass
+    try:
+        async with server:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), FLUSH_SECONDS)
+                except asyncio.TimeoutError:
+                    log.flush()
+    finally:
+        log.close()
+        print(f"Ingestion sink stopped — {log.total:,} requests in {log.path}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--mocks", type=Path, default=MOCKS_DIR)
+    parser.add_argument("--log", type=Path, default=LOG_FILE)
+    parser.add_argument("--compress", action="store_true",
+                        default=os.environ.get("INGESTION_SINK_COMPRESS", "0") not in ("", "0", "false"),
+                        help="gzip the request log (default: INGESTION_SINK_COMPRESS)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.port, args.mocks, args.log, args.compress))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Runs the Layer 1 CSV preflight (tests/_preflight.py) on a batch without starting
+the ETL — e.g. right after copying a new batch from NEO/data_input/.
+
+Exit code 1 if there are preflight errors (warnings alone exit 0).
+
+Usage:
+    python scripts/preflight_csv.py [fixtures/csv]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Allow `python scripts/preflight_csv.py` to import the shared CSV helpers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests._preflight import preflight   # noqa: E402
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check a CSV batch before running the ETL on it.")
+    parser.add_argument("directory", nargs="?", type=Path, default=INTEGRATION_DIR / "fixtures" / "csv",
+                        help="CSV batch (default: fixtures/csv)")
+    args = parser.parse_args()
+
+    report = preflight(args.directory)
+    print(report)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Runs the test layers concurrently, each shard on its own isolated Docker Compose stack,
+then merges the per-stack pytest JSON reports into reports/results.json.
+
+Every stack gets a distinct compose project name (`neo-it-1`, `neo-it-2`, ...) and its
+own block of host ports (stack N → 8080 + 1000·N ... 8085 + 1000·N), so emulators,
+WireMock journals and .NET services never see each other's data. Built images are
+shared between stacks (fixed `image:` names in docker-compose.yml), so only the first
+build is slow.
+
+Layers are assigned to stacks longest-first (LPT), using the durations in SHARDS, so
+with one stack per layer the wall time approaches the slowest layer (pipeline).
+
+Usage:
+    python scripts/run_parallel_stacks.py [--stacks N] [--shards pipeline,sync,...] [--keep]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from wait_for_emulator import wait_for_emulator
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+REPORTS_DIR     = INTEGRATION_DIR / "reports"
+STACKS_DIR      = REPORTS_DIR / "stacks"
+
+COMPOSE_PREFIX = "neo-it"
+PORT_STRIDE    = 1000
+
+# Shard → pytest paths, compose profiles, expected duration (seconds, from the README)
+SHARDS = {
+    "pipeline": {"paths": ["tests/pipeline/"],  "profiles": [],                   "seconds": 660},
+    "services": {"paths": ["tests/services/"],  "profiles": ["phase4", "phase5"], "seconds": 120},
+    "indexing": {"paths": ["tests/indexing/"],  "profiles": ["phase3"],           "seconds": 30},
+    "sync":     {"paths": ["tests/sync/"],      "profiles": [],                   "seconds": 15},
+}
+
+# Container port env var (docker-compose.yml) → test env var → offset from 8080 → health path
+SERVICES = {
+    "firestore-emulator": ("FIRESTORE_PORT",      "FIRESTORE_EMULATOR_HOST", 0, "/"),
+    "wiremock":           ("WIREMOCK_PORT",       "WIREMOCK_HOST",           1, "/__admin/health"),
+    "indexing-api":       ("INDEXING_API_PORT",   "INDEXING_API_HOST",       2, "/health"),
+    "navigation-api":     ("NAVIGATION_API_PORT", "NAVIGATION_API_HOST",     3, "/health"),
+    "products-api":       ("PRODUCTS_API_PORT",   "PRODUCTS_API_HOST",       4, "/health"),
+    "search-api":         ("SEARCH_API_PORT",     "SEARCH_API_HOST",         5, "/health"),
+}
+
+PROFILE_SERVICES = {
+    "phase3": ["indexing-api"],
+    "phase4": ["navigation-api", "products-api"],
+    "phase5": ["search-api"],
+}
+
+_print_lock = threading.Lock()
+
+
+def log(stack: str, message: str) -> None:
+    with _print_lock:
+        print(f"[{stack}] {message}", flush=True)
+
+
+# ── Planning ──────────────────────────────────────────────────────────────────
+
+def plan(shards: list, stacks: int) -> list:
+    """Longest-processing-time-first assignment of shards to `stacks` bins."""
+    bins = [[] for _ in range(min(stacks, len(shards)))]
+    loads = [0] * len(bins)
+    for name in sorted(shards, key=lambda s: SHARDS[s]["seconds"], reverse=True):
+        i = loads.index(min(loads))
+        bins[i].append(name)
+        loads[i] += SHARDS[name]["seconds"]
+    return bins
+
+
+# ── One stack ─────────────────────────────────────────────────────────────────
+
+class Stack:
+    def __init__(self, index: int, shards: list):
+        self.name = f"{COMPOSE_PREFIX}-{index}"
+        self.shards = shards
+        self.profiles = sorted({p for s in shards for p in SHARDS[s]["profiles"]})
+        base = 8080 + PORT_STRIDE * index
+        self.ports = {svc: base + offset for svc, (_, _, offset, _) in SERVICES.items()}
+        self.report = STACKS_DIR / f"{self.name}.json"
+        self.log_file = STACKS_DIR / f"{self.name}.log"
+
+    def compose_env(self) -> dict:
+        env = dict(os.environ)
+        for svc, (port_var, _, _, _) in SERVICES.items():
+            env[port_var] = str(self.ports[svc])
+        return env
+
+    def test_env(self) -> dict:
+        env = dict(os.environ)
+        for svc, (_, host_var, _, _) in SERVICES.items():
+            env[host_var] = f"localhost:{self.ports[svc]}"
+        return env
+
+    def compose(self, *args, profiles=()) -> None:
+        cmd = ["docker", "compose", "-p", self.name]
+        for p in profiles:
+            cmd += ["--profile", p]
+        subprocess.run([*cmd, *args], cwd=INTEGRATION_DIR, env=self.compose_env(), check=True,
+                       stdout=subprocess.DEVNULL)
+
+    def wait(self, svc: str, timeout: int) -> None:
+        _, _, _, path = SERVICES[svc]
+        if not wait_for_emulator(f"localhost:{self.ports[svc]}", timeout, path):
+            raise RuntimeError(f"{self.name}: {svc} did not become ready within {timeout}s")
+
+    def up(self) -> None:
+        log(self.name, f"starting (shards={','.join(self.shards)} profiles={self.profiles or '-'})")
+        self.compose("up", "-d", "firestore-emulator", "wiremock")
+        self.wait("firestore-emulator", 90)
+        self.wait("wiremock", 30)
+        if "phase4" in self.profiles:
+            # NavigationApi / ProductsApi read configuration at startup
+            subprocess.run(
+                [sys.executable, "scripts/seed_config.py", "--host", f"localhost:{self.ports['firestore-emulator']}"],
+                cwd=INTEGRATION_DIR, check=True, stdout=subprocess.DEVNULL,
+            )
+        if self.profiles:
+            self.compose("up", "-d", profiles=self.profiles)
+            for profile in self.profiles:
+                for svc in PROFILE_SERVICES[profile]:
+                    self.wait(svc, 300)
+
+    def down(self) -> None:
+        self.compose("down", profiles=self.profiles)
+
+    def run_tests(self, pytest_args: list) -> int:
+        paths = [p for s in self.shards for p in SHARDS[s]["paths"]]
+        cmd = [
+            sys.executable, "-m", "pytest", *paths,
+            "--json-report", f"--json-report-file={self.report}",
+            "-p", "no:cacheprovider", "--tb=short", *pytest_args,
+        ]
+        with open(self.log_file, "w", encoding="utf-8") as out:
+            return subprocess.run(cmd, cwd=INTEGRATION_DIR, env=self.test_env(),
+                                  stdout=out, stderr=subprocess.STDOUT).returncode
+
+    def run(self, pytest_args: list, keep: bool) -> int:
+        start = time.time()
+        try:
+            self.up()
+            log(self.name, "running tests")
+            code = self.run_tests(pytest_args)
+        except Exception as e:
+            log(self.name, f"ERROR: {e}")
+            code = 3
+        finally:
+            if not keep:
+                try:
+                    self.down()
+                except subprocess.CalledProcessError as e:
+                    log(self.name, f"WARNING: teardown failed: {e}")
+        log(self.name, f"finished with exit code {code} in {time.time() - start:.0f}s — log: {self.log_file}")
+        return code
+
+
+# ── Report merging ────────────────────────────────────────────────────────────
+
+def merge_reports(paths: list, wall_seconds: float) -> dict:
+    """Combine pytest-json-report files into one report with the same schema."""
+    merged = {
+        "created": time.time(), "duration": wall_seconds, "exitcode": 0,
+        "root": str(INTEGRATION_DIR), "environment": {},
+        "summary": {"collected": 0, "total": 0},
+        "collectors": [], "tests": [], "warnings": [],
+        "stacks": [],
+    }
+    for path in paths:
+        if not path.exists():
+            merged["exitcode"] = max(merged["exitcode"], 3)
+            merged["stacks"].append({"report": str(path), "missing": True})
+            continue
+        report = json.loads(path.read_text(encoding="utf-8"))
+        merged["environment"] = merged["environment"] or report.get("environment", {})
+        merged["exitcode"] = max(merged["exitcode"], report.get("exitcode", 0))
+        for key, value in report.get("summary", {}).items():
+            merged["summary"][key] = merged["summary"].get(key, 0) + value
+        for key in ("collectors", "tests", "warnings"):
+            merged[key].extend(report.get(key, []))
+        merged["stacks"].append({"report": str(path), "duration": report.get("duration")})
+    return merged
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run test layers on parallel isolated compose stacks.")
+    parser.add_argument("--stacks", type=int, default=len(SHARDS),
+                        help=f"Number of stacks (default: {len(SHARDS)}, one per layer)")
+    parser.add_argument("--shards", default=",".join(SHARDS),
+                        help=f"Comma-separated layers to run (default: {','.join(SHARDS)})")
+    parser.add_argument("--keep", action="store_true", help="Leave stacks running afterwards")
+    parser.add_argument("pytest_args", nargs="*", help="Extra arguments passed to pytest (after --)")
+    args = parser.parse_args()
+
+    shards = [s for s in args.shards.split(",") if s]
+    unknown = set(shards) - set(SHARDS)
+    if unknown:
+        parser.error(f"Unknown shard(s): {', '.join(sorted(unknown))}")
+
+    STACKS_DIR.mkdir(parents=True, exist_ok=True)
+    stacks = [Stack(i + 1, group) for i, group in enumerate(plan(shards, args.stacks))]
+
+    # Build once under the default project name — stacks reuse the tagged images
+    profiles = sorted({p for st in stacks for p in st.profiles})
+    if profiles:
+        print(f"→ Building images for profiles: {', '.join(profiles)}", flush=True)
+        cmd = ["docker", "compose"]
+        for p in profiles:
+            cmd += ["--profile", p]
+        subprocess.run([*cmd, "build"], cwd=INTEGRATION_DIR, check=True)
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=len(stacks)) as pool:
+        codes = list(pool.map(lambda st: st.run(args.pytest_args, args.keep), stacks))
+    wall = time.time() - start
+
+    merged = merge_reports([st.report for st in stacks], wall)
+    merged["exitcode"] = max([merged["exitcode"], *codes])
+    (REPORTS_DIR / "results.json").write_text(json.dumps(merged, indent=2), encoding="utf-8")
+
+    summary = ", ".join(f"{k}={v}" for k, v in merged["summary"].items())
+    print(f"✓ {len(stacks)} stacks finished in {wall:.0f}s — {summary}", flush=True)
+    print("  Merged report: reports/results.json", flush=True)
+    return merged["exitcode"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
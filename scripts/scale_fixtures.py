@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Generates a scaled-up CSV batch (10x, 100x, …) from fixtures/csv/ for load and
+performance runs of the data-loader.
+
+The model is learned from the source batch: every base SKU is one group holding
+its SKUs (finishes) and their rows in every product file. A scaled batch is the
+source batch plus bootstrap draws — seeded, with replacement — from those groups,
+each under a fresh base SKU. Drawing whole groups instead of sampling columns
+independently keeps what the loader depends on:
+
+  - column distributions and cross-column correlations (COD_CHAR ↔ VALUE_COMBINED)
+  - join cardinalities — finishes per base SKU, per-file coverage, rows per SKU
+    (e.g. ~2.8 specification rows per SKU in 9_)
+  - referential validity — foreign keys into the index files (`A_` … `H_`, copied
+    whole) are kept as-is; SKU → SKU references within a group are remapped to the
+    group's fresh SKUs, references outside it still point at the source SKUs,
+    which stay in the batch
+
+Fresh SKUs are FRESH_PREFIX + draw number as base SKU, plus the template's
+3-character finish code (66838000 drawn as #42 → 9000042000), so they can never
+collide with real ones.
+The SKU also replaces the template SKU inside other cells (flow diagram URLs).
+
+Rows are streamed to disk draw by draw — memory is bounded by the source batch,
+not by the scale factor. The output directory gets scale.json with the learned
+and the generated statistics, so the two can be compared.
+
+Usage:
+    python scripts/scale_fixtures.py --scale 10 [--seed 1] [--source fixtures/csv]
+                                     [--output fixtures/csv-scale/x10]
+"""
+import argparse
+import csv
+import hashlib
+import json
+import random
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Allow `python scripts/scale_fixtures.py` to import the shared CSV schema
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests._csv_schema import (   # noqa: E402
+    SKU_TARGET,
+    base_sku_column, csv_files, derive_base_sku, discover_joins,
+    is_product_file, read_header, sku_column,
+)
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SOURCE  = INTEGRATION_DIR / "fixtures" / "csv"
+SCALE_DIR       = INTEGRATION_DIR / "fixtures" / "csv-scale"
+
+FRESH_PREFIX   = "9"
+MIN_DRAW_WIDTH = 6
+MIN_INLINE_SKU = 6   # shorter template SKUs are not replaced inside other cells
+
+
+def batch_fingerprint(directory: Path) -> str:
+    h = hashlib.sha256()
+    for path in csv_files(directory).values():
+        h.update(f"{path.name}\0{hashlib.sha256(path.read_bytes()).hexdigest()}\n".encode())
+    return h.hexdigest()
+
+
+def scale_dir(scale: float) -> Path:
+    return SCALE_DIR / f"x{scale:g}"
+
+
+# ── Model ─────────────────────────────────────────────────────────────────────
+
+class BatchModel:
+    """Base-SKU groups of a batch: {base: [sku, …]} and {file: {sku: [row, …]}}."""
+
+    def __init__(self, directory: Path):
+        self.files = {n: p for n, p in csv_files(directory).items()
+                      if is_product_file(n) and sku_column(read_header(p))}
+        self.headers = {n: read_header(p) for n, p in self.files.items()}
+        self.rows = {}
+        self.skus_of = {}
+        for name, path in self.files.items():
+            header = self.headers[name]
+            key, base_col = header.index(sku_column(header)), base_sku_column(header)
+            by_sku = self.rows[name] = {}
+            with open(path, encoding="utf-8-sig", newline="") as fh:
+                reader = csv.reader(fh)
+                next(reader, None)
+                for row in reader:
+                    sku = row[key]
+                    if not sku:
+                        continue
+                    by_sku.setdefault(sku, []).append(row)
+                    base = row[header.index(base_col)] if base_col and row[header.index(base_col)] else None
+                    group = self.skus_of.setdefault(base or derive_base_sku(sku), [])
+                    if sku not in group:
+                        group.append(sku)
+        self.bases = sorted(self.skus_of)
+
+    def tallies(self) -> dict:
+        """{file: [SKUs with rows, rows]}"""
+        return {n: [len(rows), sum(len(r) for r in rows.values())] for n, rows in self.rows.items()}
+
+    def stats(self) -> dict:
+        return batch_stats(self.tallies(), sum(len(g) for g in self.skus_of.values()), len(self.bases))
+
+
+def batch_stats(tallies: dict, skus: int, bases: int) -> dict:
+    """Join cardinalities from {file: [SKUs with rows, rows]}."""
+    return {
+        "bases":             bases,
+        "skus":              skus,
+        "finishes_per_base": round(skus / bases, 3) if bases else 0,
+        "files": {
+            name: {
+                "rows":         rows,
+                "coverage":     round(covered / skus, 4) if skus else 0,
+                "rows_per_sku": round(rows / covered, 3) if covered else 0,
+            }
+            for name, (covered, rows) in tallies.items()
+        },
+    }
+
+
+# ── Generation ────────────────────────────────────────────────────────────────
+
+class _Remapper:
+    """Rewrites one template group's rows onto fresh SKUs."""
+
+    def __init__(self, model: BatchModel, joins: list):
+        self.sku_key = {n: h.index(sku_column(h)) for n, h in model.headers.items()}
+        self.base_key = {n: h.index(base_sku_column(h)) for n, h in model.headers.items() if base_sku_column(h)}
+        self.sku_refs = {n: [(model.headers[n].index(j.column), j.separator)
+                             for j in joins if j.source == n and j.target == SKU_TARGET]
+                         for n in model.headers}
+
+    def row(self, name: str, row: list, base: str, mapping: dict) -> list:
+        out = list(row)
+        sku_key = self.sku_key[name]
+        template = row[sku_key]
+        out[sku_key] = mapping[template]
+        if name in self.base_key:
+            out[self.base_key[name]] = base
+        refs = dict(self.sku_refs[name])
+        for i, cell in enumerate(out):
+            if i == sku_key or not cell:
+                continue
+            if i in refs:
+                sep = refs[i]
+                parts = cell.split(sep) if sep else [cell]
+                out[i] = (sep or "").join(mapping.get(p.strip(), p) for p in parts)
+            elif len(template) >= MIN_INLINE_SKU and template in cell:
+                out[i] = cell.replace(template, mapping[template])
+        return out
+
+
+def generate(source: Path, output: Path, scale: float, seed: int = 1, progress=print) -> dict:
+    """Write `scale` × the base SKUs of `source` to `output`. Returns the scale.json manifest."""
+    files = csv_files(source)
+    if not files:
+        raise SystemExit(f"No CSV files in {source}")
+    if scale < 1:
+        raise SystemExit("--scale must be at least 1 (use scripts/subset_fixtures.py to shrink a batch)")
+
+    started = time.perf_counter()
+    model = BatchModel(source)
+    joins = discover_joins(source)
+    draws = round(scale * len(model.bases)) - len(model.bases)
+    width = max(MIN_DRAW_WIDTH, len(str(draws)))
+    known = set(model.skus_of) | {s for group in model.skus_of.values() for s in group}
+    remap = _Remapper(model, joins)
+    rng = random.Random(seed)
+
+    if output.exists():
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+    for name, path in files.items():
+        if name not in model.files:
+            shutil.copyfile(path, output / name)
+
+    tallies = model.tallies()
+    skus = sum(len(g) for g in model.skus_of.values())
+    handles = {}
+    try:
+        writers = {}
+        for name, path in model.files.items():
+            shutil.copyfile(path, output / name)
+            fh = handles[name] = open(output / name, "r+", encoding="utf-8", newline="")
+            fh.seek(0, 2)
+            if fh.tell():
+                fh.seek(fh.tell() - 1)
+                if fh.read(1) != "\n":
+                    fh.write("\n")
+            writers[name] = csv.writer(fh, lineterminator="\n")
+
+        for n in range(1, draws + 1):
+            template = rng.choice(model.bases)
+            base = f"{FRESH_PREFIX}{n:0{width}d}"
+            mapping = {sku: base + sku[-3:] for sku in model.skus_of[template]}
+            if known.intersection(mapping.values()):
+                raise SystemExit(f"Fresh SKU collides with the source batch: {sorted(known & set(mapping.values()))}")
+            skus += len(mapping)
+            for name in model.files:
+                rows = model.rows[name]
+                for sku in model.skus_of[template]:
+                    template_rows = rows.get(sku, ())
+                    for row in template_rows:
+                        writers[name].writerow(remap.row(name, row, base, mapping))
+                    if template_rows:
+                        tallies[name][0] += 1
+                        tallies[name][1] += len(template_rows)
+            if progress and n % 100_000 == 0:
+                progress(f"  … {n:,}/{draws:,} draws")
+    finally:
+        for fh in handles.values():
+            fh.close()
+
+    manifest = {
+        "source":      str(source),
+        "fingerprint": batch_fingerprint(source),
+        "scale":       scale,
+        "seed":        seed,
+        "draws":       draws,
+        "joins":       [str(j) for j in joins],
+        "learned":     model.stats(),
+        "generated":   batch_stats(tallies, skus, len(model.bases) + draws),
+    }
+    (output / "scale.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    if progress:
+        g = manifest["generated"]
+        progress(f"✓ x{scale:g}: {g['bases']:,} base SKUs, {g['skus']:,} SKUs in {output} "
+                 f"({time.perf_counter() - started:.1f}s)")
+    return manifest
+
+
+def ensure_batch(source: Path, scale: float, seed: int = 1, progress=print) -> Path:
+    """Generated batch for `scale` — reused if it was built from the same source and seed."""
+    if scale == 1:
+        return source
+    output = scale_dir(scale)
+    try:
+        manifest = json.loads((output / "scale.json").read_text(encoding="utf-8"))
+        if (manifest["fingerprint"], manifest["scale"], manifest["seed"]) == (batch_fingerprint(source), scale, seed):
+            return output
+    except (OSError, ValueError, KeyError):
+        pass
+    generate(source, output, scale, seed, progress)
+    return output
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a scaled-up, referentially valid CSV batch.")
+    parser.add_argument("--scale", type=float, required=True, help="Size factor vs the source batch, e.g. 10")
+    parser.add_argument("--seed", type=int, default=1, help="Sampling seed (default: 1)")
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE, help="Source batch (default: fixtures/csv)")
+    parser.add_argument("--output", type=Path, help="Target (default: fixtures/csv-scale/x<scale>)")
+    args = parser.parse_args()
+
+    output = (args.output or scale_dir(args.scale)).resolve()
+    manifest = generate(args.source.resolve(), output, args.scale, args.seed)
+    learned, generated = manifest["learned"], manifest["generated"]
+    print(f"  {'file':<36} {'coverage':^17} {'rows/SKU':^17}")
+    for name, g in generated["files"].items():
+        l = learned["files"][name]
+        print(f"  {name:<36} {l['coverage']:>8.3f}→{g['coverage']:<8.3f} {l['rows_per_sku']:>8.3f}→{g['rows_per_sku']:<8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
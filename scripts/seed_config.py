@@ -6,38 +6,48 @@ FirebaseConfigurationService at startup of NavigationApi and ProductsApi.
 Must be run BEFORE starting the phase4 containers (navigation-api, products-api),
 because both services read the configuration collection synchronously at startup.
 
-The document contains:
+The document (fixtures/seeds/configuration.json) contains:
   - project_id      — used by FirestoreDbResolver to build per-locale Firestore connections
   - database_de_de  — maps locale "de-DE" to Firestore database "(default)"
   - fallback_locale — fallback when requested locale has no database_* entry
 
+`--locales en_GB fr_FR` adds a database_<culture> entry per locale (all on
+"(default)"), matching a batch derived by scripts/derive_locales.py.
+
 Usage:
-    python scripts/seed_config.py [--host HOST]
+    python scripts/seed_config.py [--host HOST] [--locales en_GB fr_FR ...]
 """
 import argparse
 import os
 import sys
+from pathlib import Path
+
+# Allow `python scripts/seed_config.py` to import the shared seeding engine
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
-def seed_config(host: str = "localhost:8080") -> None:
+def seed_config(host: str = "localhost:8080", locales=()) -> None:
     os.environ["FIRESTORE_EMULATOR_HOST"] = host
     os.environ.setdefault("GCLOUD_PROJECT", "demo-project")
 
     from google.cloud import firestore
 
+    from tests._locales import configuration_entries
+    from tests._seeding import manifest_document, seed_manifest
+
     client = firestore.Client(project="demo-project")
 
-    config_doc = {
-        "project_id": "demo-project",
-        "database_de_de": "(default)",
-        "fallback_locale": "de_de",
-    }
+    # Document body lives in fixtures/seeds/configuration.json
+    seed_manifest(client, "configuration")
 
-    client.collection("configuration").document("config").set(config_doc)
+    config_doc = manifest_document("configuration", "configuration", "config")
+    if locales:
+        extra = configuration_entries(locales)
+        client.collection("configuration").document("config").set(extra, merge=True)
+        config_doc = {**config_doc, **extra}
     print(f"Seeded configuration/config in emulator at {host}")
-    print(f"  project_id    = demo-project")
-    print(f"  database_de_de = (default)")
-    print(f"  fallback_locale = de_de")
+    for key, value in config_doc.items():
+        print(f"  {key} = {value}")
 
 
 if __name__ == "__main__":
@@ -49,10 +59,16 @@ if __name__ == "__main__":
         default=os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080"),
         help="Firestore emulator host:port (default: localhost:8080)",
     )
+    parser.add_argument(
+        "--locales",
+        nargs="*",
+        default=[],
+        help="Extra locales to map to the (default) database, e.g. en_GB fr_FR",
+    )
     args = parser.parse_args()
 
     try:
-        seed_config(args.host)
+        seed_config(args.host, args.locales)
     except Exception as e:
         print(f"ERROR: Failed to seed configuration: {e}", file=sys.stderr)
         sys.exit(1)
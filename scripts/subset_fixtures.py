@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Cuts a small, referentially consistent CSV batch out of fixtures/csv/ for the
+Layer 1 smoke run (`make test-pipeline-smoke`).
+
+  1. Pick N base SKUs — always the ones the pipeline tests assert on (ALWAYS_SKUS),
+     the rest a seeded random sample, so the subset is reproducible.
+  2. Keep every SKU of those base SKUs (all finishes — PLVariant groups stay whole),
+     then follow SKU → SKU joins (spare parts, alternatives, …) to a fixed point.
+  3. Stream every product file (`1_` … `10_`) keeping only rows of kept SKUs.
+  4. Reduce each index file (`A_` … `H_`) to the rows referenced by kept rows,
+     following its joins (tests/_csv_schema.py) — category ParentId chains up to
+     the root included. Index files with no join from a product file present in
+     the batch are copied whole, so nothing a loader lookup needs can go missing.
+
+The output directory also gets subset.json: chosen base SKUs, row counts per file
+and the joins that were followed.
+
+Usage:
+    python scripts/subset_fixtures.py [--count 40] [--seed 1] [--source fixtures/csv]
+                                      [--output fixtures/csv-smoke]
+"""
+import argparse
+import csv
+import json
+import random
+import shutil
+import sys
+from pathlib import Path
+
+# Allow `python scripts/subset_fixtures.py` to import the shared CSV schema
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests._csv_schema import (   # noqa: E402
+    INDEX_KEYS, SKU_TARGET,
+    base_sku_column, csv_files, derive_base_sku, discover_joins,
+    is_product_file, iter_rows, read_header, sku_column, split_values,
+)
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SOURCE  = INTEGRATION_DIR / "fixtures" / "csv"
+DEFAULT_OUTPUT  = INTEGRATION_DIR / "fixtures" / "csv-smoke"
+
+# SKUs the tests/pipeline/ assertions look up by ID
+ALWAYS_SKUS = ("66838000", "40806000")
+
+
+# ── Selection ─────────────────────────────────────────────────────────────────
+
+def sku_bases(files: dict) -> dict:
+    """{sku: base_sku} over every product file (explicit base_sku column wins)."""
+    bases = {}
+    for name, path in files.items():
+        if not is_product_file(name):
+            continue
+        header = read_header(path)
+        sku_col, base_col = sku_column(header), base_sku_column(header)
+        if not sku_col:
+            continue
+        for row in iter_rows(path):
+            sku = row[sku_col]
+            if sku and (base_col or sku not in bases):
+                bases[sku] = row[base_col] if base_col and row[base_col] else derive_base_sku(sku)
+    return bases
+
+
+def choose_bases(bases: dict, count: int, seed: int) -> list:
+    always = sorted({bases.get(sku, derive_base_sku(sku)) for sku in ALWAYS_SKUS})
+    others = sorted(set(bases.values()) - set(always))
+    random.Random(seed).shuffle(others)
+    return always + sorted(others[:max(0, count - len(always))])
+
+
+def sku_closure(files: dict, joins: list, skus: set) -> set:
+    """Add SKUs referenced from kept rows through SKU → SKU joins, until nothing changes."""
+    sku_joins = [j for j in joins if j.target == SKU_TARGET]
+    frontier = set(skus)
+    while frontier and sku_joins:
+        found = set()
+        for join in sku_joins:
+            sku_col = sku_column(read_header(files[join.source]))
+            for row in iter_rows(files[join.source]):
+                if row[sku_col] in frontier:
+                    found.update(split_values(row[join.column], join.separator))
+        frontier = found - skus
+        skus |= frontier
+    return skus
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+
+def write_filtered(src: Path, dst: Path, keep) -> int:
+    """Stream `src` to `dst`, keeping rows for which keep(row) is true. Returns rows written."""
+    kept = 0
+    with open(src, encoding="utf-8-sig", newline="") as fin, \
+         open(dst, "w", encoding="utf-8", newline="") as fout:
+        reader = csv.DictReader(fin)
+        writer = csv.DictWriter(fout, fieldnames=reader.fieldnames, lineterminator="\n")
+        writer.writeheader()
+        for row in reader:
+            if keep(row):
+                writer.writerow(row)
+                kept += 1
+    return kept
+
+
+def referenced_keys(files: dict, joins: list, skus: set) -> dict:
+    """{index file: referenced key values} from the kept product rows."""
+    refs = {}
+    for join in joins:
+        if join.target == SKU_TARGET or not is_product_file(join.source):
+            continue
+        sku_col = sku_column(read_header(files[join.source]))
+        bucket = refs.setdefault(join.target, set())
+        for row in iter_rows(files[join.source]):
+            if row[sku_col] in skus:
+                bucket.update(split_values(row[join.column], join.separator))
+    return refs
+
+
+def self_closure(path: Path, joins: list, keys: set) -> set:
+    """Follow an index file's joins onto itself (category ParentId → ID) up to the roots."""
+    self_joins = [j for j in joins if j.source == j.target == path.name]
+    if not self_joins:
+        return keys
+    parents = {}
+    for row in iter_rows(path):
+        parents[row[self_joins[0].target_column]] = [
+            v for j in self_joins for v in split_values(row[j.column], j.separator)
+        ]
+    frontier = set(keys)
+    while frontier:
+        frontier = {p for k in frontier for p in parents.get(k, [])} - keys
+        keys |= frontier
+    return keys
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def subset(source: Path, output: Path, count: int, seed: int) -> dict:
+    files = csv_files(source)
+    if not files:
+        raise SystemExit(f"No CSV files in {source}")
+    joins = discover_joins(source)
+
+    bases = sku_bases(files)
+    chosen = choose_bases(bases, count, seed)
+    skus = {sku for sku, base in bases.items() if base in set(chosen)} | set(ALWAYS_SKUS)
+    skus = sku_closure(files, joins, skus)
+
+    if output.exists():
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+
+    counts = {}
+    refs = referenced_keys(files, joins, skus)
+    for name, path in files.items():
+        if is_product_file(name) and sku_column(read_header(path)):
+            sku_col = sku_column(read_header(path))
+            counts[name] = write_filtered(path, output / name, lambda r: r[sku_col] in skus)
+        elif name in refs and name in INDEX_KEYS:
+            keys = self_closure(path, joins, refs[name])
+            key_col = INDEX_KEYS[name]
+            counts[name] = write_filtered(path, output / name, lambda r: r[key_col] in keys)
+        else:
+            shutil.copyfile(path, output / name)
+            counts[name] = "copied"
+
+    manifest = {
+        "source":    str(source),
+        "seed":      seed,
+        "base_skus": chosen,
+        "skus":      len(skus),
+        "rows":      counts,
+        "joins":     [str(j) for j in joins],
+    }
+    (output / "subset.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write a referentially consistent subset of a CSV batch.")
+    parser.add_argument("--count", type=int, default=40, help="Number of base SKUs (default: 40)")
+    parser.add_argument("--seed", type=int, default=1, help="Sampling seed (default: 1)")
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE, help="Full batch (default: fixtures/csv)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Target (default: fixtures/csv-smoke)")
+    args = parser.parse_args()
+
+    manifest = subset(args.source.resolve(), args.output.resolve(), args.count, args.seed)
+    print(f"✓ {len(manifest['base_skus'])} base SKUs → {manifest['skus']} SKUs in {args.output}")
+    for name, rows in manifest["rows"].items():
+        print(f"  {name:<44} {rows}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
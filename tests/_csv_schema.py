@@ -0,0 +1,248 @@
+"""
+Join graph of the data-loader's CSV batch (fixtures/csv/ layout).
+
+Two kinds of files:
+
+  product files  `1_` … `10_` — one or more rows per SKU, keyed by a SKU column
+                 (`sku`, or `COD_MATERIAL` in 9_product_data_specification.csv)
+  index files    `A_` … `H_`  — reference tables keyed by INDEX_KEYS
+
+Joins between them are either declared (DECLARED_JOINS — known columns of the
+files in this repo) or discovered from column-name hints (JOIN_HINTS) in files
+whose exact layout is not pinned here, e.g. 1_product_data.csv or 7_spare_part.csv.
+A hinted column only becomes a join when ≥ DISCOVERY_RATIO of its sampled
+non-empty values resolve in the target, so free-text columns that merely contain
+"tag" or "finish" in their name are never mistaken for foreign keys.
+
+REQUIRED_COLUMNS pins the 14 files of the fixtures/csv/ batch and the columns each
+must have; OPTIONAL_COLUMNS covers the NEO/data_input/ files the committed batch
+does not ship (1_, 2_, 7_). UNIQUE_KEYS gives the row key of each file, and
+KNOWN_KEY_CONFLICTS the keys the committed batch is known to repeat. All are used
+by the CSV preflight (tests/_preflight.py).
+
+Used by the fixture tools (scripts/subset_fixtures.py, …) to keep reduced or
+generated batches referentially consistent.
+"""
+
+import csv
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+# ── Layout ────────────────────────────────────────────────────────────────────
+
+SKU_COLUMNS      = ("sku", "SKU", "COD_MATERIAL")
+BASE_SKU_COLUMNS = ("base_sku", "BaseSKU", "basesku")
+
+# Index file → key column
+INDEX_KEYS = {
+    "A_product_category_index.csv":             "ID",
+    "B_product_feature_index.csv":              "id",
+    "C_tag_index.csv":                          "id",
+    "D_award_index.csv":                        "id",
+    "E_finish_index.csv":                       "id",
+    "F_filter_index.csv":                       "Id",
+    "G_price_range_index.csv":                  "Market",
+    "H_product_data_specification_index.csv":   "characteristic",
+}
+
+SKU_TARGET = "<sku>"   # join target meaning "another product's SKU"
+
+# File → columns it must have: the files of fixtures/csv/.
+REQUIRED_COLUMNS = {
+    "4_included_not_included.csv":              ("sku", *(f"included_{i}" for i in range(1, 11)),
+                                                 *(f"not_included_{i}" for i in range(1, 11)),
+                                                 "language", "market"),
+    "5_tag.csv":                                ("sku", "tag_ids_consolidated", "tag_trending", "language", "market"),
+    "6_warranty.csv":                           ("sku", "warranty_default", "warranty_extension_register",
+                                                 "warranty_extension_grohe_plus_installers", "warranty_special_UK",
+                                                 "warranty_special_france", "warranty_special_denmark",
+                                                 "warranty_special_spain"),
+    "8_filter.csv":                             ("sku", "portfolio", "EU_taxonomy", "recommended",
+                                                 "water_saving", "energy_saving"),
+    "9_product_data_specification.csv":         ("COD_MATERIAL", "COD_CHAR", "VALUE_COMBINED"),
+    "10_flow_diagram.csv":                      ("sku", "flow_diagram", "language", "market"),
+    "A_product_category_index.csv":             ("ID", "Language", "Market", "Name", "ParentId", "Slug",
+                                                 "Image", "Priority", "MenuVisibility", "Type"),
+    "B_product_feature_index.csv":              ("id", "code", "Link", "language", "market", "title",
+                                                 "short_text", "long_text"),
+    "C_tag_index.csv":                          ("id", "ranking", "name", "color", "language", "market"),
+    "D_award_index.csv":                        ("id", "title", "alt_text_image", "celum_id", "graphic_link"),
+    "E_finish_index.csv":                       ("id", "language", "market", "code", "name"),
+    "F_filter_index.csv":                       ("Id", "name", "language", "market"),
+    "G_price_range_index.csv":                  ("Market",),
+    "H_product_data_specification_index.csv":   ("ranking", "category", "characteristic", "description_SAP",
+                                                 "SAP_value", "consumer_wording_description",
+                                                 "consumer_wording_value", "language", "market"),
+}
+
+# Files of a full NEO/data_input/ batch that fixtures/csv/ does not ship. Their layout is
+# not pinned in this repo, so only the SKU column is; when absent they are a warning.
+OPTIONAL_COLUMNS = {
+    "1_product_data.csv":                       ("sku",),
+    "2_product_content.csv":                    ("sku",),
+    "7_spare_part.csv":                         ("sku",),
+}
+
+# File → row key, unique per locale (language / market are added where the file has them).
+# 7_ has several rows per SKU and no pinned key.
+UNIQUE_KEYS = {
+    "1_product_data.csv":                       ("sku",),
+    "2_product_content.csv":                    ("sku",),
+    "4_included_not_included.csv":              ("sku",),
+    "5_tag.csv":                                ("sku",),
+    "6_warranty.csv":                           ("sku",),
+    "8_filter.csv":                             ("sku",),
+    "9_product_data_specification.csv":         ("COD_MATERIAL", "COD_CHAR"),
+    "10_flow_diagram.csv":                      ("sku",),
+    **{name: (key,) for name, key in INDEX_KEYS.items()},
+    "H_product_data_specification_index.csv":   ("characteristic", "SAP_value"),
+}
+
+# File → first key values the committed batch repeats with different data. The data-loader
+# runs on them; the preflight reports them as warnings instead of errors.
+KNOWN_KEY_CONFLICTS = {
+    "5_tag.csv":                                {"38966SHH"},    # tagged 8 at line 17529, 7 at 17555
+}
+
+MASTER_FILE = "1_product_data.csv"   # every product file's SKUs must be in here
+
+
+@dataclass(frozen=True)
+class Join:
+    source: str            # file name
+    column: str
+    target: str            # index file name, or SKU_TARGET
+    target_column: str
+    separator: str = None  # multi-valued cells, e.g. "6;8"
+
+    def __str__(self) -> str:
+        return f"{self.source}.{self.column} → {self.target}.{self.target_column}"
+
+
+DECLARED_JOINS = (
+    Join("5_tag.csv", "tag_ids_consolidated", "C_tag_index.csv", "id", ";"),
+    Join("5_tag.csv", "tag_trending", "C_tag_index.csv", "id", ";"),
+    Join("9_product_data_specification.csv", "COD_CHAR", "H_product_data_specification_index.csv", "characteristic"),
+    Join("A_product_category_index.csv", "ParentId", "A_product_category_index.csv", "ID"),
+)
+
+# Column-name fragment → join target, for product files without declared joins
+JOIN_HINTS = (
+    ("spare",    SKU_TARGET),
+    ("alternat", SKU_TARGET),
+    ("suggest",  SKU_TARGET),
+    ("categor",  "A_product_category_index.csv"),
+    ("feature",  "B_product_feature_index.csv"),
+    ("tag",      "C_tag_index.csv"),
+    ("award",    "D_award_index.csv"),
+    ("finish",   "E_finish_index.csv"),
+    ("filter",   "F_filter_index.csv"),
+)
+
+DISCOVERY_RATIO  = 0.9
+DISCOVERY_SAMPLE = 2000   # rows sampled per file when discovering joins
+SEPARATORS       = re.compile(r"[;,|]")
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+
+def is_product_file(name: str) -> bool:
+    return bool(re.match(r"\d+_", name))
+
+
+def is_index_file(name: str) -> bool:
+    return bool(re.match(r"[A-Z]_", name))
+
+
+def read_header(path: Path) -> list:
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        return next(csv.reader(fh), [])
+
+
+def iter_rows(path: Path):
+    """Stream rows as dicts — never loads a whole file."""
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        yield from csv.DictReader(fh)
+
+
+def sku_column(header) -> str:
+    return next((c for c in SKU_COLUMNS if c in header), None)
+
+
+def base_sku_column(header) -> str:
+    return next((c for c in BASE_SKU_COLUMNS if c in header), None)
+
+
+def derive_base_sku(sku: str) -> str:
+    """SKU minus its 3-character finish code (66838000 → 66838, 29119GL0 → 29119)."""
+    return sku[:-3] if len(sku) > 3 else sku
+
+
+def split_values(value: str, separator: str = None) -> list:
+    if not value:
+        return []
+    parts = value.split(separator) if separator else [value]
+    return [p.strip() for p in parts if p.strip()]
+
+
+def csv_files(directory: Path) -> dict:
+    """{file name: path} of every CSV in `directory`, product files first, in batch order."""
+    def order(p: Path):
+        m = re.match(r"(\d+)_", p.name)
+        return (0, int(m.group(1)), p.name) if m else (1, 0, p.name)
+    return {p.name: p for p in sorted(Path(directory).glob("*.csv"), key=order)}
+
+
+# ── Join discovery ────────────────────────────────────────────────────────────
+
+def _key_set(path: Path, column: str) -> set:
+    return {row[column] for row in iter_rows(path) if row.get(column)}
+
+
+def discover_joins(directory: Path) -> list:
+    """Declared joins whose columns exist, plus hinted joins that hold on sampled data."""
+    files = csv_files(directory)
+    headers = {name: read_header(path) for name, path in files.items()}
+
+    joins = [j for j in DECLARED_JOINS
+             if j.source in files and j.target in files
+             and j.column in headers[j.source] and j.target_column in headers[j.target]]
+    declared = {(j.source, j.column) for j in joins}
+
+    keys = {}   # target → key set (loaded lazily)
+    for name, path in files.items():
+        if not is_product_file(name):
+            continue
+        own_sku = sku_column(headers[name])
+        for column in headers[name]:
+            if column == own_sku or (name, column) in declared:
+                continue
+            target = next((t for hint, t in JOIN_HINTS if hint in column.lower()), None)
+            if target is None or (target != SKU_TARGET and target not in files):
+                continue
+            if target == SKU_TARGET:
+                if SKU_TARGET not in keys:
+                    keys[SKU_TARGET] = {row[c] for n, p in files.items() if is_product_file(n)
+                                        for c in [sku_column(headers[n])] if c
+                                        for row in iter_rows(p) if row.get(c)}
+                target_column = "sku"
+            else:
+                target_column = INDEX_KEYS[target]
+                if target not in keys:
+                    keys[target] = _key_set(files[target], target_column)
+
+            values, hits, seen_separators = 0, 0, {}
+            for i, row in enumerate(iter_rows(path)):
+                if i >= DISCOVERY_SAMPLE:
+                    break
+                raw = row.get(column) or ""
+                for sep in SEPARATORS.findall(raw):
+                    seen_separators[sep] = seen_separators.get(sep, 0) + 1
+                for v in (p.strip() for p in SEPARATORS.split(raw) if p.strip()):
+                    values += 1
+                    hits += v in keys[target]
+            if values and hits / values >= DISCOVERY_RATIO:
+                sep = max(seen_separators, key=seen_separators.get) if seen_separators else None
+                joins.append(Join(name, column, target, target_column, sep))
+    return joins
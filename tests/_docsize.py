@@ -0,0 +1,206 @@
+"""
+Firestore storage-size accounting, following the documented rules
+(https://cloud.google.com/firestore/docs/storage-size):
+
+  string      UTF-8 bytes + 1            boolean, null   1
+  integer     8                          float           8
+  timestamp   8                          geo point       16
+  bytes       length                     reference       document name size
+  array       sum of element sizes       map             sum of (key string + value)
+
+  document name  sum of (collection / document ID string sizes) + 16
+  document       name + sum of (field name string + value) + 32
+
+document_size() is what the 1 MiB limit is enforced against — json.dumps misses the
+per-value overheads, the document name and the fixed 32 bytes, and over-counts
+punctuation and escaping.
+
+SizeProfile aggregates a whole collection: byte histogram, top-N largest
+documents (with their heaviest fields) and per-field byte attribution, e.g.
+  [docsize] PLProductContent  17412 docs  mean 6.1KB  max 212.4KB  (limit 1024.0KB)
+    histogram   ≤1.0KB 12 | ≤4.0KB 9120 | ≤16.0KB 7730 | ≤64.0KB 530 | ≤256.0KB 20
+    fields      Specifications 41.2% | Variants 18.0% | SpareParts 11.5% | ...
+    largest     46444000_de_DE 212.4KB  (SpareParts 120.1KB, Specifications 61.0KB, ...)
+"""
+
+import datetime
+import heapq
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from google.cloud import firestore
+
+from tests._id_index import scan_partitioned
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+FIRESTORE_MAX_DOC_BYTES = 1_048_576
+
+# Collections the pipeline tests size-profile (`size_profiles` fixture)
+SIZE_PROFILED_COLLECTIONS = ("PLProductContent", "ProductIndexData")
+
+DOCUMENT_OVERHEAD = 32
+NAME_OVERHEAD     = 16
+
+# Histogram upper bounds (bytes); the last bucket is open-ended
+BUCKETS = (1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10, 512 << 10, 900_000, FIRESTORE_MAX_DOC_BYTES)
+
+TOP_N       = 10
+TOP_FIELDS  = 3    # heaviest fields listed per top-N document
+REPORTS_DIR = Path(__file__).parent.parent / "reports"
+
+
+# ── Size rules ────────────────────────────────────────────────────────────────
+
+def string_size(value: str) -> int:
+    return len(value.encode("utf-8")) + 1
+
+
+def document_name_size(path: str) -> int:
+    """Size of a document name such as `PLProductContent/40806000_de_DE`."""
+    return sum(string_size(part) for part in path.split("/") if part) + NAME_OVERHEAD
+
+
+def value_size(value) -> int:
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, datetime.datetime)):
+        return 8
+    if isinstance(value, str):
+        return string_size(value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(string_size(k) + value_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(value_size(v) for v in value)
+    if isinstance(value, firestore.GeoPoint):
+        return 16
+    path = getattr(value, "path", None)   # DocumentReference
+    if isinstance(path, str):
+        return document_name_size(path)
+    raise TypeError(f"No Firestore size rule for {type(value).__name__}")
+
+
+def field_sizes(data: dict) -> dict:
+    """Bytes per top-level field (field name + value)."""
+    return {name: string_size(name) + value_size(value) for name, value in data.items()}
+
+
+def document_size(collection: str, doc_id: str, data: dict) -> int:
+    return document_name_size(f"{collection}/{doc_id}") + sum(field_sizes(data).values()) + DOCUMENT_OVERHEAD
+
+
+# ── Collection profile ────────────────────────────────────────────────────────
+
+def _kb(n: float) -> str:
+    return f"{n / 1024:.1f}KB"
+
+
+def _bucket_label(i: int) -> str:
+    return f"≤{_kb(BUCKETS[i])}" if i < len(BUCKETS) else f">{_kb(BUCKETS[-1])}"
+
+
+@dataclass
+class SizeProfile:
+    """Size distribution of one collection. Partial profiles from parallel ranges merge()."""
+
+    collection: str
+    count: int = 0
+    total: int = 0
+    histogram: list = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+    field_total: dict = field(default_factory=dict)    # field → bytes across all docs
+    field_max: dict = field(default_factory=dict)      # field → largest single value
+    largest: list = field(default_factory=list)        # [(size, doc_id, {field: bytes})], heaviest first
+
+    def add(self, doc_id: str, data: dict, top: int = TOP_N) -> int:
+        fields = field_sizes(data)
+        size = document_name_size(f"{self.collection}/{doc_id}") + sum(fields.values()) + DOCUMENT_OVERHEAD
+        self.count += 1
+        self.total += size
+        self.histogram[next((i for i, b in enumerate(BUCKETS) if size <= b), len(BUCKETS))] += 1
+        for name, n in fields.items():
+            self.field_total[name] = self.field_total.get(name, 0) + n
+            self.field_max[name] = max(self.field_max.get(name, 0), n)
+        if len(self.largest) < top or size > self.largest[-1][0]:
+            heaviest = dict(sorted(fields.items(), key=lambda kv: -kv[1])[:TOP_FIELDS])
+            self.largest = heapq.nlargest(top, [*self.largest, (size, doc_id, heaviest)], key=lambda t: t[0])
+        return size
+
+    def merge(self, other: "SizeProfile", top: int = TOP_N) -> "SizeProfile":
+        self.count += other.count
+        self.total += other.total
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        for name, n in other.field_total.items():
+            self.field_total[name] = self.field_total.get(name, 0) + n
+        for name, n in other.field_max.items():
+            self.field_max[name] = max(self.field_max.get(name, 0), n)
+        self.largest = heapq.nlargest(top, [*self.largest, *other.largest], key=lambda t: t[0])
+        return self
+
+    @property
+    def max(self) -> int:
+        return self.largest[0][0] if self.largest else 0
+
+    def field_shares(self) -> list:
+        """[(field, bytes, share of all bytes)] heaviest first."""
+        return [(name, n, n / self.total if self.total else 0.0)
+                for name, n in sorted(self.field_total.items(), key=lambda kv: -kv[1])]
+
+    def to_dict(self) -> dict:
+        return {
+            "collection": self.collection,
+            "count":      self.count,
+            "total":      self.total,
+            "mean":       round(self.total / self.count) if self.count else 0,
+            "max":        self.max,
+            "limit":      FIRESTORE_MAX_DOC_BYTES,
+            "histogram":  {_bucket_label(i): n for i, n in enumerate(self.histogram)},
+            "fields":     [{"field": f, "bytes": n, "share": round(s, 4), "max": self.field_max[f]}
+                           for f, n, s in self.field_shares()],
+            "largest":    [{"id": doc_id, "bytes": size, "fields": heaviest}
+                           for size, doc_id, heaviest in self.largest],
+        }
+
+    def __str__(self) -> str:
+        mean = self.total / self.count if self.count else 0
+        hist = " | ".join(f"{_bucket_label(i)} {n}" for i, n in enumerate(self.histogram) if n)
+        shares = " | ".join(f"{f} {s:.1%}" for f, _, s in self.field_shares()[:6])
+        lines = [
+            f"[docsize] {self.collection:<18} {self.count} docs  mean {_kb(mean)}  "
+            f"max {_kb(self.max)}  (limit {_kb(FIRESTORE_MAX_DOC_BYTES)})",
+            f"  histogram   {hist or '-'}",
+            f"  fields      {shares or '-'}",
+        ]
+        for size, doc_id, heaviest in self.largest[:3]:
+            parts = ", ".join(f"{f} {_kb(n)}" for f, n in heaviest.items())
+            lines.append(f"  largest     {doc_id} {_kb(size)}  ({parts})")
+        return "\n".join(lines)
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def profile_collections(client: firestore.Client, index, collections, **scan_options) -> dict:
+    """
+    Size-profile every document of `collections` over parallel cursor ranges.
+
+    Returns {collection: SizeProfile} and writes them to reports/doc_sizes.json.
+    """
+    def visit(collection, snapshots):
+        partial = SizeProfile(collection)
+        for snap in snapshots:
+            partial.add(snap.id, snap.to_dict())
+        return partial
+
+    profiles = {name: SizeProfile(name) for name in collections}
+    for name, partial in scan_partitioned(client, index, list(collections), visit, **scan_options):
+        profiles[name].merge(partial)
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    (REPORTS_DIR / "doc_sizes.json").write_text(
+        json.dumps({name: p.to_dict() for name, p in profiles.items()}, indent=2), encoding="utf-8",
+    )
+    for profile in profiles.values():
+        print(profile, flush=True)
+    return profiles
@@ -0,0 +1,34 @@
+"""
+Paths and emulator settings shared by the conftests and test modules. A plain module:
+importing names from a conftest depends on pytest's import mode and can load it twice.
+"""
+
+import os
+import platform
+import sys
+from pathlib import Path
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+
+REPO_ROOT       = Path(__file__).parent.parent.parent          # NEO/
+INTEGRATION_DIR = Path(__file__).parent.parent                 # NEO/integration/
+DATA_LOADER_DIR = REPO_ROOT / "grohe-neo-data-loader"
+# Batch the pipeline runs on — `make test-pipeline-smoke` points this at fixtures/csv-smoke
+FIXTURES_CSV    = INTEGRATION_DIR / os.environ.get("PIPELINE_FIXTURES", "fixtures/csv")
+
+# Python executable inside the data-loader's virtualenv
+if platform.system() == "Windows":
+    DATA_LOADER_PYTHON = DATA_LOADER_DIR / ".venv" / "Scripts" / "python.exe"
+else:
+    DATA_LOADER_PYTHON = DATA_LOADER_DIR / ".venv" / "bin" / "python"
+
+# Fallback to system Python if the venv doesn't exist yet
+if not DATA_LOADER_PYTHON.exists():
+    DATA_LOADER_PYTHON = Path(sys.executable)
+
+# ── Emulator config ───────────────────────────────────────────────────────────
+
+EMULATOR_HOST      = os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
+SERVICE_PROJECT_ID = "demo-project"                     # project the Docker services read
+XDIST_WORKER       = os.environ.get("PYTEST_XDIST_WORKER", "")   # "gw0", "gw1", ... under xdist
+PROJECT_ID         = f"{SERVICE_PROJECT_ID}-{XDIST_WORKER}" if XDIST_WORKER else SERVICE_PROJECT_ID
@@ -0,0 +1,221 @@
+"""
+Content-addressed cache of ETL results for the `pipeline_result` fixture.
+
+The cache key is a sha256 over everything that can change the loader's output:
+
+  1. data-loader source — `git rev-parse HEAD^{tree}` plus the content hash of every
+     modified, staged or untracked file (falls back to hashing the whole working
+     tree when the data-loader is not a git checkout)
+  2. every file in fixtures/csv/ (name + content)
+  3. the exact main.py argument list
+
+Each entry is a tests/_snapshot.py snapshot (per-collection Firestore dump plus the
+recorded stdout / stderr / returncode) stored under .cache/etl/<key>/. Entries are
+evicted least-recently-used once the cache exceeds ETL_CACHE_MAX_MB (default 2048).
+
+Hit / miss / eviction counters and recent events are written to reports/etl_cache.json.
+
+Under pytest-xdist every worker computes the same key; entry_lock() lets the first
+worker run the ETL while the others wait and then restore its result into their
+own per-worker project.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+from tests._snapshot import has_snapshot, restore_snapshot, save_snapshot
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+INTEGRATION_DIR = Path(__file__).parent.parent
+CACHE_DIR       = INTEGRATION_DIR / ".cache" / "etl"
+INDEX_FILE      = CACHE_DIR / "index.json"
+STATS_FILE      = INTEGRATION_DIR / "reports" / "etl_cache.json"
+
+MAX_BYTES     = int(float(os.environ.get("ETL_CACHE_MAX_MB", "2048")) * 1024 * 1024)
+RECENT_EVENTS = 50
+LOCK_TIMEOUT  = 1800   # seconds — longer than the 900s ETL subprocess timeout
+
+# Never part of the source fingerprint when walking a non-git data-loader
+_IGNORED_DIRS = {".git", ".venv", "venv", "__pycache__", ".pytest_cache", ".mypy_cache"}
+
+
+# ── Fingerprinting ────────────────────────────────────────────────────────────
+
+def _hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _git(directory: Path, *args) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=directory, capture_output=True, text=True, check=True,
+    ).stdout
+
+
+def source_fingerprint(directory: Path) -> str:
+    """Git tree hash + dirty-file hashes of a working tree."""
+    h = hashlib.sha256()
+    try:
+        h.update(_git(directory, "rev-parse", "HEAD^{tree}").strip().encode())
+        # --relative: cwd-relative paths, like ls-files — the loader may be a subdirectory of the checkout
+        dirty = set(_git(directory, "diff", "--name-only", "--relative", "-z", "HEAD").split("\0"))
+        dirty |= set(_git(directory, "ls-files", "-z", "--others", "--exclude-standard").split("\0"))
+        paths = sorted(p for p in dirty if p)
+    except (OSError, subprocess.CalledProcessError):
+        # Not a git checkout — hash every source file instead
+        paths = sorted(
+            str(p.relative_to(directory)).replace(os.sep, "/")
+            for p in directory.rglob("*")
+            if p.is_file() and not _IGNORED_DIRS.intersection(p.relative_to(directory).parts)
+        )
+    for rel in paths:
+        path = directory / rel
+        digest = _hash_file(path) if path.is_file() else "<deleted>"
+        h.update(f"{rel}\0{digest}\n".encode())
+    return h.hexdigest()
+
+
+def fixtures_fingerprint(directory: Path) -> str:
+    h = hashlib.sha256()
+    for path in sorted(p for p in directory.iterdir() if p.is_file()):
+        h.update(f"{path.name}\0{_hash_file(path)}\n".encode())
+    return h.hexdigest()
+
+
+def cache_key(data_loader_dir: Path, fixtures_dir: Path, args) -> str:
+    """sha256 over the loader source, the CSV fixtures and the main.py argument list."""
+    h = hashlib.sha256()
+    h.update(b"source\0" + source_fingerprint(Path(data_loader_dir)).encode())
+    h.update(b"fixtures\0" + fixtures_fingerprint(Path(fixtures_dir)).encode())
+    h.update(b"args\0" + json.dumps([str(a) for a in args]).encode())
+    return h.hexdigest()
+
+
+# ── Index + stats ─────────────────────────────────────────────────────────────
+
+def _load_json(path: Path, default: dict) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")   # unique per xdist worker
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _dir_size(directory: Path) -> int:
+    return sum(p.stat().st_size for p in directory.rglob("*") if p.is_file())
+
+
+def _record(event: str, key: str, seconds: float, evicted: int = 0) -> None:
+    stats = _load_json(STATS_FILE, {"hits": 0, "misses": 0, "evictions": 0, "events": []})
+    stats["hits"]      += event == "hit"
+    stats["misses"]    += event == "miss"
+    stats["evictions"] += evicted
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+
+    index = _load_json(INDEX_FILE, {})
+    stats["entries"]    = len(index)
+    stats["size_bytes"] = sum(e["size"] for e in index.values())
+    stats["max_bytes"]  = MAX_BYTES
+
+    stats["events"].append({
+        "time":    time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "event":   event,
+        "key":     key[:16],
+        "seconds": round(seconds, 2),
+    })
+    stats["events"] = stats["events"][-RECENT_EVENTS:]
+    _write_json(STATS_FILE, stats)
+
+
+def _evict(index: dict, keep: str) -> int:
+    """Drop least-recently-used entries until the cache fits MAX_BYTES."""
+    evicted = 0
+    for key in sorted(index, key=lambda k: index[k]["last_used"]):
+        if sum(e["size"] for e in index.values()) <= MAX_BYTES:
+            break
+        if key == keep:
+            continue
+        shutil.rmtree(CACHE_DIR / key, ignore_errors=True)
+        del index[key]
+        evicted += 1
+    return evicted
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+@contextlib.contextmanager
+def entry_lock(key: str, timeout: float = LOCK_TIMEOUT, poll: float = 2.0):
+    """Serialise lookup + ETL run + store for one key across processes (O_EXCL lock file)."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    lock = CACHE_DIR / f"{key}.lock"
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            break
+        except FileExistsError:
+            try:
+                stale = time.time() - lock.stat().st_mtime > timeout
+            except OSError:
+                continue   # holder released between open() and stat()
+            if stale:
+                lock.unlink(missing_ok=True)
+                continue
+            if time.time() > deadline:
+                raise TimeoutError(f"Timed out waiting for ETL cache lock {lock}")
+            time.sleep(poll)
+    try:
+        yield
+    finally:
+        lock.unlink(missing_ok=True)
+
+
+def lookup(client, key: str):
+    """Restore a cached ETL result into the emulator. Returns CompletedProcess or None."""
+    start = time.perf_counter()
+    entry_dir = CACHE_DIR / key
+    index = _load_json(INDEX_FILE, {})
+
+    if key not in index or not has_snapshot(entry_dir):
+        _record("miss", key, time.perf_counter() - start)
+        return None
+
+    proc = restore_snapshot(client, entry_dir)
+    index[key]["last_used"] = time.time()
+    index[key]["hits"] = index[key].get("hits", 0) + 1
+    _write_json(INDEX_FILE, index)
+    _record("hit", key, time.perf_counter() - start)
+    return proc
+
+
+def store(client, key: str, proc: subprocess.CompletedProcess) -> None:
+    """Save the emulator state + process result under `key`, then enforce the size cap."""
+    start = time.perf_counter()
+    entry_dir = CACHE_DIR / key
+    save_snapshot(client, entry_dir, proc)
+
+    index = _load_json(INDEX_FILE, {})
+    now = time.time()
+    index[key] = {"size": _dir_size(entry_dir), "created": now, "last_used": now, "hits": 0}
+    evicted = _evict(index, keep=key)
+    _write_json(INDEX_FILE, index)
+    _record("store", key, time.perf_counter() - start, evicted)
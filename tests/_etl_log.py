@@ -0,0 +1,405 @@
+"""
+Streamed data-loader runs with per-stage timing extraction.
+
+run_streamed() replaces `subprocess.run(capture_output=True)` for main.py: the
+child's stdout and stderr are read line by line on two threads, written straight
+to log files and fed through StageParser as they arrive, so nothing is buffered
+in memory and progress is visible while the ETL runs.
+
+    reports/pipeline/<worker>/
+      data-loader.log   both streams, interleaved, "+  12.345s O| <line>"
+      stdout.log        raw stdout        (StreamedProcess.stdout reads it lazily)
+      stderr.log        raw stderr
+      timings.json      EtlSummary.to_dict()
+
+While the child runs, a sampler thread records the peak resident memory of its
+process tree (EtlSummary.peak_rss_mb) — from /proc on Linux, psutil elsewhere if
+installed, otherwise left as None.
+
+StageParser turns the output into an EtlSummary — one timed stage per CSV
+extraction, transform, per-collection load and verification, plus the outcome
+flags the pipeline tests assert on. Stages are recognised by STAGE_RULES; a stage
+runs from its first matching line until a line of another stage appears. Stages,
+counts and critical lines come from both streams; the outcome flags (completed,
+verification_passed, files, collections) only from stdout, where main.py prints
+its summary, so nothing on stderr can satisfy them.
+
+The same parser also works offline on a recorded stdout/stderr (parse_output),
+e.g. for an ETL cache hit — stage durations are then unknown (None).
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+# ── Markers ───────────────────────────────────────────────────────────────────
+
+# Every collection main.py --to-firestore writes
+PIPELINE_COLLECTIONS = (
+    "PLProductContent", "PLCategory",
+    "PLVariant", "ProductIndexData", "CategoryRouting",
+)
+
+COMPLETION_MARKER   = "ETL PIPELINE COMPLETED SUCCESSFULLY"
+VERIFICATION_MARKER = "Verification passed"
+CRITICAL_MARKERS    = ("Cannot continue: Missing essential", "Critical extraction errors")
+OUTCOME_FLAGS       = ("completed", "verification_passed", "files", "collections")   # stdout only
+
+_CSV        = re.compile(r"\b([0-9A-Z]+_[\w.-]+?\.csv)\b")   # 1_…10_ data files, A_…H_ indexes
+_COLLECTION = re.compile(r"\b(" + "|".join(PIPELINE_COLLECTIONS) + r")\b")
+_LOAD_VERB  = re.compile(r"load|upload|writ|sav|commit|batch", re.I)
+_VERIFY     = re.compile(r"verif", re.I)
+_TRANSFORM  = re.compile(r"transform", re.I)
+_RECORDS    = re.compile(r"(\d[\d,.]*)\s+(?:records|rows)\b", re.I)
+_PRODUCTS   = re.compile(r"(\d[\d,.]*)\s+products\b", re.I)
+
+
+def _classify_verify(line):
+    return "verify" if _VERIFY.search(line) else None
+
+
+def _classify_load(line):
+    m = _COLLECTION.search(line)
+    return f"load:{m.group(1)}" if m and _LOAD_VERB.search(line) else None
+
+
+def _classify_extract(line):
+    m = _CSV.search(line)
+    return f"extract:{m.group(1)}" if m else None
+
+
+def _classify_transform(line):
+    return "transform" if _TRANSFORM.search(line) else None
+
+
+# First match wins — verification lines also name collections, load lines may name CSVs
+STAGE_RULES = (_classify_verify, _classify_load, _classify_extract, _classify_transform)
+
+TAIL_LINES      = 40     # last output lines kept for failure messages
+HEARTBEAT       = 30.0   # seconds between "still running" progress lines
+MEMORY_SAMPLE   = 0.5    # seconds between process-tree RSS samples
+MAX_CRITICAL    = 20
+REPORTS_DIR     = Path(__file__).parent.parent / "reports" / "pipeline"
+
+
+def _number(text: str) -> int:
+    return int(re.sub(r"[,.]", "", text))
+
+
+# ── Summary ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class EtlSummary:
+    """Parsed outcome of one data-loader run."""
+
+    returncode: int = None
+    seconds: float = None
+    stages: list = field(default_factory=list)        # [{"name", "start", "seconds", "lines"}]
+    files: list = field(default_factory=list)         # CSV files mentioned on stdout, in order
+    collections: list = field(default_factory=list)   # pipeline collections mentioned on stdout
+    completed: bool = False
+    verification_passed: bool = False
+    critical: list = field(default_factory=list)      # lines with a CRITICAL_MARKER
+    error_lines: int = 0
+    records: int = None                               # largest "N records|rows" figure
+    products: int = None                              # largest "N products" figure
+    peak_rss_mb: float = None                         # peak RSS of the process tree
+    log_dir: str = None
+    tail: list = field(default_factory=list)
+    source: str = "run"                               # "run" | "cache" | "parsed"
+
+    def stage(self, name: str) -> dict:
+        return next((s for s in self.stages if s["name"] == name), None)
+
+    def stage_seconds(self, prefix: str) -> float:
+        """Total seconds of every stage whose name starts with `prefix` (e.g. "extract:")."""
+        times = [s["seconds"] for s in self.stages if s["name"].startswith(prefix) and s["seconds"] is not None]
+        return round(sum(times), 3) if times else None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EtlSummary":
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+    def __str__(self) -> str:
+        seconds = f"{self.seconds:.1f}s" if self.seconds is not None else "?"
+        lines = [
+            f"[etl] exit={self.returncode} {seconds} ({self.source}) completed={self.completed} "
+            f"verified={self.verification_passed} records={self.records} products={self.products} "
+            f"errors={self.error_lines}"
+            + (f" peak={self.peak_rss_mb:.0f}MB" if self.peak_rss_mb is not None else ""),
+        ]
+        for s in self.stages:
+            took = f"{s['seconds']:8.2f}s" if s["seconds"] is not None else "       ?"
+            lines.append(f"  {took}  {s['name']}")
+        for line in self.critical:
+            lines.append(f"  CRITICAL  {line}")
+        if self.log_dir:
+            lines.append(f"  log: {self.log_dir}/data-loader.log")
+        if self.tail:
+            lines.append("  last output lines:")
+            lines.extend(f"    {line}" for line in self.tail)
+        return "\n".join(lines)
+
+
+# ── Parser ────────────────────────────────────────────────────────────────────
+
+class StageParser:
+    """Incremental, thread-safe stage / outcome extraction from data-loader output lines."""
+
+    def __init__(self, on_stage=None):
+        self.summary = EtlSummary()
+        self._on_stage = on_stage
+        self._lock = threading.Lock()
+        self._current = None
+        self._index = {}
+        self._tail = []
+
+    @property
+    def current(self) -> str:
+        return self._current
+
+    def feed(self, line: str, t: float = None, stream: str = "stdout") -> None:
+        with self._lock:
+            self._feed(line, t, stream)
+
+    def _feed(self, line: str, t: float, stream: str) -> None:
+        s = self.summary
+        self._tail = (self._tail + [line])[-TAIL_LINES:]
+
+        if stream == "stdout":
+            if COMPLETION_MARKER in line:
+                s.completed = True
+            if VERIFICATION_MARKER in line:
+                s.verification_passed = True
+            for m in _CSV.finditer(line):
+                if m.group(1) not in s.files:
+                    s.files.append(m.group(1))
+            for m in _COLLECTION.finditer(line):
+                if m.group(1) not in s.collections:
+                    s.collections.append(m.group(1))
+        if any(marker in line for marker in CRITICAL_MARKERS) and len(s.critical) < MAX_CRITICAL:
+            s.critical.append(line.strip())
+        if "ERROR" in line or "❌" in line:
+            s.error_lines += 1
+        for pattern, attr in ((_RECORDS, "records"), (_PRODUCTS, "products")):
+            for m in pattern.finditer(line):
+                n = _number(m.group(1))
+                if getattr(s, attr) is None or n > getattr(s, attr):
+                    setattr(s, attr, n)
+
+        stage = next((name for rule in STAGE_RULES if (name := rule(line))), None)
+        if stage is None or stage == self._current:
+            if self._current is not None:
+                s.stages[self._index[self._current]]["lines"] += 1
+            return
+        self._close(t)
+        if stage not in self._index:
+            self._index[stage] = len(s.stages)
+            s.stages.append({"name": stage, "start": t, "seconds": None if t is None else 0.0, "lines": 0})
+        entry = s.stages[self._index[stage]]
+        entry["lines"] += 1
+        entry["_opened"] = t
+        self._current = stage
+        if self._on_stage:
+            self._on_stage(stage, t)
+
+    def _close(self, t: float) -> None:
+        if self._current is None:
+            return
+        entry = self.summary.stages[self._index[self._current]]
+        opened = entry.pop("_opened", None)
+        if t is not None and opened is not None:
+            entry["seconds"] = round(entry["seconds"] + t - opened, 3)
+
+    def finish(self, returncode: int, seconds: float = None) -> EtlSummary:
+        with self._lock:
+            self._close(seconds)
+            self._current = None
+            self.summary.returncode = returncode
+            self.summary.seconds = None if seconds is None else round(seconds, 3)
+            self.summary.tail = [line.rstrip() for line in self._tail]
+            return self.summary
+
+
+def parse_output(stdout: str, stderr: str = "", returncode: int = None) -> EtlSummary:
+    """Offline parse of recorded output — outcome flags and stage order, no durations."""
+    parser = StageParser()
+    for stream, text in (("stdout", stdout or ""), ("stderr", stderr or "")):
+        for line in text.splitlines():
+            parser.feed(line, stream=stream)
+    summary = parser.finish(returncode)
+    summary.source = "parsed"
+    return summary
+
+
+# ── Memory sampling ───────────────────────────────────────────────────────────
+
+def _proc_status_kb(pid: int, key: str) -> int:
+    with open(f"/proc/{pid}/status", encoding="ascii", errors="replace") as fh:
+        for line in fh:
+            if line.startswith(key + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def _proc_children(pid: int) -> list:
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children", encoding="ascii") as fh:
+                children.extend(int(c) for c in fh.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _tree_rss_kb(pid: int) -> int:
+    """
+    Current RSS of `pid` and its descendants in KiB, or None when it cannot be measured.
+    The root counts with its high-water mark, so a peak between two samples is not lost.
+    """
+    if os.path.isdir("/proc"):
+        total, stack = 0, [pid]
+        while stack:
+            p = stack.pop()
+            try:
+                total += _proc_status_kb(p, "VmHWM" if p == pid else "VmRSS")
+            except (OSError, ValueError):
+                continue
+            stack.extend(_proc_children(p))
+        return total or None
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        root = psutil.Process(pid)
+        return sum(p.memory_info().rss for p in [root, *root.children(recursive=True)]) // 1024
+    except psutil.Error:
+        return None
+
+
+class _MemorySampler(threading.Thread):
+    def __init__(self, pid: int):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.peak_kb = None
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while True:
+            kb = _tree_rss_kb(self.pid)
+            if kb is not None:
+                self.peak_kb = max(self.peak_kb or 0, kb)
+            if self._done.wait(MEMORY_SAMPLE):
+                return
+
+    def stop(self) -> float:
+        self._done.set()
+        self.join()
+        return None if self.peak_kb is None else round(self.peak_kb / 1024, 1)
+
+
+# ── Streamed run ──────────────────────────────────────────────────────────────
+
+class StreamedProcess(subprocess.CompletedProcess):
+    """CompletedProcess whose stdout / stderr are read from the log files on access."""
+
+    def __init__(self, args, returncode: int, log_dir: Path, summary: EtlSummary):
+        self.args = args
+        self.returncode = returncode
+        self.log_dir = Path(log_dir)
+        self.summary = summary
+
+    @property
+    def stdout(self) -> str:
+        return (self.log_dir / "stdout.log").read_text(encoding="utf-8")
+
+    @property
+    def stderr(self) -> str:
+        return (self.log_dir / "stderr.log").read_text(encoding="utf-8")
+
+
+def run_streamed(args, *, cwd, env, log_dir: Path, timeout: float, progress=None) -> StreamedProcess:
+    """
+    Run `args`, streaming both output streams to `log_dir` and through a StageParser.
+
+    `progress(message)` — if given — receives one line per stage change and a
+    heartbeat every HEARTBEAT seconds. Raises subprocess.TimeoutExpired like
+    subprocess.run() after killing the child.
+    """
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+
+    def elapsed() -> float:
+        return time.perf_counter() - start
+
+    def on_stage(stage, t):
+        if progress:
+            progress(f"[etl] +{t:6.1f}s  {stage}")
+
+    parser = StageParser(on_stage=on_stage)
+    combined_lock = threading.Lock()
+
+    proc = subprocess.Popen(
+        [str(a) for a in args], cwd=cwd, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, encoding="utf-8", errors="replace", bufsize=1,
+    )
+
+    with open(log_dir / "data-loader.log", "w", encoding="utf-8") as combined:
+
+        def pump(stream, name: str, tag: str):
+            with open(log_dir / f"{name}.log", "w", encoding="utf-8") as raw:
+                for line in stream:
+                    t = elapsed()
+                    raw.write(line)
+                    with combined_lock:
+                        combined.write(f"+{t:9.3f}s {tag}| {line}")
+                    parser.feed(line, t, name)
+
+        readers = [
+            threading.Thread(target=pump, args=(proc.stdout, "stdout", "O"), daemon=True),
+            threading.Thread(target=pump, args=(proc.stderr, "stderr", "E"), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        sampler = _MemorySampler(proc.pid)
+        sampler.start()
+
+        deadline = start + timeout
+        while True:
+            try:
+                proc.wait(timeout=max(0.0, min(HEARTBEAT, deadline - time.perf_counter())))
+                break
+            except subprocess.TimeoutExpired:
+                if time.perf_counter() >= deadline:
+                    proc.kill()
+                    proc.wait()
+                    sampler.stop()
+                    for reader in readers:
+                        reader.join()
+                    raise subprocess.TimeoutExpired(args, timeout)
+                if progress:
+                    progress(f"[etl] +{elapsed():6.1f}s  … {parser.current or 'starting'}")
+
+        for reader in readers:
+            reader.join()
+
+    summary = parser.finish(proc.returncode, elapsed())
+    summary.peak_rss_mb = sampler.stop()
+    summary.log_dir = str(log_dir)
+    (log_dir / "timings.json").write_text(json.dumps(summary.to_dict(), indent=2), encoding="utf-8")
+    if progress:
+        progress(f"[etl] exit {proc.returncode} after {summary.seconds:.1f}s — {log_dir / 'data-loader.log'}")
+    return StreamedProcess(args, proc.returncode, log_dir, summary)
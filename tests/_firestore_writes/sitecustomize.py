@@ -0,0 +1,122 @@
+"""
+Counts the Firestore writes a process issues. Loaded only into the ETL re-run of the
+rewrite audit and the sync benchmark, through PYTHONPATH (tests/_rewrites.py
+write_count_env).
+
+Every write of the google-cloud-firestore client — DocumentReference.set, WriteBatch,
+transactions, BulkWriter — goes out as a GAPIC Commit or BatchWrite call. Both are
+wrapped here and their writes counted per top-level collection, including writes of
+identical data: Firestore bills those although update_time does not move.
+
+Counts go to $FIRESTORE_WRITE_COUNTS/<pid>.json after every call, so worker
+processes that exit without running atexit handlers are counted too:
+  {collection: {"set": n, "delete": n}}
+
+For the collections in $FIRESTORE_WRITE_DOCUMENTS (comma-separated), every write is
+also appended to $FIRESTORE_WRITE_COUNTS/<pid>.documents as
+"<set|delete> <collection> <doc_id>",
+so the writes can be attributed to individual documents.
+
+Being first on PYTHONPATH, this module hides the interpreter's own sitecustomize
+(a venv's or the distro's). That one is found further down sys.path and run after
+the hook is installed, as if it had been imported directly.
+"""
+
+import functools
+import importlib.machinery
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import threading
+
+OUTPUT_DIR = os.environ.get("FIRESTORE_WRITE_COUNTS")
+DOCUMENTS  = set(filter(None, os.environ.get("FIRESTORE_WRITE_DOCUMENTS", "").split(",")))
+METHODS    = ("commit", "batch_write")
+
+_counts = {}
+_lock = threading.Lock()
+
+
+def _document(path: str) -> tuple:
+    """(top-level collection, document ID) of a document resource name."""
+    parts = path.partition("/documents/")[2].split("/")
+    return parts[0], parts[1] if len(parts) > 1 else ""
+
+
+def _dump() -> None:
+    path = os.path.join(OUTPUT_DIR, f"{os.getpid()}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as fh:
+        json.dump(_counts, fh)
+    os.replace(path + ".tmp", path)
+
+
+def _record(request, kwargs: dict) -> None:
+    writes = kwargs.get("writes")
+    if writes is None and request is not None:
+        writes = request.get("writes") if isinstance(request, dict) else getattr(request, "writes", None)
+    with _lock:
+        documents = []
+        for write in writes or ():
+            if write.delete:
+                kind, path = "delete", write.delete
+            else:
+                kind, path = "set", write.update.name or write.transform.document
+            collection, doc_id = _document(path)
+            counts = _counts.setdefault(collection, {"set": 0, "delete": 0})
+            counts[kind] += 1
+            if collection in DOCUMENTS:
+                documents.append(f"{kind} {collection} {doc_id}\n")
+        _dump()
+        if documents:
+            with open(os.path.join(OUTPUT_DIR, f"{os.getpid()}.documents"), "a", encoding="utf-8") as fh:
+                fh.writelines(documents)
+
+
+def _wrap(cls, name: str) -> None:
+    original = getattr(cls, name, None)
+    if original is None:
+        return
+    if inspect.iscoroutinefunction(original):
+        async def counted(self, request=None, *args, **kwargs):
+            _record(request, kwargs)
+            return await original(self, request, *args, **kwargs)
+    else:
+        def counted(self, request=None, *args, **kwargs):
+            _record(request, kwargs)
+            return original(self, request, *args, **kwargs)
+    setattr(cls, name, functools.wraps(original)(counted))
+
+
+def _install() -> None:
+    try:
+        from google.cloud.firestore_v1.services.firestore.async_client import FirestoreAsyncClient
+        from google.cloud.firestore_v1.services.firestore.client import FirestoreClient
+    except ImportError:
+        return    # not a Firestore process — no count file, the audit reports the counts as unknown
+    for cls in (FirestoreClient, FirestoreAsyncClient):
+        for name in METHODS:
+            _wrap(cls, name)
+    with _lock:
+        _dump()   # an empty file: the hook is active, no writes yet
+    if hasattr(os, "register_at_fork"):
+        # A forked worker starts from zero — its parent's writes are already in the parent's file
+        os.register_at_fork(after_in_child=_counts.clear)
+
+
+def _chain() -> None:
+    """Run the sitecustomize this module shadows, if there is one."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    path = [p for p in sys.path if os.path.abspath(p or os.curdir) != here]
+    spec = importlib.machinery.PathFinder.find_spec(__name__, path)
+    if spec is None:
+        return
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[__name__] = module
+    spec.loader.exec_module(module)
+
+
+if OUTPUT_DIR:
+    _install()
+_chain()
@@ -0,0 +1,256 @@
+"""
+Golden-output fingerprints of the whole ETL result, and a Merkle diff against them.
+
+Every document of the five output collections gets a canonical hash: sha256 of its
+encode_value() form, serialized as JSON with sorted keys, compact separators and
+ensure_ascii=False. Each top-level field is hashed the same way. Per collection, the
+documents go into 2^depth buckets by a hash of their ID, so an added or removed
+document only changes its own bucket and the tree never shifts. The buckets are the
+leaves of a binary Merkle tree:
+
+    level 0   bucket hashes — sha256 over the bucket's sorted "id\\0doc_hash" lines
+    level k   sha256(left child + right child)
+    top       one root per collection
+
+depth = ceil(log2(documents / LEAF_SIZE)), so a bucket holds ~LEAF_SIZE documents.
+
+The golden file (fixtures/golden/<batch>.json.gz) stores, per collection, the tree
+levels and every document's hash and field hashes. Field values of up to
+INLINE_VALUE bytes are stored as well, so deltas of scalar fields read old → new.
+A later run rebuilds its tree at the golden's depth and walks both trees from the
+root. Equal subtrees are skipped, so only the paths to changed buckets are compared:
+O(changed · depth) node comparisons instead of n document comparisons. Only the
+documents in those buckets are compared field by field:
+
+  [golden] golden/csv.json.gz  52,890 docs  1.4s  38 node comparisons — 1 changed, 0 added, 0 removed
+    PLProductContent  40806000_de_DE
+      ~ Finish  "Chrome" → "Chrom"
+      + Badge   "new"
+"""
+
+import gzip
+import hashlib
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from google.cloud import firestore
+
+from tests._id_index import scan_partitioned
+from tests._seeding import encode_value
+
+GOLDEN_DIR   = Path(__file__).parent.parent / "fixtures" / "golden"
+LEAF_SIZE    = 16     # documents per bucket the depth is sized for
+HASH_CHARS   = 16     # hex characters kept per document / node hash (64 bits)
+FIELD_CHARS  = 12     # … per field hash
+INLINE_VALUE = 80     # canonical JSON bytes up to which a field value is stored
+DELTA_DOCS   = 20     # changed documents printed per collection
+
+
+# ── Canonical hashing ─────────────────────────────────────────────────────────
+
+def canonical(value) -> str:
+    return json.dumps(encode_value(value), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _sha(text: str, chars: int = HASH_CHARS) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:chars]
+
+
+def fingerprint_document(data: dict) -> tuple:
+    """(document hash, {field: [field hash] + [value] if its JSON is at most INLINE_VALUE bytes})."""
+    fields = {}
+    for name, value in data.items():
+        text = canonical(value)
+        fields[name] = [_sha(text, FIELD_CHARS)] + ([json.loads(text)] if len(text) <= INLINE_VALUE else [])
+    return _sha(canonical(data)), fields
+
+
+def _bucket(doc_id: str, depth: int) -> int:
+    return int(hashlib.sha256(doc_id.encode("utf-8")).hexdigest()[:8], 16) >> (32 - depth) if depth else 0
+
+
+# ── Merkle tree ───────────────────────────────────────────────────────────────
+
+@dataclass
+class MerkleTree:
+    """Per-collection tree over the document hashes; levels[0] are the buckets."""
+
+    depth: int
+    documents: dict                                  # {doc_id: [doc_hash, fields]}
+    levels: list = field(default_factory=list)       # [[node hash, ...] per level], root last
+
+    @classmethod
+    def build(cls, documents: dict, depth: int = None) -> "MerkleTree":
+        if depth is None:
+            depth = max(0, math.ceil(math.log2(max(len(documents), 1) / LEAF_SIZE)))
+        buckets = [[] for _ in range(2 ** depth)]
+        for doc_id in documents:
+            buckets[_bucket(doc_id, depth)].append(doc_id)
+        level = [_sha("".join(f"{d}\0{documents[d][0]}\n" for d in sorted(ids))) for ids in buckets]
+        levels = [level]
+        while len(level) > 1:
+            level = [_sha(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+            levels.append(level)
+        return cls(depth, documents, levels)
+
+    @property
+    def root(self) -> str:
+        return self.levels[-1][0]
+
+    def bucket_ids(self, bucket: int) -> set:
+        if not hasattr(self, "_buckets"):
+            self._buckets = {}
+            for doc_id in self.documents:
+                self._buckets.setdefault(_bucket(doc_id, self.depth), set()).add(doc_id)
+        return self._buckets.get(bucket, set())
+
+    def changed_buckets(self, other: "MerkleTree") -> tuple:
+        """(buckets whose hashes differ, node comparisons) — walks both trees from the root."""
+        changed, comparisons = [], 0
+        stack = [(len(self.levels) - 1, 0)]
+        while stack:
+            level, i = stack.pop()
+            comparisons += 1
+            if self.levels[level][i] == other.levels[level][i]:
+                continue
+            if level == 0:
+                changed.append(i)
+            else:
+                stack.extend(((level - 1, 2 * i + 1), (level - 1, 2 * i)))
+        return changed, comparisons
+
+
+# ── Fingerprints ──────────────────────────────────────────────────────────────
+
+def _visit(collection, snapshots):
+    return [(snap.id, fingerprint_document(snap.to_dict())) for snap in snapshots]
+
+
+def fingerprint_collections(client: firestore.Client, index, collections, depths: dict = None,
+                            **scan_options) -> dict:
+    """{collection: MerkleTree} of the current Firestore state, at `depths` where given."""
+    documents = {name: {} for name in collections}
+    for collection, rows in scan_partitioned(client, index, list(collections), _visit, **scan_options):
+        documents[collection].update(rows)
+    depths = depths or {}
+    return {name: MerkleTree.build(docs, depths.get(name)) for name, docs in documents.items()}
+
+
+def save_golden(path: Path, trees: dict, batch: str) -> None:
+    golden = {
+        "time":        time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "batch":       batch,
+        "collections": {name: {"depth": t.depth, "root": t.root, "levels": t.levels, "documents": t.documents}
+                        for name, t in trees.items()},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        json.dump(golden, fh, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_golden(path: Path) -> tuple:
+    """({collection: MerkleTree}, batch fingerprint) of a golden file."""
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        golden = json.load(fh)
+    trees = {name: MerkleTree(c["depth"], c["documents"], c["levels"])
+             for name, c in golden["collections"].items()}
+    return trees, golden.get("batch")
+
+
+# ── Diff ──────────────────────────────────────────────────────────────────────
+
+def _show(entry) -> str:
+    """Stored value of a field, or its hash when the value was too large to inline."""
+    text = canonical(entry[1]) if len(entry) > 1 else f"<{entry[0]}>"
+    return text if len(text) <= INLINE_VALUE else text[:INLINE_VALUE - 1] + "…"
+
+
+def field_deltas(old: dict, new: dict) -> list:
+    """["~ field  old → new" | "+ field  new" | "- field  old"] between two field maps."""
+    deltas = []
+    for name in sorted(set(old) | set(new)):
+        if name not in new:
+            deltas.append(f"- {name}  {_show(old[name])}")
+        elif name not in old:
+            deltas.append(f"+ {name}  {_show(new[name])}")
+        elif old[name][0] != new[name][0]:
+            deltas.append(f"~ {name}  {_show(old[name])} → {_show(new[name])}")
+    return deltas
+
+
+@dataclass
+class GoldenDiff:
+    """Documents that differ from the golden file, per collection."""
+
+    golden: str
+    documents: int = 0
+    comparisons: int = 0
+    seconds: float = 0.0
+    added: dict = field(default_factory=dict)      # {collection: [doc_id]}
+    removed: dict = field(default_factory=dict)    # {collection: [doc_id]}
+    changed: dict = field(default_factory=dict)    # {collection: {doc_id: [delta]}}
+
+    def count(self, collection: str = None) -> int:
+        names = [collection] if collection else set(self.added) | set(self.removed) | set(self.changed)
+        return sum(len(self.added.get(n, [])) + len(self.removed.get(n, [])) + len(self.changed.get(n, {}))
+                   for n in names)
+
+    def summary(self, collection: str = None) -> str:
+        lines = []
+        for name in sorted(set(self.added) | set(self.removed) | set(self.changed)):
+            if collection and name != collection:
+                continue
+            for sign, ids in (("+", self.added.get(name, [])), ("-", self.removed.get(name, []))):
+                if ids:
+                    more = f" … +{len(ids) - DELTA_DOCS}" if len(ids) > DELTA_DOCS else ""
+                    lines.append(f"  {name}  {sign} {', '.join(sorted(ids)[:DELTA_DOCS])}{more}")
+            changed = self.changed.get(name, {})
+            for doc_id in sorted(changed)[:DELTA_DOCS]:
+                lines.append(f"  {name}  {doc_id}")
+                lines.extend(f"    {delta}" for delta in changed[doc_id])
+            if len(changed) > DELTA_DOCS:
+                lines.append(f"  {name}  … {len(changed) - DELTA_DOCS} more changed documents")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        total = lambda per: sum(len(v) for v in per.values())
+        head = (f"[golden] {self.golden}  {self.documents:,} docs  {self.seconds:.1f}s  "
+                f"{self.comparisons} node comparisons — {total(self.changed)} changed, "
+                f"{total(self.added)} added, {total(self.removed)} removed")
+        body = self.summary()
+        return f"{head}\n{body}" if body else head
+
+
+def diff_trees(golden: dict, current: dict, label: str = "") -> GoldenDiff:
+    """Compare {collection: MerkleTree} maps; `current` must be built at the golden's depths."""
+    result = GoldenDiff(label)
+    for name in sorted(set(golden) | set(current)):
+        old = golden.get(name) or MerkleTree.build({}, current[name].depth)
+        new = current.get(name) or MerkleTree.build({}, old.depth)
+        result.documents += len(new.documents)
+        buckets, comparisons = old.changed_buckets(new)
+        result.comparisons += comparisons
+        for bucket in buckets:
+            old_ids, new_ids = old.bucket_ids(bucket), new.bucket_ids(bucket)
+            for doc_id in new_ids - old_ids:
+                result.added.setdefault(name, []).append(doc_id)
+            for doc_id in old_ids - new_ids:
+                result.removed.setdefault(name, []).append(doc_id)
+            for doc_id in old_ids & new_ids:
+                if old.documents[doc_id][0] != new.documents[doc_id][0]:
+                    result.changed.setdefault(name, {})[doc_id] = field_deltas(
+                        old.documents[doc_id][1], new.documents[doc_id][1])
+    return result
+
+
+def diff_golden(client: firestore.Client, index, golden: dict, label: str = "", **scan_options) -> GoldenDiff:
+    """Fingerprint the current state at the depths of `golden` ({collection: MerkleTree}) and diff it."""
+    start = time.perf_counter()
+    current = fingerprint_collections(client, index, golden, {n: t.depth for n, t in golden.items()},
+                                      **scan_options)
+    result = diff_trees(golden, current, label)
+    result.seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,41 @@
+"""
+Run histories under reports/: one JSON array per report, one record appended per run.
+
+pytest-xdist workers append to the same files, so the read-modify-write holds an
+exclusive lock on a `<history>.lock` file next to the history (fcntl, so POSIX only;
+on Windows appends stay unlocked).
+"""
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+
+
+@contextmanager
+def _locked(history: Path):
+    if fcntl is None:
+        yield
+        return
+    with open(history.with_name(history.name + ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def append_history(history: Path, record: dict) -> None:
+    """Append `record` to the JSON array in `history`; a missing or unreadable file starts a new one."""
+    history.parent.mkdir(parents=True, exist_ok=True)
+    with _locked(history):
+        try:
+            runs = json.loads(history.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            runs = []
+        runs.append(record)
+        history.write_text(json.dumps(runs, indent=2), encoding="utf-8")
@@ -0,0 +1,126 @@
+"""
+Keys-only, in-memory index of document IDs per collection.
+
+Pipeline assertions only need document IDs, yet streaming a 17k-document
+collection pulls every document body over the wire. CollectionIdIndex lists each
+collection once via list_documents() — a ListDocuments call with an empty field
+mask, so only document names are returned — and answers every later lookup from
+memory. Collections are listed concurrently on first use of prefetch().
+
+The same ID sets drive scan_partitioned(): sorted IDs are cut into cursor ranges
+that full-collection scans (tests/_validation.py, tests/_docsize.py) read
+concurrently instead of streaming each collection front to back.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+
+SCAN_WORKERS          = 16
+PARTITIONS_PER_WORKER = 4
+
+
+class CollectionIdIndex:
+    """Session-wide cache of {collection: frozenset(doc_ids)}."""
+
+    def __init__(self, client: firestore.Client):
+        self._client = client
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def _list(self, collection: str) -> frozenset:
+        return frozenset(ref.id for ref in self._client.collection(collection).list_documents())
+
+    def ids(self, collection: str) -> frozenset:
+        """All document IDs in `collection`, listed on first access."""
+        with self._lock:
+            cached = self._ids.get(collection)
+        if cached is None:
+            cached = self._list(collection)
+            with self._lock:
+                self._ids.setdefault(collection, cached)
+        return cached
+
+    def prefetch(self, collections) -> None:
+        """List several collections concurrently."""
+        missing = [c for c in collections if c not in self._ids]
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                list(pool.map(self.ids, missing))
+
+    def contains(self, collection: str, doc_id: str) -> bool:
+        return doc_id in self.ids(collection)
+
+    def sample(self, collection: str, n: int = 10) -> list:
+        """First `n` IDs in sorted order — stable material for assertion messages."""
+        return sorted(self.ids(collection))[:n]
+
+    def invalidate(self, collection: str = None) -> None:
+        with self._lock:
+            if collection is None:
+                self._ids.clear()
+            else:
+                self._ids.pop(collection, None)
+
+
+# ── Partitioned scans ─────────────────────────────────────────────────────────
+
+def partition_ids(ids, partitions: int) -> list:
+    """Cut sorted IDs into ≤ `partitions` [start, end) cursor ranges (end=None → open)."""
+    ordered = sorted(ids)
+    if not ordered:
+        return []
+    partitions = max(1, min(partitions, len(ordered)))
+    step = -(-len(ordered) // partitions)
+    starts = ordered[::step]
+    return list(zip(starts, [*starts[1:], None]))
+
+
+def _stream_range(client: firestore.Client, collection: str, start: str, end: str, fields=None):
+    query = client.collection(collection)
+    if fields is not None:
+        # An empty projection means "all fields" to Firestore — project onto the name instead
+        query = query.select(list(fields) or [FieldPath.document_id()])
+    query = (query
+             .order_by(FieldPath.document_id())
+             .start_at({FieldPath.document_id(): start}))
+    if end is not None:
+        query = query.end_before({FieldPath.document_id(): end})
+    return query.stream()
+
+
+def scan_partitioned(
+    client: firestore.Client,
+    index,
+    collections,
+    visit,
+    *,
+    workers: int = SCAN_WORKERS,
+    partitions_per_worker: int = PARTITIONS_PER_WORKER,
+    fields=None,
+) -> list:
+    """
+    Stream every document of `collections` over cursor ranges, all ranges concurrently.
+
+    `index` is a CollectionIdIndex — its keys-only ID sets provide the range boundaries.
+    `visit(collection, snapshots)` runs once per range on a pool thread; returns
+    [(collection, visit_result), ...] in range order. `fields` projects the streamed
+    documents onto those fields — [] streams names and create / update times only.
+    """
+    index.prefetch(collections)
+    jobs = [
+        (name, lo, hi)
+        for name in collections
+        for lo, hi in partition_ids(index.ids(name), workers * partitions_per_worker)
+    ]
+    if not jobs:
+        return []
+
+    def run(job):
+        name, lo, hi = job
+        return name, visit(name, _stream_range(client, name, lo, hi, fields))
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(run, jobs))
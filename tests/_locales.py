@@ -0,0 +1,160 @@
+"""
+Locales of a CSV batch and of the Firestore documents loaded from it.
+
+NEO spells one locale three ways:
+
+  de_DE   CSV `language` + `market` columns, document ID suffix (40806000_de_DE)
+  de_de   culture — configuration keys (database_de_de), products-index-updates.culture
+  de-DE   request locale of the .NET services
+
+A batch's locales come from locales.json, which scripts/derive_locales.py writes
+next to a derived batch. Without that file they are read from every file that has
+both a language and a market column. fixtures/csv/ itself is de_DE only.
+
+LocaleReport is the per-locale Layer 1 view of one ETL run. It has document counts
+per locale and collection next to the run's throughput, and it is appended to
+reports/pipeline/locales.json. Locales share one run, so there is no per-locale rate;
+runs with 1, 2, 4, … markets show how the runtime grows with the number of locales:
+  [locales] 3 locales  ETL 412.3s (load 301.0s)  52,890 docs  128.3 docs/s
+    locale   PLProductContent  PLCategory  PLVariant  ProductIndexData  CategoryRouting    docs
+    de_DE               17638         213       9288              9288              213   36640
+    ...
+"""
+
+import json
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from tests._csv_schema import csv_files, iter_rows, read_header
+from tests._history import append_history
+
+DEFAULT_LOCALE   = "de_DE"
+DEFAULT_DATABASE = "(default)"
+MANIFEST         = "locales.json"
+LANGUAGE_COLUMNS = ("language", "Language")
+MARKET_COLUMNS   = ("market", "Market")
+
+_LOCALE     = re.compile(r"^([a-z]{2})[_-]([a-z]{2})$", re.I)
+_DOC_LOCALE = re.compile(r"_([a-z]{2}_[A-Z]{2})$")
+
+REPORTS_DIR = Path(__file__).parent.parent / "reports" / "pipeline"
+
+
+# ── Spellings ─────────────────────────────────────────────────────────────────
+
+def parse_locale(text: str) -> tuple:
+    """("en", "GB") from en_GB, en-GB or en_gb."""
+    m = _LOCALE.match(text.strip())
+    if not m:
+        raise ValueError(f"Not a locale: {text!r} (expected e.g. en_GB)")
+    return m.group(1).lower(), m.group(2).upper()
+
+
+def normalize(text: str) -> str:
+    return "_".join(parse_locale(text))
+
+
+def culture(locale: str) -> str:
+    return normalize(locale).lower()
+
+
+def config_key(locale: str) -> str:
+    """Key of the configuration/config field that maps `locale` to a Firestore database."""
+    return f"database_{culture(locale)}"
+
+
+def configuration_entries(locales, database: str = DEFAULT_DATABASE) -> dict:
+    return {config_key(locale): database for locale in locales}
+
+
+def doc_locale(doc_id: str) -> str:
+    m = _DOC_LOCALE.search(doc_id)
+    return m.group(1) if m else None
+
+
+# ── Batches ───────────────────────────────────────────────────────────────────
+
+def locale_columns(header) -> tuple:
+    """(language column, market column), or None if the file is not per locale."""
+    language = next((c for c in LANGUAGE_COLUMNS if c in header), None)
+    market = next((c for c in MARKET_COLUMNS if c in header), None)
+    return (language, market) if language and market else None
+
+
+def batch_locales(directory: Path) -> list:
+    """Locales present in a CSV batch, DEFAULT_LOCALE first when present."""
+    directory = Path(directory)
+    try:
+        return json.loads((directory / MANIFEST).read_text(encoding="utf-8"))["locales"]
+    except (OSError, ValueError, KeyError):
+        pass
+    found = set()
+    for path in csv_files(directory).values():
+        columns = locale_columns(read_header(path))
+        if columns:
+            found.update(f"{row[columns[0]]}_{row[columns[1]]}" for row in iter_rows(path)
+                         if row[columns[0]] and row[columns[1]])
+    return sorted(found, key=lambda locale: (locale != DEFAULT_LOCALE, locale))
+
+
+# ── Layer 1 report ────────────────────────────────────────────────────────────
+
+@dataclass
+class LocaleReport:
+    """Per-locale document counts and the throughput of one ETL run."""
+
+    locales: list
+    seconds: float = None                           # whole data-loader run
+    load_seconds: float = None                      # sum of load:* stages
+    counts: dict = field(default_factory=dict)      # {locale: {collection: docs}}
+    unlocalized: dict = field(default_factory=dict)  # {collection: docs without a locale suffix}
+
+    @classmethod
+    def build(cls, locales, summary, index, collections) -> "LocaleReport":
+        report = cls(list(locales), summary.seconds, summary.stage_seconds("load:"))
+        for collection in collections:
+            per_locale = Counter(doc_locale(doc_id) for doc_id in index.ids(collection))
+            report.unlocalized[collection] = per_locale.pop(None, 0)
+            for locale, n in per_locale.items():
+                report.counts.setdefault(locale, {})[collection] = n
+        return report
+
+    def count(self, locale: str, collection: str) -> int:
+        return self.counts.get(locale, {}).get(collection, 0)
+
+    def documents(self, locale: str = None) -> int:
+        if locale is None:
+            return sum(map(self.documents, self.counts))
+        return sum(self.counts.get(locale, {}).values())
+
+    def throughput(self) -> float:
+        """Documents per second of the whole ETL run."""
+        return round(self.documents() / self.seconds, 1) if self.seconds else None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "documents": self.documents(), "throughput": self.throughput()}
+
+    def write(self, history: Path = REPORTS_DIR / "locales.json") -> None:
+        """Append this run to the per-run history."""
+        append_history(history, self.to_dict())
+
+    def __str__(self) -> str:
+        collections = list(dict.fromkeys(c for per in self.counts.values() for c in per))
+        seconds = f"{self.seconds:.1f}s" if self.seconds is not None else "?"
+        load = f" (load {self.load_seconds:.1f}s)" if self.load_seconds is not None else ""
+        rate = self.throughput()
+        lines = [
+            f"[locales] {len(self.locales)} locales  ETL {seconds}{load}  {self.documents():,} docs"
+            + (f"  {rate} docs/s" if rate is not None else ""),
+            "  " + "  ".join([f"{'locale':<8}", *collections, f"{'docs':>6}"]),
+        ]
+        for locale in sorted(set(self.locales) | set(self.counts)):
+            cells = [f"{self.count(locale, c):>{len(c)}}" for c in collections]
+            lines.append("  " + "  ".join([f"{locale:<8}", *cells, f"{self.documents(locale):>6}"]))
+        if any(self.unlocalized.values()):
+            lines.append(f"  without locale suffix: {self.unlocalized}")
+        return "\n".join(lines)
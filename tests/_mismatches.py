@@ -0,0 +1,39 @@
+"""
+Mismatch reports: (identifier, detail) pairs grouped by the rule they broke.
+
+OracleReport, ReconciliationReport and FaultReport subclass MismatchReport and add
+their own counters and header line. summary() lists the rules with the most
+mismatches first, with a few sample identifiers each:
+
+    missing:PLProductContent            2   (1080679990_de_DE, 39913001_de_DE)
+"""
+
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+SAMPLE_IDS = 5
+
+
+@dataclass
+class MismatchReport:
+    """Mismatching identifiers per rule; subclasses add what was compared."""
+
+    RULE_WIDTH: ClassVar[int] = 20
+
+    mismatches: dict = field(default_factory=dict, kw_only=True)    # {rule: [(identifier, detail)]}
+
+    def add(self, rule: str, identifier: str, detail: str = "") -> None:
+        self.mismatches.setdefault(rule, []).append((identifier, detail))
+
+    def count(self, rule: str = None) -> int:
+        groups = [self.mismatches.get(rule, [])] if rule else self.mismatches.values()
+        return sum(len(ids) for ids in groups)
+
+    def summary(self, rule: str = None) -> str:
+        lines = []
+        for name, ids in sorted(self.mismatches.items(), key=lambda kv: -len(kv[1])):
+            if not ids or (rule and name != rule):
+                continue
+            sample = ", ".join(f"{i} ({detail})" if detail else i for i, detail in ids[:SAMPLE_IDS])
+            lines.append(f"  {name:<{self.RULE_WIDTH}} {len(ids):>7}   ({sample})")
+        return "\n".join(lines)
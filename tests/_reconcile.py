@@ -0,0 +1,285 @@
+"""
+CSV → Firestore reconciliation: every input product of the batch is checked against
+the ETL output, not only the two known SKUs.
+
+Both sides go into one in-memory SQLite database with indexes on SKU, base SKU and
+locale. The CSV side is the FixtureStore, loaded once per session from the product
+files. The ETL side holds the fields of PLProductContent and ProductIndexData that
+the rules need, streamed through scan_partitioned(). Each rule is a single indexed
+SQL join that returns the mismatching keys:
+
+  missing:PLProductContent          input SKU without a `{sku}_{locale}` document
+  unexpected:PLProductContent       document whose SKU is not in the input
+  BaseSKU!=input                    PLProductContent.BaseSKU ≠ 1_product_data base_sku   ¹
+  missing:ProductIndexData          input SKU in no finish_definitions of its locale
+  index-id!=BaseSKU/Sequence        SKU listed under a ProductIndexData document whose
+                                    base_sku / sequence differ from the input's (or from
+                                    its PLProductContent.BaseSKU)
+  unexpected:finish_definitions     finish_definitions SKU that is not in the input
+  finishes!=input                   finish_definitions per base SKU ≠ input SKUs of it
+  tags!=input                       len(tag_definitions) ≠ distinct tags (5_tag.csv) of
+                                    the document's finishes
+  categories-missing                input category (hinted join to A_) not in
+                                    all_category_ids                                     ²
+
+  ¹ only with a base_sku column in MASTER_FILE; otherwise BaseSKU is taken from
+    PLProductContent and the base-SKU rules check the output for self-consistency
+  ² only when some product file has a category column
+
+Input SKUs are MASTER_FILE's (1_product_data.csv) or, without it, those of every
+product file keyed by SKU alone (4_, 5_, 6_, 8_, 10_). A locale comes from the row's
+language / market, or applies to all of the batch's locales for market-neutral files.
+
+`str(report)` groups mismatches by rule, like ValidationReport:
+  [reconcile] 17638 input SKUs, 9293 base SKUs, 17638 + 9288 docs, 2.4s — 3 mismatches
+    missing:PLProductContent      2   (1080679990_de_DE, 39913001_de_DE)
+"""
+
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from google.cloud import firestore
+
+from tests._csv_schema import (
+    BASE_SKU_COLUMNS, MASTER_FILE, UNIQUE_KEYS,
+    csv_files, discover_joins, is_product_file, iter_rows, read_header, sku_column, split_values,
+)
+from tests._id_index import scan_partitioned
+from tests._locales import batch_locales, locale_columns
+from tests._mismatches import MismatchReport
+
+SEQUENCE_COLUMNS = ("sequence", "Sequence")
+
+_INDEX_ID = re.compile(r"^(?P<base>.+)_(?P<sequence>\d+)_(?P<locale>[a-z]{2}_[A-Z]{2})$")
+_DOC_ID   = re.compile(r"^(?P<sku>.+)_(?P<locale>[a-z]{2}_[A-Z]{2})$")
+
+SCHEMA = """
+CREATE TABLE product (sku TEXT, locale TEXT, base_sku TEXT, sequence INTEGER, PRIMARY KEY (sku, locale));
+CREATE INDEX product_base ON product (base_sku, locale);
+CREATE TABLE product_tag (sku TEXT, locale TEXT, tag TEXT, PRIMARY KEY (sku, locale, tag));
+CREATE TABLE product_category (sku TEXT, locale TEXT, category TEXT, PRIMARY KEY (sku, locale, category));
+
+CREATE TABLE content (doc_id TEXT PRIMARY KEY, sku TEXT, locale TEXT, base_sku TEXT);
+CREATE INDEX content_sku ON content (sku, locale);
+CREATE TABLE pid (doc_id TEXT PRIMARY KEY, base_sku TEXT, sequence INTEGER, locale TEXT, tags INTEGER);
+CREATE INDEX pid_base ON pid (base_sku, locale);
+CREATE TABLE pid_finish (doc_id TEXT, sku TEXT, locale TEXT, PRIMARY KEY (doc_id, sku));
+CREATE INDEX pid_finish_sku ON pid_finish (sku, locale);
+CREATE TABLE pid_category (doc_id TEXT, category TEXT, PRIMARY KEY (doc_id, category));
+"""
+
+
+# ── Fixture store ─────────────────────────────────────────────────────────────
+
+class FixtureStore:
+    """The batch's products, tags and categories in indexed SQLite tables."""
+
+    def __init__(self, directory: Path):
+        start = time.perf_counter()
+        self.directory = Path(directory)
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.locales = batch_locales(self.directory) or [None]
+        files = csv_files(self.directory)
+        headers = {name: read_header(path) for name, path in files.items()}
+        master = headers.get(MASTER_FILE)
+        self.has_base_sku = bool(master and any(c in master for c in BASE_SKU_COLUMNS))
+        self.has_sequence = bool(master and any(c in master for c in SEQUENCE_COLUMNS))
+
+        sources = [MASTER_FILE] if master else [
+            n for n in files if is_product_file(n) and UNIQUE_KEYS.get(n) == ("sku",) and sku_column(headers[n])
+        ]
+        for name in sources:
+            self._load_products(files[name], headers[name])
+
+        joins = discover_joins(self.directory)
+        self.tag_joins = [j for j in joins if is_product_file(j.source) and j.target.startswith("C_")]
+        self.category_joins = [j for j in joins if is_product_file(j.source) and j.target.startswith("A_")]
+        for table, group in (("product_tag", self.tag_joins), ("product_category", self.category_joins)):
+            for join in group:
+                self._load_refs(table, files[join.source], headers[join.source], join)
+        self.db.commit()
+        self.seconds = time.perf_counter() - start
+
+    def _rows_with_locale(self, path: Path, header):
+        columns = locale_columns(header)
+        for row in iter_rows(path):
+            if columns:
+                yield row, [f"{row[columns[0]]}_{row[columns[1]]}"]
+            else:
+                yield row, self.locales
+
+    def _load_products(self, path: Path, header) -> None:
+        sku_col = sku_column(header)
+        base_col = next((c for c in BASE_SKU_COLUMNS if c in header), None)
+        seq_col = next((c for c in SEQUENCE_COLUMNS if c in header), None)
+        self.db.executemany(
+            "INSERT OR IGNORE INTO product VALUES (?, ?, ?, ?)",
+            ((row[sku_col], locale, row[base_col] if base_col else None,
+              int(row[seq_col]) if seq_col and row[seq_col].isdigit() else None)
+             for row, locales in self._rows_with_locale(path, header) if row[sku_col]
+             for locale in locales),
+        )
+
+    def _load_refs(self, table: str, path: Path, header, join) -> None:
+        sku_col = sku_column(header)
+        self.db.executemany(
+            f"INSERT OR IGNORE INTO {table} VALUES (?, ?, ?)",
+            ((row[sku_col], locale, value)
+             for row, locales in self._rows_with_locale(path, header)
+             for value in split_values(row[join.column], join.separator)
+             for locale in locales),
+        )
+
+    def scalar(self, sql: str, *args):
+        return self.db.execute(sql, args).fetchone()[0]
+
+
+# ── ETL output ────────────────────────────────────────────────────────────────
+
+def _content_rows(snapshots):
+    rows = []
+    for snap in snapshots:
+        data = snap.to_dict()
+        m = _DOC_ID.match(snap.id)
+        rows.append((snap.id, data.get("SKU") or (m and m["sku"]), m and m["locale"], data.get("BaseSKU")))
+    return rows
+
+
+def _index_rows(snapshots):
+    rows = []
+    for snap in snapshots:
+        data = snap.to_dict()
+        m = _INDEX_ID.match(snap.id)
+        locale = m and m["locale"]
+        finishes = [(snap.id, d.get("sku"), locale) for d in data.get("finish_definitions") or [] if d.get("sku")]
+        categories = {(snap.id, str(c)) for c in data.get("all_category_ids") or []}
+        rows.append(((snap.id, data.get("base_sku"), m and int(m["sequence"]), locale,
+                      len(data.get("tag_definitions") or [])), finishes, categories))
+    return rows
+
+
+def load_output(store: FixtureStore, client: firestore.Client, index, **scan_options) -> None:
+    """Stream PLProductContent / ProductIndexData into the store's output tables."""
+    visits = {"PLProductContent": _content_rows, "ProductIndexData": _index_rows}
+    results = scan_partitioned(client, index, list(visits),
+                               lambda collection, snapshots: visits[collection](snapshots), **scan_options)
+    db = store.db
+    for collection, rows in results:
+        if collection == "PLProductContent":
+            db.executemany("INSERT OR REPLACE INTO content VALUES (?, ?, ?, ?)", rows)
+            continue
+        for doc, finishes, categories in rows:
+            db.execute("INSERT OR REPLACE INTO pid VALUES (?, ?, ?, ?, ?)", doc)
+            db.executemany("INSERT OR IGNORE INTO pid_finish VALUES (?, ?, ?)", finishes)
+            db.executemany("INSERT OR IGNORE INTO pid_category VALUES (?, ?)", categories)
+    if not store.has_base_sku:
+        # No base_sku in the input — take the ETL's own BaseSKU so the base-SKU rules still apply
+        db.execute("""UPDATE product SET base_sku = (SELECT c.base_sku FROM content c
+                      WHERE c.doc_id = product.sku || '_' || product.locale)""")
+    db.commit()
+
+
+# ── Rules ─────────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    sql: str                 # SELECT key, detail … — one row per mismatch
+    requires: str = None     # FixtureStore flag / join list the rule needs
+
+
+RULES = (
+    Rule("missing:PLProductContent", """
+        SELECT p.sku || '_' || p.locale, '' FROM product p
+        LEFT JOIN content c ON c.doc_id = p.sku || '_' || p.locale
+        WHERE c.doc_id IS NULL"""),
+    Rule("unexpected:PLProductContent", """
+        SELECT c.doc_id, '' FROM content c
+        LEFT JOIN product p ON p.sku = c.sku AND p.locale = c.locale
+        WHERE p.sku IS NULL"""),
+    Rule("BaseSKU!=input", """
+        SELECT c.doc_id, c.base_sku || ' != ' || p.base_sku FROM content c
+        JOIN product p ON p.sku = c.sku AND p.locale = c.locale
+        WHERE c.base_sku IS NOT p.base_sku""", requires="has_base_sku"),
+    Rule("missing:ProductIndexData", """
+        SELECT p.sku || '_' || p.locale, '' FROM product p
+        WHERE NOT EXISTS (SELECT 1 FROM pid_finish f WHERE f.sku = p.sku AND f.locale = p.locale)"""),
+    Rule("index-id!=BaseSKU/Sequence", """
+        SELECT f.sku || '_' || f.locale, f.doc_id || ' != ' || p.base_sku || '_' || IFNULL(p.sequence, '*')
+        FROM pid_finish f
+        JOIN pid d ON d.doc_id = f.doc_id
+        JOIN product p ON p.sku = f.sku AND p.locale = f.locale
+        WHERE d.base_sku IS NOT p.base_sku OR (p.sequence IS NOT NULL AND d.sequence IS NOT p.sequence)"""),
+    Rule("unexpected:finish_definitions", """
+        SELECT f.doc_id, f.sku FROM pid_finish f
+        LEFT JOIN product p ON p.sku = f.sku AND p.locale = f.locale
+        WHERE p.sku IS NULL"""),
+    Rule("finishes!=input", """
+        SELECT e.base_sku || ' ' || e.locale, IFNULL(o.n, 0) || ' != ' || e.n
+        FROM (SELECT base_sku, locale, COUNT(*) AS n FROM product
+              WHERE base_sku IS NOT NULL GROUP BY base_sku, locale) e
+        LEFT JOIN (SELECT d.base_sku, d.locale, COUNT(DISTINCT f.sku) AS n FROM pid d
+                   JOIN pid_finish f ON f.doc_id = d.doc_id GROUP BY d.base_sku, d.locale) o
+          ON o.base_sku = e.base_sku AND o.locale = e.locale
+        WHERE IFNULL(o.n, 0) != e.n"""),
+    Rule("tags!=input", """
+        SELECT d.doc_id, d.tags || ' != ' || COUNT(DISTINCT t.tag) FROM pid d
+        JOIN pid_finish f ON f.doc_id = d.doc_id
+        LEFT JOIN product_tag t ON t.sku = f.sku AND t.locale = f.locale
+        GROUP BY d.doc_id HAVING d.tags != COUNT(DISTINCT t.tag)""", requires="tag_joins"),
+    Rule("categories-missing", """
+        SELECT DISTINCT d.doc_id, c.category FROM pid d
+        JOIN pid_finish f ON f.doc_id = d.doc_id
+        JOIN product_category c ON c.sku = f.sku AND c.locale = f.locale
+        LEFT JOIN pid_category o ON o.doc_id = d.doc_id AND o.category = c.category
+        WHERE o.doc_id IS NULL""", requires="category_joins"),
+)
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class ReconciliationReport(MismatchReport):
+    """Mismatching keys per rule, plus what was compared."""
+
+    RULE_WIDTH = 30
+
+    products: int = 0
+    base_skus: int = 0
+    documents: dict = field(default_factory=dict)     # collection → docs loaded
+    seconds: float = 0.0
+    skipped: list = field(default_factory=list)       # rules the batch has no data for
+
+    def __str__(self) -> str:
+        docs = " + ".join(str(n) for n in self.documents.values())
+        head = (f"[reconcile] {self.products} input SKUs, {self.base_skus} base SKUs, {docs} docs, "
+                f"{self.seconds:.1f}s — {self.count()} mismatches")
+        if self.skipped:
+            head += f" (skipped: {', '.join(self.skipped)})"
+        body = self.summary()
+        return f"{head}\n{body}" if body else head
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def reconcile(store: FixtureStore, client: firestore.Client, index, **scan_options) -> ReconciliationReport:
+    """Load the ETL output next to `store` and run every rule of RULES."""
+    start = time.perf_counter()
+    load_output(store, client, index, **scan_options)
+    report = ReconciliationReport(
+        products=store.scalar("SELECT COUNT(*) FROM product"),
+        base_skus=store.scalar("SELECT COUNT(DISTINCT base_sku || locale) FROM product"),
+        documents={"PLProductContent": store.scalar("SELECT COUNT(*) FROM content"),
+                   "ProductIndexData": store.scalar("SELECT COUNT(*) FROM pid")},
+    )
+    for rule in RULES:
+        if rule.requires and not getattr(store, rule.requires):
+            report.skipped.append(rule.name)
+            continue
+        report.mismatches[rule.name] = sorted((key, detail or "") for key, detail in store.db.execute(rule.sql))
+    report.seconds = time.perf_counter() - start + store.seconds
+    return report
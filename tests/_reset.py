@@ -0,0 +1,166 @@
+"""
+Shared Firestore reset subsystem for every test layer.
+
+Two strategies, fastest first:
+
+  1. Emulator endpoint — DELETE /emulator/v1/projects/{project}/databases/(default)/documents
+     wipes the whole database in a single request. Only used for full resets
+     (`collections=None`), because it cannot be scoped to individual collections.
+  2. BulkWriter sweep — lists document references keys-only and deletes them
+     through one parallel BulkWriter per collection, all collections concurrently.
+
+Collections in `preserve` (by default `configuration`, which NavigationApi and
+ProductsApi read at startup) survive a full reset: they are read before the wipe
+and written back afterwards.
+
+Every reset returns a ResetReport and prints its timing, e.g.
+  [reset] endpoint  full database         0.08s
+  [reset] sweep     PLCategory=212        0.41s
+"""
+
+import os
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions, SendMode
+
+from tests._etl_log import PIPELINE_COLLECTIONS
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+# Every collection any layer writes to — swept when the emulator endpoint is unavailable.
+KNOWN_COLLECTIONS = (
+    *PIPELINE_COLLECTIONS,
+    "cacheEntries", "cacheRegions",
+    "products-index-updates",
+)
+
+DEFAULT_PRESERVE = ("configuration",)
+
+SWEEP_WORKERS = 8
+
+
+@dataclass
+class ResetReport:
+    """Outcome of a single reset: strategy used, docs deleted per collection, wall time."""
+
+    strategy: str                                   # "endpoint" | "sweep"
+    seconds: float
+    deleted: dict = field(default_factory=dict)     # collection → docs deleted (sweep only)
+    preserved: dict = field(default_factory=dict)   # collection → docs restored
+
+    def __str__(self) -> str:
+        if self.strategy == "endpoint":
+            scope = "full database"
+        else:
+            scope = " ".join(f"{name}={count}" for name, count in self.deleted.items()) or "(empty)"
+        return f"[reset] {self.strategy:<9} {scope:<24} {self.seconds:.2f}s"
+
+
+# ── Strategy 1: emulator endpoint ─────────────────────────────────────────────
+
+def _emulator_host() -> str:
+    return os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
+
+
+def _wipe_via_endpoint(project: str, host: str, timeout: float = 30.0) -> bool:
+    """Call the emulator's bulk delete endpoint. Returns False if it is unavailable."""
+    url = f"http://{host}/emulator/v1/projects/{project}/databases/(default)/documents"
+    req = urllib.request.Request(url, method="DELETE")
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return 200 <= resp.status < 300
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+# ── Strategy 2: concurrent BulkWriter sweep ───────────────────────────────────
+
+def _sweep_collection(client: firestore.Client, name: str) -> int:
+    """Delete every document in one collection via a parallel BulkWriter."""
+    writer = client.bulk_writer(options=BulkWriterOptions(mode=SendMode.parallel))
+    count = 0
+    # list_documents() is keys-only — no field data crosses the wire
+    for ref in client.collection(name).list_documents():
+        writer.delete(ref)
+        count += 1
+    writer.close()
+    return count
+
+
+def _sweep(client: firestore.Client, names) -> dict:
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(SWEEP_WORKERS, len(names))) as pool:
+        counts = pool.map(lambda n: _sweep_collection(client, n), names)
+        return dict(zip(names, counts))
+
+
+# ── Preserve / restore ────────────────────────────────────────────────────────
+
+def _snapshot(client: firestore.Client, names) -> dict:
+    return {
+        name: {snap.id: snap.to_dict() for snap in client.collection(name).stream()}
+        for name in names
+    }
+
+
+def _restore(client: firestore.Client, saved: dict) -> dict:
+    batch = client.batch()
+    pending = 0
+    for name, docs in saved.items():
+        for doc_id, data in docs.items():
+            batch.set(client.collection(name).document(doc_id), data)
+            pending += 1
+            if pending >= 500:
+                batch.commit()
+                batch = client.batch()
+                pending = 0
+    if pending:
+        batch.commit()
+    return {name: len(docs) for name, docs in saved.items()}
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def reset_firestore(
+    client: firestore.Client,
+    collections=None,
+    *,
+    preserve=DEFAULT_PRESERVE,
+    host: str = None,
+) -> ResetReport:
+    """
+    Clear emulator state for test isolation.
+
+    Args:
+        client:      Firestore client connected to the emulator.
+        collections: None for a full reset (endpoint, falling back to sweeping
+                     every collection), or an iterable of names to sweep only those.
+        preserve:    Collections kept intact across a full reset.
+        host:        Emulator host:port; defaults to $FIRESTORE_EMULATOR_HOST.
+    """
+    host = host or _emulator_host()
+    start = time.perf_counter()
+
+    if collections is not None:
+        report = ResetReport("sweep", 0.0, deleted=_sweep(client, collections))
+    else:
+        saved = _snapshot(client, preserve)
+        if _wipe_via_endpoint(client.project, host):
+            report = ResetReport("endpoint", 0.0)
+            report.preserved = _restore(client, saved)
+        else:
+            # Sweep skips preserved collections, so nothing needs restoring
+            present = {c.id for c in client.collections()}
+            names = [n for n in (*KNOWN_COLLECTIONS, *sorted(present)) if n not in preserve]
+            report = ResetReport("sweep", 0.0, deleted=_sweep(client, names))
+
+    report.seconds = time.perf_counter() - start
+    print(report, flush=True)
+    return report
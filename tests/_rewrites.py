@@ -0,0 +1,172 @@
+"""
+Write-avoidance audit of an ETL re-run on an unchanged batch.
+
+The data-loader is run a second time on the state its first run left, with the same
+CSVs and arguments. On identical input every write it issues is wasted: billed
+writes, index updates and sync hashes that change for nothing. Two figures per
+collection:
+
+  issued     writes the re-run sent — counted in the loader process by the
+             tests/_firestore_writes/sitecustomize.py hook (write_count_env), so
+             writes of byte-identical data count too: Firestore bills them even
+             though it keeps their update_time
+  rewritten  documents whose update_time moved — content that actually changed
+             (per-run fields such as timestamps, or delete + recreate)
+
+update_time comes from a projection-only partitioned scan (scan_partitioned with
+fields=[]): document names and timestamps only, no field data.
+
+RewriteAudit is appended to reports/pipeline/rewrites.json, so the wasted-write
+ratio can be tracked across data-loader versions:
+  [rewrites] re-run 402.1s (load 95.3s) — 52,890 writes issued for 52,890 docs (100.0%), 0 changed
+    collection             before      after     issued  rewritten    created    deleted  unchanged
+    PLProductContent        17638      17638      17638          0          0          0      17638
+    ...
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from google.cloud import firestore
+
+from tests._history import append_history
+from tests._id_index import scan_partitioned
+
+REPORTS_DIR    = Path(__file__).parent.parent / "reports" / "pipeline"
+WRITE_HOOK_DIR = Path(__file__).parent / "_firestore_writes"
+COLUMNS        = ("before", "after", "issued", "rewritten", "created", "deleted", "unchanged")
+
+
+def _visit(collection, snapshots):
+    return [(snap.id, snap.update_time) for snap in snapshots]
+
+
+def update_times(client: firestore.Client, index, collections, **scan_options) -> dict:
+    """{collection: {doc_id: update_time}} — names and timestamps only."""
+    times = {name: {} for name in collections}
+    for collection, rows in scan_partitioned(client, index, list(collections), _visit, fields=[], **scan_options):
+        times[collection].update(rows)
+    return times
+
+
+# ── Issued writes ─────────────────────────────────────────────────────────────
+
+def write_count_env(directory: Path, documents=()) -> dict:
+    """
+    Environment additions that make a Python child count its Firestore writes into
+    `directory` — per document, too, for the collections in `documents`. The hook's
+    sitecustomize runs the child's own sitecustomize after it, so that one still loads.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in [*directory.glob("*.json"), *directory.glob("*.documents")]:
+        stale.unlink()
+    pythonpath = [str(WRITE_HOOK_DIR), *filter(None, [os.environ.get("PYTHONPATH")])]
+    return {"PYTHONPATH": os.pathsep.join(pythonpath), "FIRESTORE_WRITE_COUNTS": str(directory),
+            "FIRESTORE_WRITE_DOCUMENTS": ",".join(documents)}
+
+
+def issued_writes(directory: Path) -> dict:
+    """{collection: writes} summed over the child's processes; None if the hook never loaded."""
+    files = list(directory.glob("*.json"))
+    if not files:
+        return None
+    issued = {}
+    for path in files:
+        for collection, counts in json.loads(path.read_text(encoding="utf-8")).items():
+            issued[collection] = issued.get(collection, 0) + counts["set"] + counts["delete"]
+    return issued
+
+
+def issued_documents(directory: Path, collection: str) -> dict:
+    """{doc_id: writes} to `collection`, which must be in write_count_env(documents=...)."""
+    issued = {}
+    for path in directory.glob("*.documents"):
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                _, name, doc_id = line.rstrip("\n").split(" ", 2)
+                if name == collection:
+                    issued[doc_id] = issued.get(doc_id, 0) + 1
+    return issued
+
+
+# ── Audit ─────────────────────────────────────────────────────────────────────
+
+@dataclass
+class RewriteAudit:
+    """Per-collection document writes of one re-run on unchanged input."""
+
+    seconds: float = None                         # whole re-run
+    load_seconds: float = None                    # its load:* stages
+    counts: dict = field(default_factory=dict)    # {collection: {before, after, issued, rewritten, created, deleted, unchanged}}
+    samples: dict = field(default_factory=dict)   # {collection: first rewritten doc IDs}
+
+    @classmethod
+    def build(cls, before: dict, after: dict, summary=None, issued: dict = None,
+              samples: int = 5) -> "RewriteAudit":
+        """`issued` is issued_writes() of the re-run — None leaves the issued column unknown."""
+        audit = cls(summary and summary.seconds, summary and summary.stage_seconds("load:"))
+        for collection in dict.fromkeys([*before, *after]):
+            old, new = before.get(collection, {}), after.get(collection, {})
+            common = old.keys() & new.keys()
+            rewritten = sorted(d for d in common if new[d] != old[d])
+            audit.counts[collection] = {
+                "before":    len(old),
+                "after":     len(new),
+                "issued":    None if issued is None else issued.get(collection, 0),
+                "rewritten": len(rewritten),
+                "created":   len(new.keys() - old.keys()),
+                "deleted":   len(old.keys() - new.keys()),
+                "unchanged": len(common) - len(rewritten),
+            }
+            audit.samples[collection] = rewritten[:samples]
+        return audit
+
+    def total(self, column: str) -> int:
+        values = [c[column] for c in self.counts.values()]
+        return None if None in values else sum(values)
+
+    def writes(self, collection: str = None) -> int:
+        """Writes the re-run issued — the wasted-write metric; None if they were not counted."""
+        return self.counts[collection]["issued"] if collection else self.total("issued")
+
+    def changed(self, collection: str = None) -> int:
+        """Documents whose content the re-run changed: rewritten, created or deleted."""
+        counts = [self.counts[collection]] if collection else self.counts.values()
+        return sum(c["rewritten"] + c["created"] + c["deleted"] for c in counts)
+
+    def ratio(self, collection: str = None) -> float:
+        """Issued writes per document present before the re-run."""
+        before = self.counts[collection]["before"] if collection else self.total("before")
+        writes = self.writes(collection)
+        if writes is None:
+            return None
+        return round(writes / before, 4) if before else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "writes": self.writes(), "ratio": self.ratio(), "changed": self.changed()}
+
+    def write(self, history: Path = REPORTS_DIR / "rewrites.json") -> None:
+        """Append this audit to the per-run history."""
+        append_history(history, self.to_dict())
+
+    def __str__(self) -> str:
+        seconds = f"{self.seconds:.1f}s" if self.seconds is not None else "?"
+        load = f" (load {self.load_seconds:.1f}s)" if self.load_seconds is not None else ""
+        issued = "? writes issued" if self.writes() is None else f"{self.writes():,} writes issued"
+        ratio = f" ({self.ratio():.1%})" if self.ratio() is not None else ""
+        cell = lambda n: f"{'?' if n is None else n:>9}"
+        lines = [
+            f"[rewrites] re-run {seconds}{load} — {issued} for {self.total('before'):,} docs{ratio}, "
+            f"{self.changed():,} changed",
+            "  " + "  ".join([f"{'collection':<18}", *(f"{c:>9}" for c in COLUMNS)]),
+        ]
+        for collection, counts in self.counts.items():
+            lines.append("  " + "  ".join([f"{collection:<18}", *(cell(counts[c]) for c in COLUMNS)]))
+        for collection, ids in self.samples.items():
+            if ids:
+                lines.append(f"  rewritten {collection}: {', '.join(ids)}")
+        return "\n".join(lines)
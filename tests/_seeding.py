@@ -0,0 +1,348 @@
+"""
+Declarative bulk seeding engine for Firestore fixtures.
+
+Every layer's seed data lives in a manifest under fixtures/seeds/ (JSON, or YAML
+when PyYAML is installed). A manifest maps collection names to document sources:
+
+    {
+      "options": {"mode": "bulk", "concurrency": 8},
+      "collections": {
+        "PLCategory": {
+          "documents": {"9001_de_DE": {"ID": 9001, "Name": "Parent"}}
+        },
+        "ProductIndexData": {
+          "generate": {
+            "count": 100000, "start": 50000,
+            "id": "{n}_0_de_DE",
+            "template": {"base_sku": "{n}", "name": "Product {n}"}
+          }
+        },
+        "products-index-updates": {
+          "documents_file": "big-queue.ndjson"
+        }
+      }
+    }
+
+Document sources (any combination per collection):
+  documents       — explicit {doc_id: data} mapping
+  generate        — `count` documents rendered from `template`; `{n}` (start + i)
+                    and `{i}` (0-based index) are substituted in every string,
+                    with optional format specs such as `{n:06d}`. A list of such
+                    specs generates several `n` ranges with different templates.
+  documents_file  — NDJSON file (relative to the manifest, optionally .gz) of
+                    {"id": ..., "data": ...} lines, streamed so it never has to fit in memory.
+
+Directive values, resolved per document:
+  {"$int": "{n}"}                      — the rendered string as an integer.
+  {"$sha256_of": "Collection/doc_id"} — sha256(json.dumps(data, sort_keys=True)) of
+      another document in the same manifest, i.e. the content_hash that
+      sync_product_index.py would compute. For generated documents the referenced
+      collection is rendered at the same `n`.
+
+Typed values that JSON cannot carry (written by encode_value, e.g. in snapshots):
+  {"$timestamp": "2024-01-01T00:00:00+00:00"}  {"$bytes": "<base64>"}
+  {"$geopoint": [lat, lng]}
+
+Write modes:
+  bulk   — one BulkWriter per collection (parallel send mode), collections seeded
+           concurrently by `concurrency` threads.
+  batch  — 500-document WriteBatch commits fanned out over `concurrency` threads.
+
+Documents are produced lazily, so a 100k-document manifest streams straight into
+the writers without materialising the whole dataset.
+"""
+
+import base64
+import datetime
+import gzip
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions, SendMode
+
+try:
+    import yaml
+except ImportError:   # YAML manifests are optional — JSON always works
+    yaml = None
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+SEEDS_DIR = Path(__file__).parent.parent / "fixtures" / "seeds"
+
+DEFAULT_OPTIONS = {
+    "mode":        "bulk",
+    "concurrency": 8,
+    "batch_size":  500,     # Firestore WriteBatch limit
+}
+
+_PLACEHOLDER = re.compile(r"\{(n|i)(:[^{}]*)?\}")
+
+
+# ── Reports ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class CollectionSeed:
+    count: int
+    seconds: float
+
+
+@dataclass
+class SeedReport:
+    """Per-collection document counts and write timings for one manifest."""
+
+    manifest: str
+    mode: str
+    seconds: float = 0.0
+    collections: dict = field(default_factory=dict)   # name → CollectionSeed
+
+    @property
+    def total(self) -> int:
+        return sum(c.count for c in self.collections.values())
+
+    def __str__(self) -> str:
+        parts = " ".join(
+            f"{name}={c.count} ({c.seconds:.2f}s)" for name, c in self.collections.items()
+        )
+        return f"[seed] {self.manifest} mode={self.mode} {parts} total={self.total} in {self.seconds:.2f}s"
+
+
+# ── Manifest loading ──────────────────────────────────────────────────────────
+
+def manifest_path(name) -> Path:
+    """Resolve a manifest name (`sync`) or path to an existing file."""
+    path = Path(name)
+    if path.suffix and path.exists():
+        return path
+    for suffix in (".json", ".yaml", ".yml"):
+        candidate = SEEDS_DIR / f"{name}{suffix}"
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"Seed manifest '{name}' not found in {SEEDS_DIR}")
+
+
+def load_manifest(name) -> dict:
+    path = manifest_path(name)
+    with open(path, encoding="utf-8") as fh:
+        if path.suffix in (".yaml", ".yml"):
+            if yaml is None:
+                raise RuntimeError(f"PyYAML is required to load {path.name} — pip install pyyaml")
+            manifest = yaml.safe_load(fh)
+        else:
+            manifest = json.load(fh)
+    manifest["_path"] = path
+    return manifest
+
+
+def manifest_document(name, collection: str, doc_id: str) -> dict:
+    """Return one rendered document from a manifest — lets tests share the seeded data."""
+    manifest = load_manifest(name)
+    resolver = _Resolver(manifest)
+    return resolver.document(collection, doc_id)
+
+
+def manifest_documents(name, collection: str):
+    """Lazily yield (doc_id, data) for every document of one manifest collection (none if absent)."""
+    resolver = _Resolver(load_manifest(name))
+    if collection in resolver.collections:
+        yield from resolver.iter_documents(collection)
+
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+
+def encode_value(value):
+    """Convert a Firestore value to its manifest form (inverse of the typed directives)."""
+    if isinstance(value, dict):
+        return {k: encode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [encode_value(v) for v in value]
+    if isinstance(value, datetime.datetime):
+        return {"$timestamp": value.isoformat()}
+    if isinstance(value, bytes):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, firestore.GeoPoint):
+        return {"$geopoint": [value.latitude, value.longitude]}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot encode Firestore value of type {type(value).__name__}")
+
+
+def _sha256_json(data: dict) -> str:
+    """Same digest as sync_product_index.py._compute_hash."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def _render_string(value: str, n: int, i: int) -> str:
+    return _PLACEHOLDER.sub(
+        lambda m: format(n if m.group(1) == "n" else i, (m.group(2) or ":")[1:]),
+        value,
+    )
+
+
+def _render(value, n: int, i: int):
+    if isinstance(value, str):
+        return _render_string(value, n, i) if "{" in value else value
+    if isinstance(value, dict):
+        return {k: _render(v, n, i) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, n, i) for v in value]
+    return value
+
+
+def _generators(spec: dict) -> list:
+    gen = spec.get("generate")
+    return [] if gen is None else gen if isinstance(gen, list) else [gen]
+
+
+class _Resolver:
+    """Renders documents from a manifest and resolves `$` directives."""
+
+    def __init__(self, manifest: dict):
+        self.manifest = manifest
+        self.collections = manifest.get("collections", {})
+        self.base_dir = Path(manifest.get("_path", SEEDS_DIR)).parent
+
+    def document(self, collection: str, doc_id: str, n: int = None) -> dict:
+        spec = self.collections.get(collection)
+        if spec is None:
+            raise KeyError(f"Collection '{collection}' not in manifest")
+        if doc_id in spec.get("documents", {}):
+            return self._resolve(spec["documents"][doc_id], n)
+        if n is not None:
+            for gen in _generators(spec):
+                i = n - gen.get("start", 0)
+                if 0 <= i < gen["count"]:
+                    return self._resolve(_render(gen["template"], n, i), n)
+        raise KeyError(f"Document '{collection}/{doc_id}' not in manifest")
+
+    def _resolve(self, value, n):
+        if isinstance(value, dict):
+            if len(value) == 1 and "$sha256_of" in value:
+                collection, _, doc_id = value["$sha256_of"].partition("/")
+                return _sha256_json(self.document(collection, doc_id, n))
+            if len(value) == 1 and "$int" in value:
+                return int(value["$int"])
+            if len(value) == 1 and "$timestamp" in value:
+                return datetime.datetime.fromisoformat(value["$timestamp"])
+            if len(value) == 1 and "$bytes" in value:
+                return base64.b64decode(value["$bytes"])
+            if len(value) == 1 and "$geopoint" in value:
+                return firestore.GeoPoint(*value["$geopoint"])
+            return {k: self._resolve(v, n) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(v, n) for v in value]
+        return value
+
+    def iter_documents(self, collection: str):
+        """Lazily yield (doc_id, data) for every source of one collection."""
+        spec = self.collections[collection]
+        for doc_id in spec.get("documents", {}):
+            yield doc_id, self.document(collection, doc_id)
+
+        for gen in _generators(spec):
+            start = gen.get("start", 0)
+            for i in range(gen["count"]):
+                n = start + i
+                doc_id = str(_render(gen["id"], n, i))
+                yield doc_id, self._resolve(_render(gen["template"], n, i), n)
+
+        if "documents_file" in spec:
+            path = self.base_dir / spec["documents_file"]
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rt", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        row = json.loads(line)
+                        yield row["id"], self._resolve(row["data"], None)
+
+
+# ── Writers ───────────────────────────────────────────────────────────────────
+
+def _write_bulk(client: firestore.Client, name: str, docs) -> int:
+    writer = client.bulk_writer(options=BulkWriterOptions(mode=SendMode.parallel))
+    col = client.collection(name)
+    count = 0
+    for doc_id, data in docs:
+        writer.set(col.document(doc_id), data)
+        count += 1
+    writer.close()
+    return count
+
+
+def _write_batches(client: firestore.Client, name: str, docs, batch_size: int, concurrency: int) -> int:
+    col = client.collection(name)
+    # Bound the in-flight batches so lazily generated documents stay lazily held
+    slots = threading.BoundedSemaphore(concurrency * 2)
+    count = 0
+
+    def commit(chunk):
+        try:
+            batch = client.batch()
+            for doc_id, data in chunk:
+                batch.set(col.document(doc_id), data)
+            batch.commit()
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = []
+        docs = iter(docs)
+        while True:
+            chunk = list(itertools.islice(docs, batch_size))
+            if not chunk:
+                break
+            slots.acquire()
+            futures.append(pool.submit(commit, chunk))
+            count += len(chunk)
+        for f in futures:
+            f.result()
+    return count
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def seed_manifest(client: firestore.Client, name, **overrides) -> SeedReport:
+    """
+    Seed every collection in a manifest and return per-collection counts and timings.
+
+    Args:
+        client:    Firestore client connected to the emulator.
+        name:      Manifest name under fixtures/seeds/ (`sync`) or a path.
+        overrides: `mode`, `concurrency`, `batch_size` — override the manifest's options.
+    """
+    manifest = load_manifest(name)
+    options = {**DEFAULT_OPTIONS, **manifest.get("options", {}), **overrides}
+    mode, concurrency = options["mode"], max(1, int(options["concurrency"]))
+    if mode not in ("bulk", "batch"):
+        raise ValueError(f"Unknown seed mode '{mode}' — expected 'bulk' or 'batch'")
+
+    resolver = _Resolver(manifest)
+    report = SeedReport(manifest=manifest["_path"].stem, mode=mode)
+
+    def seed_one(collection: str):
+        start = time.perf_counter()
+        docs = resolver.iter_documents(collection)
+        if mode == "bulk":
+            count = _write_bulk(client, collection, docs)
+        else:
+            count = _write_batches(client, collection, docs, options["batch_size"], concurrency)
+        return collection, CollectionSeed(count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    names = list(resolver.collections)
+    # Batch mode already fans out within a collection; seed collections one at a time there
+    workers = min(concurrency, len(names)) if mode == "bulk" else 1
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for collection, seeded in pool.map(seed_one, names):
+            report.collections[collection] = seeded
+    report.seconds = time.perf_counter() - start
+
+    print(report, flush=True)
+    return report
@@ -0,0 +1,134 @@
+"""
+Snapshot / restore of post-ETL Firestore state.
+
+A snapshot is a directory holding one gzipped NDJSON dump per collection plus a
+seed manifest that points at them, so restoring is just a reset followed by
+tests/_seeding.py streaming the dumps back through BulkWriter:
+
+    .cache/snapshots/pipeline/
+      manifest.json              seed manifest ({"collections": {name: {"documents_file": ...}}})
+      PLProductContent.ndjson.gz {"id": "40806000_de_DE", "data": {...}} per line
+      ...
+      process.json               args / returncode / stdout / stderr / EtlSummary of the producing run
+
+The gcloud emulator's own export endpoint can only be imported at emulator start-up
+(`--import-data`), so a compact per-collection dump is used instead — it restores
+into a running emulator and works against any project ID.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from google.cloud import firestore
+
+from tests._etl_log import OUTCOME_FLAGS, PIPELINE_COLLECTIONS, EtlSummary, parse_output
+from tests._reset import reset_firestore
+from tests._seeding import encode_value, seed_manifest
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+SNAPSHOTS_DIR = Path(__file__).parent.parent / ".cache" / "snapshots"
+
+MANIFEST_FILE = "manifest.json"
+PROCESS_FILE  = "process.json"
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _dump_collection(client: firestore.Client, name: str, directory: Path) -> int:
+    count = 0
+    with gzip.open(directory / f"{name}.ndjson.gz", "wt", encoding="utf-8") as fh:
+        for snap in client.collection(name).stream():
+            fh.write(json.dumps({"id": snap.id, "data": encode_value(snap.to_dict())}))
+            fh.write("\n")
+            count += 1
+    return count
+
+
+def has_snapshot(directory: Path) -> bool:
+    return (directory / MANIFEST_FILE).exists() and (directory / PROCESS_FILE).exists()
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def save_snapshot(
+    client: firestore.Client,
+    directory: Path,
+    proc: subprocess.CompletedProcess,
+    collections=PIPELINE_COLLECTIONS,
+) -> dict:
+    """
+    Dump `collections` and the producing process result into `directory`.
+
+    Written to a temporary sibling first and renamed, so an interrupted save never
+    leaves a half-written snapshot behind. Returns {collection: doc_count}.
+    """
+    start = time.perf_counter()
+    directory = Path(directory)
+    tmp = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    with ThreadPoolExecutor(max_workers=len(collections)) as pool:
+        counts = dict(zip(collections, pool.map(lambda n: _dump_collection(client, n, tmp), collections)))
+
+    manifest = {
+        "collections": {name: {"documents_file": f"{name}.ndjson.gz"} for name in collections},
+        "counts": counts,
+    }
+    (tmp / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    (tmp / PROCESS_FILE).write_text(json.dumps({
+        "args":       [str(a) for a in proc.args],
+        "returncode": proc.returncode,
+        "stdout":     proc.stdout,
+        "stderr":     proc.stderr,
+        "summary":    proc.summary.to_dict() if getattr(proc, "summary", None) else None,
+    }), encoding="utf-8")
+
+    shutil.rmtree(directory, ignore_errors=True)
+    tmp.rename(directory)
+
+    total = sum(counts.values())
+    print(f"[snapshot] saved {total} docs to {directory} in {time.perf_counter() - start:.2f}s", flush=True)
+    return counts
+
+
+def restore_snapshot(client: firestore.Client, directory: Path) -> subprocess.CompletedProcess:
+    """
+    Reset the emulator and load a snapshot back into it.
+
+    Returns a CompletedProcess rebuilt from process.json, so callers see exactly
+    what the original data-loader run returned. Its `.summary` is the recorded
+    EtlSummary (stage timings of the original run), or a fresh offline parse for
+    snapshots saved without one. The outcome flags are always re-parsed from the
+    recorded stdout, so entries stored by an older parser cannot carry stale ones.
+    """
+    start = time.perf_counter()
+    directory = Path(directory)
+
+    reset_firestore(client)
+    report = seed_manifest(client, directory / MANIFEST_FILE)
+
+    expected = json.loads((directory / MANIFEST_FILE).read_text(encoding="utf-8"))["counts"]
+    restored = {name: c.count for name, c in report.collections.items()}
+    if restored != expected:
+        raise RuntimeError(f"Snapshot {directory} restored {restored}, expected {expected}")
+
+    meta = json.loads((directory / PROCESS_FILE).read_text(encoding="utf-8"))
+    print(f"[snapshot] restored {report.total} docs from {directory} in {time.perf_counter() - start:.2f}s", flush=True)
+    proc = subprocess.CompletedProcess(meta["args"], meta["returncode"], meta["stdout"], meta["stderr"])
+    parsed = parse_output(proc.stdout, proc.stderr, proc.returncode)
+    if meta.get("summary"):
+        proc.summary = EtlSummary.from_dict(meta["summary"])
+        proc.summary.source = "cache"
+        for flag in OUTCOME_FLAGS:
+            setattr(proc.summary, flag, getattr(parsed, flag))
+    else:
+        proc.summary = parsed
+    return proc
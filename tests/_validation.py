@@ -0,0 +1,211 @@
+"""
+Partitioned, parallel validator for every document the ETL writes.
+
+Documents are streamed through scan_partitioned() (tests/_id_index.py): each
+collection's sorted IDs are cut into `order_by(__name__).start_at(lo).end_before(hi)`
+cursor ranges, and all ranges of all collections are read concurrently from one
+thread pool. Every document is checked against the invariants registered for its
+collection in REGISTRY:
+
+  required    field → expected type (tuple of types, or None for presence only)
+  id_pattern  regex the document ID must fully match
+  max_bytes   storage-size guard (900KB, tests/_docsize.py — Firestore's limit is 1 MiB)
+  checks      extra callables (doc_id, data) → iterable of violated rule names
+
+The result is a ValidationReport; `str(report)` is a compact summary grouped by
+collection and rule, e.g.
+  [validate] 17412 docs in 5 collections, 40 ranges, 3.21s — 2 violations
+    PLVariant   missing:SKU|BaseSKU   2   (7721_0_de_DE, 7722_0_de_DE)
+"""
+
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from google.cloud import firestore
+
+from tests._docsize import document_size
+from tests._id_index import scan_partitioned
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+MAX_DOC_BYTES = 900_000   # safety margin below Firestore's 1 MiB document limit
+
+SAMPLE_IDS = 5   # example document IDs kept per (collection, rule)
+
+LOCALE_SUFFIX = r"_[a-z]{2}_[A-Z]{2}"
+
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """Invariants every document of one collection must satisfy."""
+
+    required: dict = field(default_factory=dict)
+    id_pattern: str = None
+    max_bytes: int = MAX_DOC_BYTES
+    checks: tuple = ()
+
+
+REGISTRY = {}
+
+
+def register(collection: str, spec: CollectionSpec) -> CollectionSpec:
+    REGISTRY[collection] = spec
+    return spec
+
+
+def _document_id_matches(doc_id: str, data: dict):
+    if data.get("DocumentID", doc_id) != doc_id:
+        yield "DocumentID!=doc-id"
+
+
+def _id_field_matches(doc_id: str, data: dict):
+    if data.get("id", doc_id) != doc_id:
+        yield "id!=doc-id"
+
+
+def _finish_definitions_complete(doc_id: str, data: dict):
+    required = ("sku", "ean", "image", "slug", "color", "id",
+                "is_historical", "has_3d_files", "eu_taxonomy",
+                "recommended", "water_saving", "energy_saving")
+    missing = {f for d in data.get("finish_definitions") or [] for f in required if f not in d}
+    for name in sorted(missing):
+        yield f"missing:finish_definitions[].{name}"
+
+
+def _has_sku_identifier(doc_id: str, data: dict):
+    if "SKU" not in data and "BaseSKU" not in data:
+        yield "missing:SKU|BaseSKU"
+
+
+register("PLProductContent", CollectionSpec(
+    required={
+        "SKU": str, "EAN": None, "Slug": str, "BaseSKU": str,
+        "Language": str, "Market": str, "DocumentID": str,
+        "StandardImages": list, "Finish": None, "Finishes": list,
+        "Variants": dict, "SizeVariants": list, "SpareParts": list,
+        "NecessaryforInstallationIDs": None, "OptionalForInstallationIDs": None,
+    },
+    id_pattern=rf".+{LOCALE_SUFFIX}",
+    checks=(_document_id_matches,),
+))
+
+register("ProductIndexData", CollectionSpec(
+    required={
+        "id": str, "base_sku": str, "finish_definitions": list,
+        "all_category_ids": list, "colors": list, "image_url": str,
+        "is_historical": bool, "tag_definitions": list,
+    },
+    id_pattern=rf"[^_]+_\d+{LOCALE_SUFFIX}",
+    checks=(_id_field_matches, _finish_definitions_complete),
+))
+
+register("PLCategory", CollectionSpec(
+    required={"Language": str, "Market": str},
+    id_pattern=rf".+{LOCALE_SUFFIX}",
+))
+
+register("PLVariant", CollectionSpec(
+    id_pattern=rf".+{LOCALE_SUFFIX}",
+    checks=(_has_sku_identifier,),
+))
+
+register("CategoryRouting", CollectionSpec())
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class ValidationReport:
+    """Documents scanned and violations found per collection, plus wall time."""
+
+    seconds: float = 0.0
+    ranges: int = 0
+    scanned: dict = field(default_factory=dict)                            # collection → docs
+    violations: dict = field(default_factory=lambda: defaultdict(dict))   # collection → rule → [doc_ids]
+
+    @property
+    def total(self) -> int:
+        return sum(self.scanned.values())
+
+    def count(self, collection: str = None) -> int:
+        groups = [self.violations.get(collection, {})] if collection else self.violations.values()
+        return sum(len(ids) for rules in groups for ids in rules.values())
+
+    def summary(self, collection: str = None) -> str:
+        lines = []
+        for name in sorted(self.violations):
+            if collection and name != collection:
+                continue
+            for rule, ids in sorted(self.violations[name].items(), key=lambda kv: -len(kv[1])):
+                sample = ", ".join(sorted(ids)[:SAMPLE_IDS])
+                lines.append(f"  {name:<18} {rule:<40} {len(ids):>6}   ({sample})")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        head = (f"[validate] {self.total} docs in {len(self.scanned)} collections, "
+                f"{self.ranges} ranges, {self.seconds:.2f}s — {self.count()} violations")
+        body = self.summary()
+        return f"{head}\n{body}" if body else head
+
+
+# ── Checking ──────────────────────────────────────────────────────────────────
+
+def _type_name(expected) -> str:
+    types = expected if isinstance(expected, tuple) else (expected,)
+    return "|".join(t.__name__ for t in types)
+
+
+def check_document(spec: CollectionSpec, doc_id: str, data: dict, collection: str = "") -> list:
+    """All violation rules (as short strings) one document breaks."""
+    problems = []
+    if spec.id_pattern and not re.fullmatch(spec.id_pattern, doc_id):
+        problems.append("id-format")
+    for name, expected in spec.required.items():
+        if name not in data:
+            problems.append(f"missing:{name}")
+        elif expected is not None and not isinstance(data[name], expected):
+            problems.append(f"type:{name}!={_type_name(expected)}")
+    if document_size(collection, doc_id, data) > spec.max_bytes:
+        problems.append(f"size>{spec.max_bytes}")
+    for check in spec.checks:
+        problems.extend(check(doc_id, data))
+    return problems
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def _check_range(collection: str, snapshots):
+    spec = REGISTRY.get(collection, CollectionSpec())
+    scanned, found = 0, defaultdict(list)
+    for snap in snapshots:
+        scanned += 1
+        for rule in check_document(spec, snap.id, snap.to_dict(), collection):
+            found[rule].append(snap.id)
+    return scanned, found
+
+
+def validate_collections(
+    client: firestore.Client,
+    index,
+    collections=None,
+    **scan_options,
+) -> ValidationReport:
+    """Scan every document of `collections` (default: all of REGISTRY) and apply its invariants."""
+    start = time.perf_counter()
+    collections = list(collections or REGISTRY)
+
+    report = ValidationReport(scanned={name: 0 for name in collections})
+    results = scan_partitioned(client, index, collections, _check_range, **scan_options)
+    report.ranges = len(results)
+    for name, (scanned, found) in results:
+        report.scanned[name] += scanned
+        for rule, ids in found.items():
+            report.violations[name].setdefault(rule, []).extend(ids)
+
+    report.seconds = time.perf_counter() - start
+    print(report, flush=True)
+    return report
@@ -0,0 +1,276 @@
+"""
+WireMock request journal: server-side counts and filters, incremental fetches, indexed view.
+
+GET /__admin/requests returns the whole journal, every body inline (base64 for
+binary content), newest first. At thousands of ingestion calls that is megabytes
+per fetch, and filtering lists in each test repeats the work. WireMock answers the
+common questions itself:
+
+  count(**matchers)   POST /__admin/requests/count   → one number, nothing transferred
+  find(**matchers)    POST /__admin/requests/find    → only the matching requests
+
+Matchers build a WireMock request pattern: `method`, `url_pattern` (regex on path +
+query) and `body_path` (dotted path that must exist in the JSON body, sent as a
+matchesJsonPath "$.<path>").
+
+tail(view) pages the journal by time: it fetches only the serve events logged since
+the newest one the view already holds (GET /__admin/requests?since=…), so a poller
+that tails during a run transfers every request once, in small pages. Serve events
+also carry timing (totalTime), which find() results do not.
+
+JournalView holds the fetched requests in logged order and answers where() from
+indexes: by method (built on insert), by URL regex and by body path / value (built
+on the first query that needs them, then kept up to date). Bodies are decoded and
+parsed only when a request's body, json or get() is first read. Serve events name
+the stub that answered (JournalRequest.stub) and the status it returned.
+
+add_mapping() / remove_mapping() install stubs at runtime on top of the
+fixtures/mocks/ files (fault profiles: tests/indexing/_faults.py).
+
+    journal = WireMock(url).find(url_pattern=INGESTION_URL_PATTERN)
+    puts = journal.where(method="PUT")
+    journal.where(path="document.fields.name", value="Test Indexing Product")
+"""
+
+import base64
+import json
+import re
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+# Sitecore Search ingestion endpoint, as stubbed in fixtures/mocks/sitecore-search/
+INGESTION_URL_PATTERN = "^/ingestion/v1/domains/.+/sources/.+/entities/.+/documents/.+"
+
+ANY     = object()    # where(value=ANY): the body path only has to exist
+MISSING = object()    # JournalRequest.get() of a path the body does not have
+_UNREAD = object()
+TIMEOUT = 60          # seconds per admin call
+
+
+def request_pattern(method: str = None, url_pattern: str = None, body_path: str = None) -> dict:
+    pattern = {"method": method or "ANY"}
+    if url_pattern:
+        pattern["urlPattern"] = url_pattern
+    if body_path:
+        pattern["bodyPatterns"] = [{"matchesJsonPath": f"$.{body_path}"}]
+    return pattern
+
+
+def _value_key(value) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+# ── Requests ──────────────────────────────────────────────────────────────────
+
+class JournalRequest:
+    """One logged request; body, JSON and query string are decoded on first access."""
+
+    __slots__ = ("id", "method", "url", "logged_ms", "served_ms", "status", "stub", "_raw", "_body", "_json")
+
+    def __init__(self, entry: dict):
+        # A serve event from /__admin/requests wraps the request; find() returns it bare
+        raw = entry.get("request", entry)
+        timing = entry.get("timing") or {}
+        self.id = entry.get("id") or raw.get("id")
+        self.method = raw["method"]
+        self.url = raw["url"]
+        self.logged_ms = raw.get("loggedDate")
+        self.served_ms = None
+        if self.logged_ms is not None and "totalTime" in timing:
+            self.served_ms = self.logged_ms + timing["totalTime"]
+        self.status = (entry.get("response") or {}).get("status")    # serve events only
+        self.stub = (entry.get("stubMapping") or {}).get("name")     # name of the mapping that answered
+        self._raw = raw
+        self._body = None
+        self._json = _UNREAD
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.url).path
+
+    @property
+    def document(self) -> str:
+        """Last URL path segment — the document identifier of an ingestion request."""
+        return unquote(self.path.rstrip("/").rsplit("/", 1)[-1])
+
+    @property
+    def query(self) -> dict:
+        return parse_qs(urlsplit(self.url).query)
+
+    @property
+    def body(self) -> str:
+        """Request body as text — plain, or decoded from bodyAsBase64."""
+        if self._body is None:
+            body = self._raw.get("body") or ""
+            if not body and self._raw.get("bodyAsBase64"):
+                body = base64.b64decode(self._raw["bodyAsBase64"]).decode("utf-8")
+            self._body = body
+        return self._body
+
+    @property
+    def json(self):
+        """Parsed JSON body, None if the body is empty or not JSON."""
+        if self._json is _UNREAD:
+            try:
+                self._json = json.loads(self.body) if self.body else MISSING
+            except ValueError:
+                self._json = MISSING
+        return None if self._json is MISSING else self._json
+
+    def get(self, path: str, default=MISSING):
+        """Value at dotted `path` in the JSON body (list items by index), `default` if absent."""
+        node = self.json
+        for key in path.split("."):
+            if isinstance(node, dict) and key in node:
+                node = node[key]
+            elif isinstance(node, list) and key.isdigit() and int(key) < len(node):
+                node = node[int(key)]
+            else:
+                return default
+        return node
+
+    def __repr__(self) -> str:
+        return f"<{self.method} {self.url}>"
+
+
+# ── Indexed view ──────────────────────────────────────────────────────────────
+
+class JournalView:
+    """Fetched requests in logged order, queried through lazily built indexes."""
+
+    def __init__(self, entries=()):
+        self._requests = []
+        self._ids = set()
+        self._by_method = {}   # {method: [position]}
+        self._by_url = {}      # {regex: [position]}
+        self._by_path = {}     # {body path: {value key: [position]}}
+        self.newest_ms = None  # loggedDate of the newest request held
+        self.extend(entries)
+
+    def extend(self, entries) -> int:
+        """Add journal entries not seen before (by ID); returns how many were new."""
+        added = [JournalRequest(e) for e in entries]
+        added = [r for r in added if r.id is None or r.id not in self._ids]
+        added.sort(key=lambda r: r.logged_ms or 0)
+        for request in added:
+            position = len(self._requests)
+            self._requests.append(request)
+            if request.id is not None:
+                self._ids.add(request.id)
+            self._by_method.setdefault(request.method, []).append(position)
+            if request.logged_ms is not None and (self.newest_ms is None or request.logged_ms > self.newest_ms):
+                self.newest_ms = request.logged_ms
+            for pattern, positions in self._by_url.items():
+                if re.search(pattern, request.url):
+                    positions.append(position)
+            for path, values in self._by_path.items():
+                self._index_body(values, path, position)
+        return len(added)
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __iter__(self):
+        return iter(self._requests)
+
+    def __getitem__(self, position: int) -> JournalRequest:
+        return self._requests[position]
+
+    def methods(self) -> dict:
+        """{method: requests}."""
+        return {method: len(positions) for method, positions in self._by_method.items()}
+
+    def _index_body(self, values: dict, path: str, position: int) -> None:
+        value = self._requests[position].get(path)
+        if value is not MISSING:
+            values.setdefault(_value_key(value), []).append(position)
+
+    def _url_positions(self, pattern: str) -> list:
+        if pattern not in self._by_url:
+            regex = re.compile(pattern)
+            self._by_url[pattern] = [i for i, r in enumerate(self._requests) if regex.search(r.url)]
+        return self._by_url[pattern]
+
+    def _path_positions(self, path: str, value) -> list:
+        if path not in self._by_path:
+            values = self._by_path[path] = {}
+            for position in range(len(self._requests)):
+                self._index_body(values, path, position)
+        values = self._by_path[path]
+        if value is ANY:
+            return sorted(p for positions in values.values() for p in positions)
+        return values.get(_value_key(value), [])
+
+    def where(self, method: str = None, url: str = None, path: str = None, value=ANY) -> list:
+        """Requests matching every given criterion, in logged order.
+
+        `url` is a regex searched in the URL; `path` a dotted body path that must
+        exist and, if `value` is given, equal it."""
+        candidates = [self._by_method.get(method, [])] if method else []
+        if url:
+            candidates.append(self._url_positions(url))
+        if path:
+            candidates.append(self._path_positions(path, value))
+        if not candidates:
+            return list(self._requests)
+        positions = set(candidates[0]).intersection(*candidates[1:])
+        return [self._requests[p] for p in sorted(positions)]
+
+    def count(self, **criteria) -> int:
+        return len(self.where(**criteria))
+
+
+# ── Admin API client ──────────────────────────────────────────────────────────
+
+class WireMock:
+    """Request-journal side of the WireMock admin API at `base_url` (http://host:port)."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self._session = requests.Session()
+
+    def _admin(self, method: str, path: str, **kwargs) -> dict:
+        response = self._session.request(method, f"{self.base_url}/__admin/{path}", timeout=TIMEOUT, **kwargs)
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    def reset(self) -> None:
+        """Clear the request journal."""
+        self._admin("DELETE", "requests")
+
+    def count(self, method: str = None, url_pattern: str = None, body_path: str = None) -> int:
+        """Matching requests, counted by WireMock."""
+        return self._admin("POST", "requests/count", json=request_pattern(method, url_pattern, body_path))["count"]
+
+    def find(self, method: str = None, url_pattern: str = None, body_path: str = None) -> JournalView:
+        """Matching requests, filtered by WireMock; no serve timing."""
+        found = self._admin("POST", "requests/find", json=request_pattern(method, url_pattern, body_path))
+        return JournalView(found.get("requests", []))
+
+    def tail(self, view: JournalView = None) -> JournalView:
+        """Extend `view` (a new one if None) with the serve events logged since its newest request.
+
+        WireMock's `since` is exclusive and millisecond-precise, so the page starts
+        one millisecond early and already held requests are skipped by ID."""
+        view = view if view is not None else JournalView()
+        params = {}
+        if view.newest_ms is not None:
+            since = datetime.fromtimestamp((view.newest_ms - 1) / 1000, tz=timezone.utc)
+            params["since"] = since.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        view.extend(self._admin("GET", "requests", params=params).get("requests", []))
+        return view
+
+    # ── Stub mappings ──
+
+    def add_mapping(self, mapping: dict) -> str:
+        """Install a stub mapping; returns its ID."""
+        return self._admin("POST", "mappings", json=mapping)["id"]
+
+    def remove_mapping(self, mapping_id: str) -> None:
+        self._admin("DELETE", f"mappings/{mapping_id}")
+
+    def reset_scenarios(self) -> None:
+        """Put every scenario back into its "Started" state."""
+        self._admin("POST", "scenarios/reset")
@@ -4,40 +4,83 @@ Shared pytest fixtures for the Grohe NEO integration test suite.
 Infrastructure assumptions:
   - Firestore emulator: localhost:8080  (started via `make infra-up`)
   - Data-loader: grohe-neo-data-loader/  (run via subprocess using its .venv)
-  - CSV fixtures:  integration/fixtures/csv/
+  - CSV fixtures:  integration/fixtures/csv/  (PIPELINE_FIXTURES overrides, e.g. fixtures/csv-smoke)
+
+Set PIPELINE_CACHE to control reuse of post-ETL state between sessions (tests/_etl_cache.py):
+  auto     (default) restore the cached result whose key matches the data-loader
+           source, fixtures/csv/ and main.py args; run the ETL and cache it on a miss
+  refresh  always run the data-loader and overwrite the cache entry
+  off      always run the data-loader, never read or write the cache
+
+Before either, PIPELINE_PREFLIGHT checks the CSV batch (tests/_preflight.py: files,
+headers, key uniqueness, foreign keys) in seconds:
+  strict   (default) fail the session on any preflight error; the ETL never starts
+  warn     print the report and run the ETL anyway
+  off      skip the preflight
+
+PIPELINE_RERUN=on (`make test-pipeline-rerun`) makes `pipeline_rerun` run main.py a
+second time on the state of the first run, without clearing it, and audit the
+writes that redundant run issued (tests/_rewrites.py). Default off: the re-run
+costs a full ETL.
+
+Parallel runs (pytest-xdist, `make test-parallel`): the gcloud emulator isolates data
+by project ID, so each worker gets its own project (demo-project-gw0, -gw1, ...) and
+passes it to the data-loader / sync subprocesses via GCLOUD_PROJECT. Layers that talk
+to .NET containers (indexing, services) stay on the shared `demo-project` the
+containers were started with, via `service_firestore_client`, and are pinned to a
+single xdist group so they never run concurrently.
+
+The data-loader's output is streamed, not captured (tests/_etl_log.py): it goes line
+by line to reports/pipeline/<worker>/data-loader.log, stage changes are printed live,
+and `pipeline_result.summary` carries the parsed EtlSummary (per-stage timings, outcome
+flags, last output lines) that the pipeline tests assert on.
 """
 
 import os
-import platform
 import subprocess
-import sys
 import time
 from pathlib import Path
 
 import pytest
 from google.cloud import firestore
 
-# ── Paths ─────────────────────────────────────────────────────────────────────
+from tests._env import (
+    DATA_LOADER_DIR, DATA_LOADER_PYTHON, EMULATOR_HOST, FIXTURES_CSV, PROJECT_ID, SERVICE_PROJECT_ID, XDIST_WORKER,
+)
+from tests._etl_log import REPORTS_DIR as ETL_LOG_DIR, run_streamed
+from tests._id_index import CollectionIdIndex
+from tests._preflight import preflight
+from tests._reset import reset_firestore
+from tests._rewrites import RewriteAudit, issued_writes, update_times, write_count_env
+from tests._snapshot import PIPELINE_COLLECTIONS
+from tests import _etl_cache
 
-REPO_ROOT       = Path(__file__).parent.parent.parent          # NEO/
-INTEGRATION_DIR = Path(__file__).parent.parent                 # NEO/integration/
-DATA_LOADER_DIR = REPO_ROOT / "grohe-neo-data-loader"
-FIXTURES_CSV    = INTEGRATION_DIR / "fixtures" / "csv"
+# ── Emulator config ───────────────────────────────────────────────────────────
 
-# Python executable inside the data-loader's virtualenv
-if platform.system() == "Windows":
-    DATA_LOADER_PYTHON = DATA_LOADER_DIR / ".venv" / "Scripts" / "python.exe"
-else:
-    DATA_LOADER_PYTHON = DATA_LOADER_DIR / ".venv" / "bin" / "python"
+# Paths, emulator host and per-worker project IDs live in tests/_env.py.
+# Layers backed by .NET containers — must share SERVICE_PROJECT_ID and run serially
+SERVICE_LAYERS = ("indexing", "services")
 
-# Fallback to system Python if the venv doesn't exist yet
-if not DATA_LOADER_PYTHON.exists():
-    DATA_LOADER_PYTHON = Path(sys.executable)
+# ── ETL cache config ──────────────────────────────────────────────────────────
 
-# ── Emulator config ───────────────────────────────────────────────────────────
+PIPELINE_CACHE = os.environ.get("PIPELINE_CACHE", "auto").lower()
+
+# ── CSV preflight config ──────────────────────────────────────────────────────
+
+PIPELINE_PREFLIGHT = os.environ.get("PIPELINE_PREFLIGHT", "strict").lower()
 
-EMULATOR_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
-PROJECT_ID    = "demo-project"
+# ── ETL re-run audit config ───────────────────────────────────────────────────
+
+PIPELINE_RERUN = os.environ.get("PIPELINE_RERUN", "off").lower()
+
+# main.py arguments of every pipeline run — part of the ETL cache key
+PIPELINE_ARGS = [
+    "main.py",
+    "--input-dir",    str(FIXTURES_CSV),
+    "--to-firestore",
+    "--firestore-emulator",
+    "--log-level",    "INFO",
+]
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
@@ -52,15 +95,64 @@ def _is_emulator_up(host: str = EMULATOR_HOST, timeout: float = 2.0) -> bool:
 
 
 def _clear_emulator(client: firestore.Client) -> None:
-    """Delete every document in every known collection (for test isolation)."""
-    collections = [
-        "PLProductContent", "PLCategory",
-        "PLVariant", "ProductIndexData", "CategoryRouting",
-        "cacheEntries", "cacheRegions",
-    ]
-    for name in collections:
-        for doc in client.collection(name).stream():
-            doc.reference.delete()
+    """Wipe the emulator (keeping `configuration`) for test isolation — see tests/_reset.py."""
+    reset_firestore(client)
+
+
+def _live_progress(config):
+    """Print progress lines to the terminal even while pytest captures output."""
+    capman = config.pluginmanager.getplugin("capturemanager")
+
+    def emit(message: str) -> None:
+        with capman.global_and_fixture_disabled():
+            print(message, flush=True)
+
+    return emit if capman else print
+
+
+def _run_pipeline(client: firestore.Client, args: list, progress=None, *, clear: bool = True,
+                  log_name: str = None, env_extra: dict = None) -> subprocess.CompletedProcess:
+    """Clear the emulator (unless `clear` is False) and run main.py against this worker's project, streaming its output."""
+    if clear:
+        _clear_emulator(client)
+
+    env = {
+        **os.environ,
+        "FIRESTORE_EMULATOR_HOST": EMULATOR_HOST,
+        "GCLOUD_PROJECT":          PROJECT_ID,
+        "PYTHONUTF8":              "1",   # Force UTF-8 stdout/stderr on Windows (emoji in firestore_loader)
+        **(env_extra or {}),
+    }
+
+    return run_streamed(
+        [str(DATA_LOADER_PYTHON), *args],
+        cwd=DATA_LOADER_DIR,
+        env=env,
+        log_dir=ETL_LOG_DIR / (XDIST_WORKER or "main") / (log_name or ""),
+        timeout=900,  # Transform + load on full fixture can take 10-15 min
+        progress=progress,
+    )
+
+
+# ── xdist grouping ────────────────────────────────────────────────────────────
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Assign xdist groups for `--dist loadgroup`: one group per test class (or module),
+    so module/class-scoped fixtures run once per worker, and a single shared group
+    for the container-backed layers.
+    """
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    tests_dir = Path(__file__).parent
+    for item in items:
+        layer = Path(item.fspath).relative_to(tests_dir).parts[0]
+        if layer in SERVICE_LAYERS:
+            group = "shared-service-project"
+        else:
+            group = item.nodeid.split("[", 1)[0].rsplit("::", 1)[0]
+        item.add_marker(pytest.mark.xdist_group(group))
 
 
 # ── Session-scoped fixtures ───────────────────────────────────────────────────
@@ -83,41 +175,102 @@ def firestore_client(emulator_available):
 
 
 @pytest.fixture(scope="session")
-def pipeline_result(firestore_client):
+def service_firestore_client(emulator_available):
+    """
+    Firestore client on the project the .NET containers read (`demo-project`).
+
+    Identical to `firestore_client` in a serial run; under xdist it ignores the
+    per-worker project so seeded data is visible to IndexingApi / ProductsApi / NavigationApi.
+    """
+    if not emulator_available:
+        pytest.skip("Firestore emulator not running — start it with: make infra-up")
+
+    os.environ["FIRESTORE_EMULATOR_HOST"] = EMULATOR_HOST
+
+    return firestore.Client(project=SERVICE_PROJECT_ID)
+
+
+@pytest.fixture(scope="session")
+def pipeline_result(request, firestore_client):
     """
     Run the ETL pipeline once for the entire test session.
 
-    Clears the emulator before running so tests always start from a known state.
-    Returns the CompletedProcess from the data-loader subprocess.
+    The CSV batch is preflighted first (PIPELINE_PREFLIGHT), so a broken batch fails here
+    in seconds. Clears the emulator before running so tests always start from a known state.
+    Returns the CompletedProcess from the data-loader subprocess — or, on an ETL
+    cache hit, the restored Firestore state and the CompletedProcess recorded when
+    that cache entry was stored. Either way `.summary` holds the parsed EtlSummary.
     """
-    _clear_emulator(firestore_client)
+    if PIPELINE_CACHE not in ("off", "auto", "refresh"):
+        pytest.fail(f"PIPELINE_CACHE must be auto, refresh or off — got '{PIPELINE_CACHE}'")
+    if PIPELINE_PREFLIGHT not in ("strict", "warn", "off"):
+        pytest.fail(f"PIPELINE_PREFLIGHT must be strict, warn or off — got '{PIPELINE_PREFLIGHT}'")
 
-    env = {
-        **os.environ,
-        "FIRESTORE_EMULATOR_HOST": EMULATOR_HOST,
-        "GCLOUD_PROJECT":          PROJECT_ID,
-        "PYTHONUTF8":              "1",   # Force UTF-8 stdout/stderr on Windows (emoji in firestore_loader)
-    }
+    progress = _live_progress(request.config)
 
-    proc = subprocess.run(
-        [
-            str(DATA_LOADER_PYTHON), "main.py",
-            "--input-dir",    str(FIXTURES_CSV),
-            "--to-firestore",
-            "--firestore-emulator",
-            "--log-level",    "INFO",
-        ],
-        cwd=DATA_LOADER_DIR,
-        capture_output=True,
-        text=True,
-        encoding="utf-8",
-        env=env,
-        timeout=900,  # Transform + load on full fixture can take 10-15 min
-    )
+    if PIPELINE_PREFLIGHT != "off":
+        report = preflight(FIXTURES_CSV)
+        progress(str(report))
+        if report.errors and PIPELINE_PREFLIGHT == "strict":
+            pytest.fail(f"CSV preflight failed — ETL not started (PIPELINE_PREFLIGHT=warn to run anyway)\n"
+                        f"{report}", pytrace=False)
+
+    args = PIPELINE_ARGS
+
+    if PIPELINE_CACHE == "off":
+        return _run_pipeline(firestore_client, args, progress)
+
+    key = _etl_cache.cache_key(DATA_LOADER_DIR, FIXTURES_CSV, args)
+    # Under xdist the first worker runs the ETL; the others wait here and restore it
+    with _etl_cache.entry_lock(key):
+        if PIPELINE_CACHE == "auto":
+            cached = _etl_cache.lookup(firestore_client, key)
+            if cached is not None:
+                return cached
+
+        proc = _run_pipeline(firestore_client, args, progress)
+
+        # Only successful runs are worth replaying
+        if proc.returncode == 0:
+            _etl_cache.store(firestore_client, key, proc)
 
     return proc
 
 
+@pytest.fixture(scope="session")
+def pipeline_rerun(request, pipeline_result, firestore_client) -> RewriteAudit:
+    """
+    Run main.py again on the unchanged batch, on top of the first run's state, and audit it.
+
+    The second run counts the Firestore writes it issues (tests/_firestore_writes/);
+    every output document's update_time is read before and after it. The RewriteAudit
+    holds issued writes and rewritten / created / deleted documents per collection and
+    the re-run's timing. It is printed and appended to reports/pipeline/rewrites.json.
+    The second run's output goes to reports/pipeline/<worker>/rerun/.
+    """
+    if PIPELINE_RERUN not in ("on", "off"):
+        pytest.fail(f"PIPELINE_RERUN must be on or off — got '{PIPELINE_RERUN}'")
+    if PIPELINE_RERUN == "off":
+        pytest.skip("ETL re-run audit is opt-in — PIPELINE_RERUN=on (make test-pipeline-rerun)")
+    if pipeline_result.returncode != 0:
+        pytest.skip(f"First ETL run failed (exit {pipeline_result.returncode}) — nothing to re-run on")
+
+    progress = _live_progress(request.config)
+    before = update_times(firestore_client, CollectionIdIndex(firestore_client), PIPELINE_COLLECTIONS)
+    progress(f"[rewrites] re-running main.py on {sum(map(len, before.values())):,} documents")
+    counts_dir = ETL_LOG_DIR / (XDIST_WORKER or "main") / "rerun-writes"
+    proc = _run_pipeline(firestore_client, PIPELINE_ARGS, progress, clear=False, log_name="rerun",
+                         env_extra=write_count_env(counts_dir))
+    if proc.returncode != 0:
+        pytest.fail(f"ETL re-run failed (exit {proc.returncode})\n{proc.summary}", pytrace=False)
+    after = update_times(firestore_client, CollectionIdIndex(firestore_client), PIPELINE_COLLECTIONS)
+
+    audit = RewriteAudit.build(before, after, proc.summary, issued_writes(counts_dir))
+    audit.write()
+    progress(str(audit))
+    return audit
+
+
 # ── Function-scoped fixture for tests that need a clean emulator ──────────────
 
 @pytest.fixture
@@ -0,0 +1,252 @@
+"""
+Sync + indexing contention: sync_product_index.py and the IndexingApi on one queue.
+
+In production the sync rewrites products-index-updates documents (finished reset,
+operation changed, new content_hash) while the IndexingApi drains the same
+collection and marks what it sent as finished. run_contention() reproduces that:
+a bulk seed manifest (tests/sync/_data.py build_manifest, queue records not yet
+indexed) is loaded into the shared project, then the sync subprocess runs while
+GET /v1/indexing/products/initialize is called back to back until the sync exits,
+plus one final call on the settled queue. A failed call is retried after a doubling
+delay; after FAILED_CALLS failures in a row the calls stop and the sync runs alone.
+
+Afterwards the queue is merge-joined against tests/sync/_oracle.py's expected
+state, with the finished flag judged against the WireMock journal instead of
+exactly. A final record is inconsistent when:
+
+  operation        ≠ expected                     — the sync's Delete/Update was overwritten
+  content_hash     ≠ expected on an Update        — the sync's write was lost
+  identifier       ≠ "{BaseSKU}-{Sequence}"
+  finished-unsent  finished=True on a record the sync reset, but no PUT/DELETE for
+                   its identifier reached the ingestion endpoint — the IndexingApi
+                   marked a record it read before the sync's reset as done
+  missing / unexpected
+
+finished=False at the end is consistent (the record waits for the next run). An
+indexer that sent the pre-sync payload and then overwrote the reset is only
+caught when no request for that identifier arrived at all.
+
+The emulator exposes no transaction metrics, so aborts and retries are counted
+from the logs: the sync's own output, and `docker compose logs` of the IndexingApi
+and the emulator since the run started (None when Docker is not reachable).
+
+ContentionReport is appended to reports/indexing/contention.json:
+  [contention] 5,000 docs — 0 inconsistent  (new 1,250  changed 1,250  unchanged 2,000  deleted 500)
+    sync      38.4s   117.2 docs/s  exit 0
+    indexing  14 calls (14 ok)  p50 2.1s  max 6.3s  5,612 sent (PUT 5,112  DELETE 500)  190.4 docs/s
+    aborts    sync 0  indexing-api 2  firestore-emulator 0
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+
+import requests
+from google.cloud import firestore
+
+from tests._etl_log import run_streamed
+from tests._history import append_history
+from tests._id_index import CollectionIdIndex
+from tests._wiremock import INGESTION_URL_PATTERN, JournalView, WireMock
+from tests.sync._oracle import (
+    OracleReport,
+    expected_state,
+    hash_products,
+    merge_join,
+    prior_from_manifest,
+    stream_queue,
+)
+
+INTEGRATION_DIR = Path(__file__).parent.parent.parent
+REPORTS_DIR     = INTEGRATION_DIR / "reports" / "indexing"
+SERVICES        = ("indexing-api", "firestore-emulator")   # docker compose services whose logs are scanned
+MIN_CALLS       = 3       # initialize calls made even if the sync finishes first
+FAILED_CALLS    = 10      # consecutive failed initialize calls before the caller gives up
+RETRY_DELAY     = 0.1     # seconds after a failed call, doubled per consecutive failure
+MAX_RETRY_DELAY = 2.0
+CALL_TIMEOUT    = 300     # seconds per initialize call
+
+# Transaction aborts / retries as logged by the Firestore clients and the emulator
+ABORT_MARKERS = re.compile(
+    r"\bABORTED\b|too much contention|transaction\W.{0,60}\b(?:abort|retr)|\b(?:abort|retr)\w*\W.{0,60}transaction",
+    re.I,
+)
+
+
+# ── Abort counting ────────────────────────────────────────────────────────────
+
+def count_aborts(text: str) -> int:
+    return sum(1 for line in text.splitlines() if ABORT_MARKERS.search(line))
+
+
+def service_aborts(since: str) -> dict:
+    """{service: abort lines in its docker compose logs since `since`}, None per service on failure."""
+    aborts = {}
+    for service in SERVICES:
+        try:
+            logs = subprocess.run(
+                ["docker", "compose", "logs", "--no-color", "--since", since, service],
+                cwd=INTEGRATION_DIR, capture_output=True, text=True, encoding="utf-8",
+                errors="replace", timeout=60,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            aborts[service] = None
+            continue
+        aborts[service] = count_aborts(logs.stdout + logs.stderr) if logs.returncode == 0 else None
+    return aborts
+
+
+# ── WireMock journal ──────────────────────────────────────────────────────────
+
+def sent_identifiers(journal: JournalView) -> set:
+    """Document identifiers (last URL path segment) of the ingestion PUTs and DELETEs in `journal`."""
+    return {request.document for method in ("PUT", "DELETE") for request in journal.where(method=method)}
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class ContentionReport(OracleReport):
+    """Oracle check of the queue after a concurrent sync + indexing run, with both sides' throughput."""
+
+    documents: int = 0                                # seeded queue + ProductIndexData documents
+    sync_seconds: float = None
+    sync_returncode: int = None
+    calls: list = field(default_factory=list)         # [(HTTP status or None, seconds)] per initialize call
+    sent: dict = field(default_factory=dict)          # {method: ingestion requests}
+    aborts: dict = field(default_factory=dict)        # {source: abort / retry log lines, None if unreadable}
+
+    @property
+    def failed_calls(self) -> int:
+        return sum(1 for status, _ in self.calls if status != 200)
+
+    @property
+    def sync_rate(self) -> float:
+        return round(self.expected / self.sync_seconds, 1) if self.sync_seconds else None
+
+    @property
+    def indexing_rate(self) -> float:
+        busy = sum(seconds for _, seconds in self.calls)
+        return round(sum(self.sent.values()) / busy, 1) if busy else None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["mismatches"] = {rule: len(ids) for rule, ids in self.mismatches.items()}
+        return {**data, "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "sync_rate": self.sync_rate, "indexing_rate": self.indexing_rate}
+
+    def write(self, history: Path = REPORTS_DIR / "contention.json") -> None:
+        """Append this run to the history."""
+        append_history(history, self.to_dict())
+
+    def __str__(self) -> str:
+        latencies = [seconds for _, seconds in self.calls]
+        failed = f", {self.failed_calls} failed" if self.failed_calls else ""
+        timing = f"  p50 {statistics.median(latencies):.1f}s  max {max(latencies):.1f}s" if latencies else ""
+        sync = f"{self.sync_seconds:.1f}s   {self.sync_rate} docs/s" if self.sync_seconds else "?"
+        lines = [
+            f"[contention] {self.documents:,} docs — {self.count()} inconsistent  "
+            f"({'  '.join(f'{s} {n:,}' for s, n in self.scenarios.items())})",
+            f"  sync      {sync}  exit {self.sync_returncode}",
+            f"  indexing  {len(self.calls)} calls ({len(self.calls) - self.failed_calls} ok{failed}){timing}  "
+            f"{sum(self.sent.values()):,} sent ({'  '.join(f'{m} {n:,}' for m, n in self.sent.items())})  "
+            f"{self.indexing_rate} docs/s",
+            "  aborts    " + "  ".join(f"{source} {'n/a' if n is None else n}" for source, n in self.aborts.items()),
+        ]
+        body = self.summary()
+        return "\n".join(lines + ([body] if body else []))
+
+
+# ── Consistency ───────────────────────────────────────────────────────────────
+
+def _compare(sent: set, expected: tuple, values: dict, report: ContentionReport) -> None:
+    doc_id, operation, finished, content_hash, identifier = expected
+    if values["operation"] != operation:
+        report.add("operation", doc_id, f"{values['operation']!r} != {operation!r}")
+    elif content_hash is not None and values["content_hash"] != content_hash:
+        report.add("content_hash", doc_id, "sync write lost")
+    if identifier is not None and values["identifier"] != identifier:
+        report.add("identifier", doc_id, f"{values['identifier']!r} != {identifier!r}")
+    if finished is False and values["finished"] is True and values["identifier"] not in sent:
+        report.add("finished-unsent", doc_id, values["identifier"])
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def _initialize(url: str) -> tuple:
+    start = time.perf_counter()
+    try:
+        status = requests.get(url, timeout=CALL_TIMEOUT).status_code
+    except requests.RequestException:
+        status = None
+    return status, round(time.perf_counter() - start, 3)
+
+
+def run_contention(client: firestore.Client, manifest: Path, sync_args, *, cwd, env, log_dir: Path,
+                   indexing_url: str, wiremock_url: str, timeout: float, min_calls: int = MIN_CALLS,
+                   workers: int = None) -> ContentionReport:
+    """
+    Run `sync_args` and initialize calls concurrently on the queue seeded from `manifest`.
+
+    The manifest must already be seeded into an otherwise empty ProductIndexData /
+    products-index-updates of `client`'s project — the one `env` points the sync at.
+    """
+    start = time.perf_counter()
+    prior = prior_from_manifest(manifest)
+    wiremock = WireMock(wiremock_url)
+    wiremock.reset()
+    since = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    outcome = {}
+
+    def sync():
+        try:
+            outcome["proc"] = run_streamed(sync_args, cwd=cwd, env=env, log_dir=log_dir, timeout=timeout)
+        except Exception as exc:     # re-raised on the calling thread
+            outcome["error"] = exc
+
+    runner = threading.Thread(target=sync, name="contention-sync", daemon=True)
+    runner.start()
+    url = f"{indexing_url}/v1/indexing/products/initialize"
+    calls = []
+    failures = 0
+    while (runner.is_alive() or len(calls) < min_calls) and failures < FAILED_CALLS:
+        calls.append(_initialize(url))
+        failures = failures + 1 if calls[-1][0] != 200 else 0
+        if failures:
+            time.sleep(min(RETRY_DELAY * 2 ** (failures - 1), MAX_RETRY_DELAY))
+    runner.join()
+    calls.append(_initialize(url))   # one call on the settled queue
+    if "error" in outcome:
+        raise outcome["error"]
+    proc = outcome["proc"]
+
+    report = ContentionReport(
+        workers=workers or os.cpu_count() or 1,
+        sync_seconds=proc.summary.seconds,
+        sync_returncode=proc.returncode,
+        calls=calls,
+    )
+    report.sent = {method: wiremock.count(method=method, url_pattern=INGESTION_URL_PATTERN)
+                   for method in ("PUT", "DELETE")}
+    sent = sent_identifiers(wiremock.find(url_pattern=INGESTION_URL_PATTERN))
+    report.aborts = {"sync": count_aborts(proc.stdout + proc.stderr), **service_aborts(since)}
+
+    hash_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=report.workers) as pool:
+        hashes = hash_products(client, CollectionIdIndex(client), pool)
+    report.hash_seconds = time.perf_counter() - hash_start
+    report.documents = len(hashes) + len(prior)
+    expected, report.scenarios = expected_state(hashes, prior)
+    del hashes
+    report.expected = len(expected)
+    merge_join(expected, stream_queue(client), report, compare=partial(_compare, sent))
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,221 @@
+"""
+Fault and latency injection for the Sitecore Search ingestion stubs.
+
+fixtures/mocks/sitecore-search/ingestion-{update,delete}.json always answer 200 at
+once. A named profile (fixtures/faults/profiles.json) installs extra mappings for
+the same requests through the WireMock admin API, at a higher priority than the
+file stubs, and removes them again afterwards:
+
+  delay    {"fixed": ms} | {"lognormal": {"median": ms, "sigma": s}} | {"uniform": {"lower": ms, "upper": ms}}
+  dribble  {"chunks": n, "duration": ms} — the response body arrives in n chunks
+  errors   {"429": %, "503": %, "CONNECTION_RESET_BY_PEER": %} — HTTP statuses or WireMock faults
+
+WireMock cannot fail a random share of requests, so errors are a scenario cycle per
+stub: the shortest cycle that hits every percentage exactly, with each kind spread
+evenly over it (20% 429 + 5% 503 → 20 states, four 429s and one 503). Every mapping
+is named "fault:<profile>:<stub>:<outcome>", so the journal shows which outcome
+each request got.
+
+run_fault_profile() seeds nothing itself. It calls initialize on the seeded queue
+under the profile (tests/indexing/_throughput.py run_benchmark, journal tailed) and
+then checks the queue. Finished records must have had a successful ingestion
+request. Records whose ingestion failed must be left finished=False for the next
+run. That next run is made with the profile removed and measured the same way; it
+must finish everything. Each profile run is appended to reports/indexing/faults.json:
+
+  [faults] throttled — 500 docs, 640 ingestion requests (140 retries); injected 429 128, 503 32
+    run       initialize 200 in 14.2s  drain 14.0s  left unfinished 12
+    recovery  initialize 200 in 0.6s  12 → 0 unfinished
+"""
+
+import json
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from google.cloud import firestore
+
+from tests._history import append_history
+from tests._mismatches import MismatchReport
+from tests._wiremock import INGESTION_URL_PATTERN, JournalView, WireMock
+from tests.indexing._throughput import IndexingBenchmark, run_benchmark
+
+INTEGRATION_DIR = Path(__file__).parent.parent.parent
+PROFILES_FILE   = INTEGRATION_DIR / "fixtures" / "faults" / "profiles.json"
+REPORTS_DIR     = INTEGRATION_DIR / "reports" / "indexing"
+STUBS_DIR       = INTEGRATION_DIR / "fixtures" / "mocks" / "sitecore-search"
+STUBS           = ("update", "delete")      # ingestion-<stub>.json
+QUEUE           = "products-index-updates"
+FAULT_PREFIX    = "fault:"
+PRIORITY        = 1                         # file stubs have WireMock's default, 5
+SETTLE_SECONDS  = 10                        # unfinished records are expected — don't wait long for them
+
+
+def load_profiles(path: Path = PROFILES_FILE) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+# ── Mappings ──────────────────────────────────────────────────────────────────
+
+def fault_cycle(errors: dict) -> list:
+    """Outcome per state of the repeating cycle — "ok" or an error kind — with exact percentages."""
+    if not errors:
+        return ["ok"]
+    if sum(errors.values()) > 100:
+        raise ValueError(f"error percentages add up to more than 100: {errors}")
+    length = 100 // math.gcd(100, *errors.values())
+    # Each kind's occurrences evenly over [0, 1); all errors then evenly over the cycle
+    picks = sorted(((j + 0.5) / (percent * length // 100), kind)
+                   for kind, percent in errors.items() for j in range(percent * length // 100))
+    cycle = ["ok"] * length
+    for e, (_, kind) in enumerate(picks):
+        cycle[int((e + 0.5) * length / len(picks))] = kind
+    return cycle
+
+
+def _delays(profile: dict) -> dict:
+    delay, delays = profile.get("delay") or {}, {}
+    if "fixed" in delay:
+        delays["fixedDelayMilliseconds"] = delay["fixed"]
+    for kind in ("lognormal", "uniform"):
+        if kind in delay:
+            delays["delayDistribution"] = {"type": kind, **delay[kind]}
+    if "dribble" in profile:
+        delays["chunkedDribbleDelay"] = {"numberOfChunks": profile["dribble"]["chunks"],
+                                         "totalDuration": profile["dribble"]["duration"]}
+    return delays
+
+
+def _response(kind: str, ok: dict, profile: dict) -> dict:
+    if kind == "ok":
+        return {**ok, **_delays(profile)}
+    if kind.isdigit():
+        return {"status": int(kind), "headers": {"Content-Type": "application/json", "Retry-After": "1"},
+                "jsonBody": {"error": f"injected {kind}"}, **_delays(profile)}
+    return {"fault": kind}
+
+
+def build_mappings(name: str, profile: dict) -> list:
+    """WireMock mappings that put the ingestion stubs under `profile`."""
+    mappings, cycle = [], fault_cycle(profile.get("errors"))
+    for stub in STUBS:
+        base = json.loads((STUBS_DIR / f"ingestion-{stub}.json").read_text(encoding="utf-8"))
+        scenario = f"{FAULT_PREFIX}{name}:{stub}"
+        for i, kind in enumerate(cycle):
+            mapping = {"name": f"{scenario}:{kind}", "priority": PRIORITY, "request": base["request"],
+                       "response": _response(kind, base["response"], profile)}
+            if len(cycle) > 1:
+                mapping.update(scenarioName=scenario,
+                               requiredScenarioState="Started" if i == 0 else f"state-{i}",
+                               newScenarioState="Started" if i == len(cycle) - 1 else f"state-{i + 1}")
+            mappings.append(mapping)
+    return mappings
+
+
+@contextmanager
+def fault_profile(wiremock: WireMock, name: str, profiles: dict = None):
+    """Ingestion stubs under profile `name` for the duration of the block; yields the profile."""
+    profile = (profiles or load_profiles())[name]
+    ids = []
+    try:
+        for mapping in build_mappings(name, profile):
+            ids.append(wiremock.add_mapping(mapping))
+        wiremock.reset_scenarios()
+        yield profile
+    finally:
+        for mapping_id in ids:
+            wiremock.remove_mapping(mapping_id)
+
+
+def outcome(request) -> str:
+    """"ok" or the injected error kind a journal request got."""
+    if request.stub and request.stub.startswith(FAULT_PREFIX):
+        return request.stub.rsplit(":", 1)[-1]
+    return "ok" if request.status is None or request.status < 400 else str(request.status)
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class FaultReport(MismatchReport):
+    """One initialize run under a fault profile, and the recovery run after it."""
+
+    profile: str
+    description: str = ""
+    run: IndexingBenchmark = None
+    requests: int = 0                                 # ingestion requests during the faulty run
+    retries: int = 0                                  # requests beyond the first per document
+    injected: dict = field(default_factory=dict)      # {error kind: requests}
+    left_unfinished: int = 0
+    recovery: IndexingBenchmark = None                # the next run, without faults
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["mismatches"] = {rule: len(ids) for rule, ids in self.mismatches.items()}
+        return {**data, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+    def write(self, history: Path = REPORTS_DIR / "faults.json") -> None:
+        """Append this run to the history."""
+        append_history(history, self.to_dict())
+
+    def __str__(self) -> str:
+        seconds = lambda s: f"{s:.1f}s" if s is not None else "?"
+        injected = ", ".join(f"{kind} {n:,}" for kind, n in self.injected.items()) or "nothing"
+        run = self.run or IndexingBenchmark(0, 0)
+        recovery = self.recovery or IndexingBenchmark(0, 0)
+        lines = [
+            f"[faults] {self.profile} — {run.documents:,} docs, {self.requests:,} ingestion requests "
+            f"({self.retries:,} retries); injected {injected}",
+            f"  run       initialize {run.status} in {seconds(run.call_seconds)}  "
+            f"drain {seconds(run.drain_seconds)}  left unfinished {self.left_unfinished:,}",
+            f"  recovery  initialize {recovery.status} in {seconds(recovery.call_seconds)}  "
+            f"{self.left_unfinished:,} → {recovery.unfinished} unfinished",
+        ]
+        body = self.summary()
+        return "\n".join(lines + ([body] if body else []))
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def _finished(client: firestore.Client) -> dict:
+    """{identifier: finished} of the queue."""
+    return {data.get("identifier"): data.get("finished")
+            for data in (snap.to_dict() for snap in client.collection(QUEUE).select(["identifier", "finished"]).stream())}
+
+
+def run_fault_profile(client: firestore.Client, name: str, documents: int, deletes: int, *,
+                      indexing_url: str, wiremock_url: str, timeout: float) -> FaultReport:
+    """Drain the seeded queue under profile `name`, check what was left, then drain it again without faults."""
+    wiremock, journal = WireMock(wiremock_url), JournalView()
+    with fault_profile(wiremock, name) as profile:
+        run = run_benchmark(client, documents, deletes, indexing_url=indexing_url, wiremock_url=wiremock_url,
+                            timeout=timeout, journal=journal, finish_timeout=SETTLE_SECONDS)
+    report = FaultReport(name, profile.get("description", ""), run)
+
+    attempts, succeeded = {}, set()
+    for request in journal.where(url=INGESTION_URL_PATTERN):
+        attempts[request.document] = attempts.get(request.document, 0) + 1
+        kind = outcome(request)
+        if kind == "ok":
+            succeeded.add(request.document)
+        else:
+            report.injected[kind] = report.injected.get(kind, 0) + 1
+    report.requests = sum(attempts.values())
+    report.retries = report.requests - len(attempts)
+
+    for identifier, finished in _finished(client).items():
+        if finished is False:
+            report.left_unfinished += 1
+            if identifier in succeeded:
+                report.add("unfinished-sent", identifier, "ingested, will be sent again")
+        elif identifier not in succeeded:
+            report.add("finished-unsent", identifier, f"{attempts.get(identifier, 0)} failed attempts")
+
+    report.recovery = run_benchmark(client, documents, deletes, indexing_url=indexing_url,
+                                    wiremock_url=wiremock_url, timeout=timeout, finish_timeout=SETTLE_SECONDS)
+    for identifier, finished in _finished(client).items():
+        if finished is False:
+            report.add("not-recovered", identifier)
+    return report
@@ -0,0 +1,203 @@
+"""
+IndexingApi throughput and effective concurrency, from the WireMock request journal.
+
+build_queue_manifest() generates N unindexed products-index-updates records (the
+fixtures/seeds/indexing.json documents as templates, DELETE_SHARE of them Deletes).
+On that seeded queue, run_benchmark() calls GET /v1/indexing/products/initialize
+once and tails the WireMock journal while the call runs (tests/_wiremock.py), one
+small page per poll. Every serve event carries the time WireMock received the
+request (loggedDate, epoch ms) and how long it took to serve (timing.totalTime),
+so each ingestion request becomes an interval [received, received + totalTime]:
+
+  requests/sec     ingestion requests / (last response − first request)
+  peak in flight   most intervals open at one instant (sweep over the endpoints) —
+                   the IndexingApi's effective concurrency against Sitecore Search
+  drain            trigger → last ingestion response
+
+A background thread counts the records still finished=False (aggregation query,
+every POLL_SECONDS) from the trigger on, until none are left or FINISH_TIMEOUT after
+the call returned; the first zero is the time until every document is marked
+finished — the figure to size the production indexing job with. An error in the
+poller is raised from run_benchmark() once the initialize call has returned.
+
+IndexingBenchmark is appended to reports/indexing/throughput.json:
+  [indexing-bench] 10,000 docs (1,000 Delete) — initialize 200 in 61.2s
+    ingestion  10,000 requests  164.3 req/s  peak 8 in flight  first after 0.4s  drain 61.0s
+    finished   all after 61.4s
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import requests
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from tests._history import append_history
+from tests._seeding import manifest_document
+from tests._wiremock import INGESTION_URL_PATTERN, JournalView, WireMock
+
+INTEGRATION_DIR = Path(__file__).parent.parent.parent
+REPORTS_DIR     = INTEGRATION_DIR / "reports" / "indexing"
+QUEUE           = "products-index-updates"
+FIRST_BASE_SKU  = 2_000_000   # clear of the sync datasets (tests/sync/_data.py)
+DELETE_SHARE    = 0.1
+POLL_SECONDS    = 0.5
+FINISH_TIMEOUT  = 120         # seconds to keep polling once initialize has returned
+
+
+# ── Seed manifest ─────────────────────────────────────────────────────────────
+
+def _template(doc_id: str) -> dict:
+    """A seeded indexing.json record with its base SKU ("IDX") turned into {n}."""
+    text = json.dumps(manifest_document("indexing", QUEUE, doc_id))
+    return json.loads(text.replace("IDX", "{n}"))
+
+
+def queue_split(size: int, delete_share: float = DELETE_SHARE) -> tuple:
+    """(Update records, Delete records) of a `size`-record queue."""
+    deletes = round(size * delete_share)
+    return size - deletes, deletes
+
+
+def build_queue_manifest(size: int, delete_share: float = DELETE_SHARE) -> dict:
+    """`size` unindexed queue records; the last `delete_share` of them operation=Delete."""
+    updates, deletes = queue_split(size, delete_share)
+    return {
+        "options": {"mode": "bulk"},
+        "collections": {QUEUE: {"generate": [
+            {"start": FIRST_BASE_SKU, "count": updates, "id": "{n}_0_de_DE",
+             "template": _template("IDX_0_de_DE")},
+            {"start": FIRST_BASE_SKU + updates, "count": deletes, "id": "{n}_1_de_DE",
+             "template": _template("IDX_1_de_DE")},
+        ]}},
+    }
+
+
+# ── Journal analysis ──────────────────────────────────────────────────────────
+
+def ingestion_intervals(journal: JournalView) -> list:
+    """[(received ms, served ms)] of every ingestion request in `journal`, by receipt."""
+    return sorted((r.logged_ms, r.served_ms if r.served_ms is not None else r.logged_ms)
+                  for r in journal.where(url=INGESTION_URL_PATTERN))
+
+
+def peak_overlap(intervals: list) -> int:
+    """Most intervals open at one instant; one ending exactly when another starts does not overlap it."""
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals],
+                    key=lambda e: (e[0], e[1]))
+    peak = open_ = 0
+    for _, delta in events:
+        open_ += delta
+        peak = max(peak, open_)
+    return peak
+
+
+def unfinished(client: firestore.Client) -> int:
+    query = client.collection(QUEUE).where(filter=FieldFilter("finished", "==", False))
+    return query.count().get()[0][0].value
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class IndexingBenchmark:
+    """One initialize call on `documents` queued records."""
+
+    documents: int
+    deletes: int
+    status: int = None                  # HTTP status of initialize (None: no response)
+    call_seconds: float = None
+    requests: int = 0                   # ingestion requests WireMock received
+    requests_per_sec: float = None
+    peak_in_flight: int = 0
+    first_request: float = None         # seconds after the trigger
+    drain_seconds: float = None         # trigger → last ingestion response
+    finished_seconds: float = None      # trigger → no record left with finished=False
+    unfinished: int = None              # records still unfinished when polling stopped
+    finished_timeline: list = field(default_factory=list)   # [(seconds after trigger, unfinished)]
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+    def write(self, history: Path = REPORTS_DIR / "throughput.json") -> None:
+        """Append this run to the history."""
+        append_history(history, self.to_dict())
+
+    def __str__(self) -> str:
+        seconds = lambda s: f"{s:.1f}s" if s is not None else "?"
+        finished = (f"all after {self.finished_seconds:.1f}s" if self.finished_seconds is not None
+                    else f"{self.unfinished:,} still unfinished" if self.unfinished is not None else "?")
+        return "\n".join([
+            f"[indexing-bench] {self.documents:,} docs ({self.deletes:,} Delete) — "
+            f"initialize {self.status} in {seconds(self.call_seconds)}",
+            f"  ingestion  {self.requests:,} requests  {self.requests_per_sec} req/s  "
+            f"peak {self.peak_in_flight} in flight  first after {seconds(self.first_request)}  "
+            f"drain {seconds(self.drain_seconds)}",
+            f"  finished   {finished}",
+        ])
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def run_benchmark(client: firestore.Client, documents: int, deletes: int, *, indexing_url: str,
+                  wiremock_url: str, timeout: float, journal: JournalView = None,
+                  finish_timeout: float = FINISH_TIMEOUT) -> IndexingBenchmark:
+    """Trigger initialize on the already seeded queue of `client`'s project and measure it.
+
+    The run's serve events are tailed into `journal` if one is given."""
+    result = IndexingBenchmark(documents, deletes)
+    wiremock, journal = WireMock(wiremock_url), journal if journal is not None else JournalView()
+    wiremock.reset()
+
+    called = threading.Event()
+    trigger = time.time()
+    failure = {}
+
+    def watch():
+        try:
+            poll()
+        except Exception as exc:     # re-raised on the calling thread
+            failure["error"] = exc
+
+    def poll():
+        deadline = None
+        while True:
+            left = unfinished(client)
+            result.finished_timeline.append((round(time.time() - trigger, 2), left))
+            wiremock.tail(journal)
+            result.unfinished = left
+            if left == 0:
+                result.finished_seconds = result.finished_timeline[-1][0]
+                return
+            if called.is_set():
+                deadline = deadline or time.time() + finish_timeout
+                if time.time() >= deadline:
+                    return
+            time.sleep(POLL_SECONDS)
+
+    watcher = threading.Thread(target=watch, name="indexing-bench-finished", daemon=True)
+    watcher.start()
+    try:
+        result.status = requests.get(f"{indexing_url}/v1/indexing/products/initialize", timeout=timeout).status_code
+    except requests.RequestException:
+        pass
+    result.call_seconds = round(time.time() - trigger, 3)
+    called.set()
+    watcher.join()
+    if "error" in failure:
+        raise failure["error"]
+
+    intervals = ingestion_intervals(wiremock.tail(journal))
+    result.requests = len(intervals)
+    if intervals:
+        first, last = intervals[0][0], max(end for _, end in intervals)
+        window = (last - first) / 1000
+        result.requests_per_sec = round(len(intervals) / window, 1) if window else None
+        result.peak_in_flight = peak_overlap(intervals)
+        result.first_request = round(first / 1000 - trigger, 3)
+        result.drain_seconds = round(last / 1000 - trigger, 3)
+    return result
@@ -2,11 +2,27 @@
 Layer 4 — Indexing pipeline conftest.
 
 Module-scoped fixture: clears products-index-updates, seeds one Update doc and one
-Delete doc, waits for the IndexingApi, resets the WireMock request journal, triggers
-GET /v1/indexing/products/initialize, then yields (response, wiremock_requests, client).
+Delete doc (fixtures/seeds/indexing.json), waits for the IndexingApi, resets the
+WireMock request journal, triggers GET /v1/indexing/products/initialize, then yields
+(response, journal, client) — journal is a JournalView (tests/_wiremock.py) of the
+ingestion requests, filtered by WireMock.
+
+`contention_result` (opt-in: INDEXING_CONTENTION_DOCS=N, `make test-indexing-contention`)
+seeds N sync-scenario documents with unindexed queue records, then runs
+sync_product_index.py and repeated initialize calls at the same time and checks the
+final queue (tests/indexing/_contention.py).
+
+`indexing_benchmark` (opt-in: INDEXING_BENCH_DOCS="1000 10000 50000", `make
+bench-indexing`) seeds each size of unindexed queue records, calls initialize once
+and measures ingestion rate, effective concurrency, drain time and time until every
+record is finished (tests/indexing/_throughput.py).
+
+`fault_result` (opt-in: INDEXING_FAULT_PROFILES="throttled resets" or "all", `make
+test-indexing-faults`) runs the same drain with the ingestion stubs under a fault
+profile (fixtures/faults/profiles.json), then once more without it
+(tests/indexing/_faults.py).
 """
 
-import base64
 import json
 import os
 import time
@@ -15,6 +31,15 @@ import pytest
 import requests
 from google.cloud import firestore
 
+from tests._env import DATA_LOADER_DIR, DATA_LOADER_PYTHON, SERVICE_PROJECT_ID
+from tests._reset import reset_firestore
+from tests._seeding import seed_manifest
+from tests._wiremock import INGESTION_URL_PATTERN, JournalView, WireMock
+from tests.indexing._contention import REPORTS_DIR, ContentionReport, run_contention
+from tests.indexing._faults import FaultReport, load_profiles, run_fault_profile
+from tests.indexing._throughput import IndexingBenchmark, build_queue_manifest, queue_split, run_benchmark
+from tests.sync._data import build_manifest, scenario_ranges
+
 # ─── Connection constants ─────────────────────────────────────────────────────
 
 FIRESTORE_EMULATOR_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
@@ -23,69 +48,29 @@ WIREMOCK_HOST           = os.environ.get("WIREMOCK_HOST", "localhost:8081")
 
 # ─── Test document IDs ────────────────────────────────────────────────────────
 
+# Document bodies live in fixtures/seeds/indexing.json
 INDEXING_UPDATE_DOC_ID = "IDX_0_de_DE"   # operation=Update
 INDEXING_DELETE_DOC_ID = "IDX_1_de_DE"   # operation=Delete
 
-# ─── Test document data ───────────────────────────────────────────────────────
-
-INDEXING_UPDATE_DOC = {
-    "identifier": "IDX-0",
-    "culture": "de_de",
-    "operation": "Update",
-    "finished": False,
-    "incremental_update_id": None,
-    "status": "unknown",
-    "domain_id": "9175162892",
-    "content_hash": "test-update-content-hash",
-    "data": {
-        "document": {
-            "id": "IDX-0",
-            "locale": "de_de",
-            "fields": {
-                "id": "IDX-0",
-                "base_sku": "IDX",
-                "locale": "de_de",
-                "name": "Test Indexing Product",
-                "is_spa": False,
-                "is_watersystems": False,
-                "is_spare_parts": False,
-                "is_historical": False,
-                "has_3d_files": False,
-                "is_active": True,
-                "online_buy_only": False,
-                "primary_order": 0,
-                "secondary_order": 0,
-                "sku_lookup": ["IDX000001"],
-                "ean_lookup": [],
-                "variant_names": ["Test Indexing Product"],
-                "price_groups": [],
-                "finish_definitions": [
-                    {
-                        "id": 1,
-                        "sku": "IDX000001",
-                        "name": "Alpine White",
-                        "slug": "alpine-white",
-                        "url": "",
-                        "has_3d_files": False,
-                        "online_buy_only": False,
-                        "is_historical": False,
-                    }
-                ],
-            },
-        }
-    },
-}
-
-INDEXING_DELETE_DOC = {
-    "identifier": "IDX-1",
-    "culture": "de_de",
-    "operation": "Delete",
-    "finished": False,
-    "incremental_update_id": None,
-    "status": "unknown",
-    "domain_id": "9175162892",
-    "content_hash": "test-delete-content-hash",
-}
+# ─── Contention mode ──────────────────────────────────────────────────────────
+
+CONTENTION_DOCS     = int(os.environ.get("INDEXING_CONTENTION_DOCS", "0"))   # 0 = skip
+CONTENTION_RATIOS   = (25, 25, 40, 10)   # new / changed / unchanged / deleted
+CONTENTION_DIR      = REPORTS_DIR / "contention"
+CONTENTION_MIN_RATE = 50                # products/sec the sync timeout is sized for
+
+# ─── Throughput benchmark ─────────────────────────────────────────────────────
+
+BENCH_SIZES    = [int(n) for n in os.environ.get("INDEXING_BENCH_DOCS", "").split()]   # empty = skip
+BENCH_DIR      = REPORTS_DIR / "throughput"
+BENCH_MIN_RATE = 20                     # documents/sec the initialize timeout is sized for
+
+# ─── Fault injection ──────────────────────────────────────────────────────────
+
+_profiles      = os.environ.get("INDEXING_FAULT_PROFILES", "").split()
+FAULT_PROFILES = list(load_profiles()) if _profiles == ["all"] else _profiles   # empty = skip
+FAULT_DOCS     = int(os.environ.get("INDEXING_FAULT_DOCS", "500"))
+FAULT_MIN_RATE = 2                      # documents/sec under the slowest profile
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -115,56 +100,45 @@ def _wait_for_indexing_api(timeout: int = 180) -> None:
     )
 
 
-def _decode_wiremock_body(request_entry: dict) -> str:
-    """Extract request body from a WireMock journal entry (handles base64 and plain)."""
-    body = request_entry.get("body", "")
-    if body:
-        return body
-    body_b64 = request_entry.get("bodyAsBase64", "")
-    if body_b64:
-        return base64.b64decode(body_b64).decode("utf-8")
-    return ""
+def _seed_queue(client: firestore.Client, size: int) -> None:
+    """Replace products-index-updates with `size` unindexed records (build_queue_manifest)."""
+    os.environ["FIRESTORE_EMULATOR_HOST"] = FIRESTORE_EMULATOR_HOST
+    reset_firestore(client, ["products-index-updates"])
+
+    manifest = BENCH_DIR / f"manifest-n{size}.json"
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(json.dumps(build_queue_manifest(size), indent=2), encoding="utf-8")
+    seed_manifest(client, manifest)
 
 
 # ─── Fixture ──────────────────────────────────────────────────────────────────
 
 
 @pytest.fixture(scope="module")
-def indexing_result(firestore_client):
+def indexing_result(service_firestore_client):
     """
     Seed products-index-updates, trigger the IndexingApi, and yield results.
 
     Yields:
-        (response, wiremock_requests, firestore_client) where:
+        (response, journal, firestore_client) where:
           - response           — requests.Response from GET /v1/indexing/products/initialize
-          - wiremock_requests  — list of request journal entries from WireMock /__admin/requests
-          - firestore_client   — google.cloud.firestore.Client (connected to emulator)
+          - journal            — JournalView of the Sitecore Search ingestion requests WireMock received
+          - firestore_client   — google.cloud.firestore.Client (emulator, shared `demo-project`)
     """
     os.environ["FIRESTORE_EMULATOR_HOST"] = FIRESTORE_EMULATOR_HOST
 
     # ── Clear products-index-updates ──────────────────────────────────────────
-    col = firestore_client.collection("products-index-updates")
-    batch = firestore_client.batch()
-    batch_count = 0
-    for snap in col.stream():
-        batch.delete(snap.reference)
-        batch_count += 1
-        if batch_count >= 500:
-            batch.commit()
-            batch = firestore_client.batch()
-            batch_count = 0
-    if batch_count:
-        batch.commit()
+    reset_firestore(service_firestore_client, ["products-index-updates"])
 
     # ── Seed controlled documents ─────────────────────────────────────────────
-    col.document(INDEXING_UPDATE_DOC_ID).set(INDEXING_UPDATE_DOC)
-    col.document(INDEXING_DELETE_DOC_ID).set(INDEXING_DELETE_DOC)
+    seed_manifest(service_firestore_client, "indexing")
 
     # ── Wait for IndexingApi to be healthy ────────────────────────────────────
     _wait_for_indexing_api()
 
     # ── Reset WireMock request journal ────────────────────────────────────────
-    requests.delete(f"http://{WIREMOCK_HOST}/__admin/requests", timeout=5)
+    wiremock = WireMock(f"http://{WIREMOCK_HOST}")
+    wiremock.reset()
 
     # ── Trigger the indexing pipeline ─────────────────────────────────────────
     response = requests.get(
@@ -175,8 +149,108 @@ def indexing_result(firestore_client):
     # Small delay to ensure Firestore writes from the API have settled
     time.sleep(1)
 
-    # ── Collect WireMock request journal ──────────────────────────────────────
-    wm_resp = requests.get(f"http://{WIREMOCK_HOST}/__admin/requests", timeout=10)
-    wiremock_requests = wm_resp.json().get("requests", [])
+    # ── Collect the ingestion requests (filtered server-side) ─────────────────
+    journal: JournalView = wiremock.find(url_pattern=INGESTION_URL_PATTERN)
+
+    yield response, journal, service_firestore_client
+
+
+@pytest.fixture(scope="module")
+def contention_result(service_firestore_client) -> ContentionReport:
+    """
+    Run sync_product_index.py and the IndexingApi concurrently on one seeded queue.
+
+    Seeds CONTENTION_DOCS documents (tests/sync/_data.py build_manifest) into the
+    shared project with every queue record still unindexed (finished=False), so the
+    IndexingApi has work from the first call while the sync rewrites the same records.
+    """
+    if not CONTENTION_DOCS:
+        pytest.skip("Contention mode is opt-in — set INDEXING_CONTENTION_DOCS or run make test-indexing-contention")
+
+    os.environ["FIRESTORE_EMULATOR_HOST"] = FIRESTORE_EMULATOR_HOST
+    collections = ["ProductIndexData", "products-index-updates"]
+    reset_firestore(service_firestore_client, collections)
+
+    manifest = CONTENTION_DIR / "manifest.json"
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    ranges = scenario_ranges(CONTENTION_DOCS, CONTENTION_RATIOS)
+    manifest.write_text(json.dumps(build_manifest(ranges, finished=False), indent=2), encoding="utf-8")
+    seed_manifest(service_firestore_client, manifest)
+
+    _wait_for_indexing_api()
+
+    env = {
+        **os.environ,
+        "FIRESTORE_EMULATOR_HOST": FIRESTORE_EMULATOR_HOST,
+        "GCLOUD_PROJECT":          SERVICE_PROJECT_ID,
+        "PYTHONUTF8":              "1",
+    }
+    report = run_contention(
+        service_firestore_client, manifest,
+        [DATA_LOADER_PYTHON, "sync_product_index.py",
+         "--use-emulator",
+         "--sync-database", "(default)",
+         "--log-level", "INFO"],
+        cwd=DATA_LOADER_DIR, env=env, log_dir=CONTENTION_DIR,
+        indexing_url=f"http://{INDEXING_API_HOST}", wiremock_url=f"http://{WIREMOCK_HOST}",
+        timeout=max(600, CONTENTION_DOCS / CONTENTION_MIN_RATE),
+    )
+    report.write()
+    print(report, flush=True)
+
+    yield report
+
+    reset_firestore(service_firestore_client, collections)
+
+
+@pytest.fixture(scope="module", params=BENCH_SIZES or [0], ids=lambda n: f"n{n}")
+def indexing_benchmark(request, service_firestore_client) -> IndexingBenchmark:
+    """
+    Seed `request.param` unindexed queue records, call initialize once, measure the drain.
+
+    Parametrized by INDEXING_BENCH_DOCS, so one session records every size.
+    """
+    size = request.param
+    if not size:
+        pytest.skip("Indexing benchmark is opt-in — set INDEXING_BENCH_DOCS or run make bench-indexing")
+
+    _seed_queue(service_firestore_client, size)
+    _wait_for_indexing_api()
+
+    result = run_benchmark(
+        service_firestore_client, size, queue_split(size)[1],
+        indexing_url=f"http://{INDEXING_API_HOST}", wiremock_url=f"http://{WIREMOCK_HOST}",
+        timeout=max(120, size / BENCH_MIN_RATE),
+    )
+    result.write()
+    print(result, flush=True)
+
+    yield result
+
+    reset_firestore(service_firestore_client, ["products-index-updates"])
+
+
+@pytest.fixture(scope="module", params=FAULT_PROFILES or [None], ids=str)
+def fault_result(request, service_firestore_client) -> FaultReport:
+    """
+    Drain FAULT_DOCS seeded queue records with the ingestion stubs under profile
+    `request.param`, then again without faults. Parametrized by INDEXING_FAULT_PROFILES.
+    """
+    name = request.param
+    if not name:
+        pytest.skip("Fault injection is opt-in — set INDEXING_FAULT_PROFILES or run make test-indexing-faults")
+
+    _seed_queue(service_firestore_client, FAULT_DOCS)
+    _wait_for_indexing_api()
+
+    report = run_fault_profile(
+        service_firestore_client, name, FAULT_DOCS, queue_split(FAULT_DOCS)[1],
+        indexing_url=f"http://{INDEXING_API_HOST}", wiremock_url=f"http://{WIREMOCK_HOST}",
+        timeout=max(120, FAULT_DOCS / FAULT_MIN_RATE),
+    )
+    report.write()
+    print(report, flush=True)
+
+    yield report
 
-    yield response, wiremock_requests, firestore_client
+    reset_firestore(service_firestore_client, ["products-index-updates"])
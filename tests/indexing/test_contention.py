@@ -0,0 +1,40 @@
+"""
+Layer 4 — sync_product_index.py and the IndexingApi on the same queue at once.
+
+Opt-in: INDEXING_CONTENTION_DOCS=N (`make test-indexing-contention`). The
+module-scoped `contention_result` fixture seeds N documents of the four sync
+scenarios with unindexed queue records, runs the sync while calling
+GET /v1/indexing/products/initialize back to back, and checks the final queue
+against the sync oracle (tests/indexing/_contention.py).
+"""
+
+import pytest
+
+
+@pytest.mark.indexing
+class TestSyncIndexingContention:
+    """Neither side may lose the other's writes while both work on products-index-updates."""
+
+    def test_sync_succeeds_under_concurrent_indexing(self, contention_result):
+        assert contention_result.sync_returncode == 0, str(contention_result)
+
+    def test_initialize_calls_succeed_during_sync(self, contention_result):
+        assert contention_result.failed_calls == 0, (
+            f"{contention_result.failed_calls} initialize call(s) failed: "
+            f"{[status for status, _ in contention_result.calls if status != 200]}"
+        )
+
+    def test_no_sync_write_is_lost(self, contention_result):
+        """Every record keeps the operation and content_hash the sync wrote."""
+        lost = contention_result.count("operation") + contention_result.count("content_hash")
+        assert lost == 0, (
+            f"{lost} sync write(s) overwritten by the IndexingApi:\n"
+            f"{contention_result.summary('operation')}\n{contention_result.summary('content_hash')}"
+        )
+
+    def test_no_record_finished_without_being_sent(self, contention_result):
+        """A record the sync reset is only finished once its identifier reached the ingestion API."""
+        assert contention_result.count("finished-unsent") == 0, contention_result.summary("finished-unsent")
+
+    def test_queue_matches_oracle(self, contention_result):
+        assert contention_result.count() == 0, f"Inconsistent queue after contention:\n{contention_result}"
@@ -0,0 +1,35 @@
+"""
+Layer 4 — IndexingApi against a slow, throttling or failing Sitecore Search.
+
+Opt-in: INDEXING_FAULT_PROFILES="throttled resets" or "all" (`make
+test-indexing-faults`). For each profile of fixtures/faults/profiles.json the
+`fault_result` fixture seeds INDEXING_FAULT_DOCS queue records, drains them with the
+ingestion stubs under that profile, and drains again without it
+(tests/indexing/_faults.py). Drain time, retries and injected errors per profile
+are appended to reports/indexing/faults.json.
+"""
+
+import pytest
+
+
+@pytest.mark.indexing
+class TestIngestionFaults:
+    """Upstream faults may slow the IndexingApi down, but never lose a document."""
+
+    def test_initialize_responds_under_faults(self, fault_result):
+        assert fault_result.run.status is not None, (
+            f"initialize did not respond within the timeout under '{fault_result.profile}'\n{fault_result}"
+        )
+
+    def test_no_record_finished_without_successful_ingestion(self, fault_result):
+        """A record whose every ingestion attempt failed stays finished=False for the next run."""
+        assert fault_result.count("finished-unsent") == 0, (
+            f"Records marked finished although Sitecore Search never accepted them:\n"
+            f"{fault_result.summary('finished-unsent')}"
+        )
+
+    def test_next_run_finishes_what_was_left(self, fault_result):
+        assert fault_result.count("not-recovered") == 0, (
+            f"{fault_result.left_unfinished} records were left unfinished; the run without faults did not "
+            f"finish them all:\n{fault_result.summary('not-recovered')}"
+        )
@@ -11,30 +11,17 @@ at localhost:8082. WireMock stubs in fixtures/mocks/sitecore-search/ capture ing
 calls so tests can assert the exact requests sent to Sitecore Search.
 
 Trigger endpoint: GET /v1/indexing/products/initialize
-WireMock journal:  GET http://localhost:8081/__admin/requests
+WireMock journal:  POST http://localhost:8081/__admin/requests/find (tests/_wiremock.py)
 """
 
-import json
-
 import pytest
 
 from tests.indexing.conftest import (
     INDEXING_DELETE_DOC_ID,
     INDEXING_UPDATE_DOC_ID,
-    _decode_wiremock_body,
 )
 
 
-def _put_requests(wiremock_requests: list) -> list:
-    """Filter WireMock journal to PUT requests (Sitecore Search Update)."""
-    return [r for r in wiremock_requests if r["request"]["method"] == "PUT"]
-
-
-def _delete_requests(wiremock_requests: list) -> list:
-    """Filter WireMock journal to DELETE requests (Sitecore Search Delete)."""
-    return [r for r in wiremock_requests if r["request"]["method"] == "DELETE"]
-
-
 @pytest.mark.indexing
 class TestIndexingPipeline:
     """
@@ -46,7 +33,7 @@ class TestIndexingPipeline:
       - Waits for the IndexingApi /health endpoint
       - Resets the WireMock request journal
       - Calls GET /v1/indexing/products/initialize
-      - Yields (response, wiremock_requests, firestore_client)
+      - Yields (response, journal, firestore_client); journal is an indexed JournalView
     """
 
     def test_full_product_indexing_pipeline_sends_correct_payload(self, indexing_result):
@@ -54,15 +41,13 @@ class TestIndexingPipeline:
         GET /v1/indexing/products/initialize returns HTTP 200 and WireMock received
         at least one PUT request to the Sitecore Search Ingestion endpoint.
         """
-        response, wiremock_requests, client = indexing_result
+        response, journal, client = indexing_result
         assert response.status_code == 200, (
             f"IndexingApi returned {response.status_code}: {response.text[:500]}"
         )
-        put_reqs = _put_requests(wiremock_requests)
-        all_methods = [r["request"]["method"] for r in wiremock_requests]
-        assert len(put_reqs) >= 1, (
+        assert journal.count(method="PUT") >= 1, (
             f"Expected at least 1 PUT request to Sitecore Search Ingestion. "
-            f"WireMock received: {all_methods}"
+            f"WireMock received: {journal.methods()}"
         )
 
     def test_deleted_product_sends_delete_operation_to_sitecore(self, indexing_result):
@@ -70,12 +55,10 @@ class TestIndexingPipeline:
         A product queued as operation=Delete (IDX_1_de_DE) triggers a DELETE request
         to the Sitecore Search Ingestion API.
         """
-        response, wiremock_requests, client = indexing_result
-        delete_reqs = _delete_requests(wiremock_requests)
-        all_methods = [r["request"]["method"] for r in wiremock_requests]
-        assert len(delete_reqs) >= 1, (
+        response, journal, client = indexing_result
+        assert journal.count(method="DELETE") >= 1, (
             f"Expected at least 1 DELETE request to Sitecore Search Ingestion. "
-            f"WireMock received: {all_methods}"
+            f"WireMock received: {journal.methods()}"
         )
 
     def test_updated_product_sends_update_with_correct_fields(self, indexing_result):
@@ -83,22 +66,17 @@ class TestIndexingPipeline:
         The PUT payload for the Updated product contains the document fields seeded
         in Firestore — specifically the 'name' field must match.
         """
-        response, wiremock_requests, client = indexing_result
-        put_reqs = _put_requests(wiremock_requests)
+        response, journal, client = indexing_result
+        put_reqs = journal.where(method="PUT")
         assert len(put_reqs) >= 1, "No PUT request found in WireMock journal"
+        assert put_reqs[0].body, "PUT request body is empty"
 
-        body_str = _decode_wiremock_body(put_reqs[0]["request"])
-        assert body_str, "PUT request body is empty"
-
-        payload = json.loads(body_str)
-        doc = payload.get("document", {})
-        fields = doc.get("fields", {})
-
+        fields = put_reqs[0].get("document.fields", {})
         assert "name" in fields, (
             f"'name' field missing from Sitecore Search payload. "
             f"Available fields: {sorted(fields.keys())}"
         )
-        assert fields["name"] == "Test Indexing Product", (
+        assert put_reqs[0].get("document.fields.name") == "Test Indexing Product", (
             f"Expected name='Test Indexing Product', got: {fields['name']}"
         )
 
@@ -107,15 +85,11 @@ class TestIndexingPipeline:
         finish_definitions must appear in the PUT payload so Sitecore Search can
         filter products by finish/colour. Asserts the array is non-empty.
         """
-        response, wiremock_requests, client = indexing_result
-        put_reqs = _put_requests(wiremock_requests)
+        response, journal, client = indexing_result
+        put_reqs = journal.where(method="PUT")
         assert len(put_reqs) >= 1, "No PUT request found in WireMock journal"
 
-        body_str = _decode_wiremock_body(put_reqs[0]["request"])
-        payload = json.loads(body_str)
-        doc = payload.get("document", {})
-        fields = doc.get("fields", {})
-
+        fields = put_reqs[0].get("document.fields", {})
         assert "finish_definitions" in fields, (
             f"'finish_definitions' missing from Sitecore Search payload. "
             f"Available fields: {sorted(fields.keys())}"
@@ -129,11 +103,11 @@ class TestIndexingPipeline:
         The locale query parameter in the Sitecore Search PUT URL must match
         the document's culture (de_de).
         """
-        response, wiremock_requests, client = indexing_result
-        put_reqs = _put_requests(wiremock_requests)
+        response, journal, client = indexing_result
+        put_reqs = journal.where(method="PUT")
         assert len(put_reqs) >= 1, "No PUT request found in WireMock journal"
 
-        url = put_reqs[0]["request"]["url"]
+        url = put_reqs[0].url
         assert "locale=de_de" in url, (
             f"Expected 'locale=de_de' in PUT URL, got: {url}"
         )
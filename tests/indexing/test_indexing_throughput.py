@@ -0,0 +1,31 @@
+"""
+Layer 4 — IndexingApi throughput benchmark.
+
+Opt-in: INDEXING_BENCH_DOCS="1000 10000 50000" (`make bench-indexing`). For each
+size the `indexing_benchmark` fixture seeds that many unindexed queue records, calls
+GET /v1/indexing/products/initialize once and derives requests/sec, peak in-flight
+requests and drain time from the WireMock journal (tests/indexing/_throughput.py).
+Results are appended to reports/indexing/throughput.json; the assertions only check
+that the run drained the whole queue, so the numbers are comparable.
+"""
+
+import pytest
+
+
+@pytest.mark.indexing
+class TestIndexingThroughput:
+    """One initialize call drains the seeded queue completely."""
+
+    def test_initialize_succeeds(self, indexing_benchmark):
+        assert indexing_benchmark.status == 200, str(indexing_benchmark)
+
+    def test_every_record_reaches_ingestion(self, indexing_benchmark):
+        assert indexing_benchmark.requests == indexing_benchmark.documents, (
+            f"{indexing_benchmark.requests} ingestion requests for {indexing_benchmark.documents} queued records\n"
+            f"{indexing_benchmark}"
+        )
+
+    def test_every_record_is_finished(self, indexing_benchmark):
+        assert indexing_benchmark.finished_seconds is not None, (
+            f"{indexing_benchmark.unfinished} records still finished=False\n{indexing_benchmark}"
+        )
@@ -0,0 +1,119 @@
+"""
+Fixtures shared by the Layer 1 pipeline assertions.
+
+`etl_summary` — the parsed data-loader run (tests/_etl_log.py EtlSummary): stage
+timings, completion / verification flags, CSV files and collections mentioned,
+critical lines and the last output lines. Assertion messages print it instead of
+the full stdout.
+
+`collection_ids` — session-scoped CollectionIdIndex over the post-ETL state. Every
+ID-based assertion (existence, ID format, known-SKU matches, failure-message samples)
+reads from it, so each collection's IDs cross the wire once per session, keys-only.
+
+`validation_report` — session-scoped full-collection scan: every document of every
+output collection checked against the invariant registry in tests/_validation.py.
+
+`size_profiles` — session-scoped Firestore storage-size profiles (tests/_docsize.py)
+of the two large collections; also written to reports/doc_sizes.json.
+
+`locale_report` — session-scoped per-locale document counts and the throughput of
+the run (tests/_locales.py), read from `collection_ids`. The locales are those of
+the batch under test (batch_locales), read when the fixture is first requested
+rather than at import, so runs that skip the locale tests never scan the CSVs. The
+report is appended to reports/pipeline/locales.json.
+
+`fixture_store` — the batch's input products, tags and categories in indexed SQLite
+tables (tests/_reconcile.py), loaded once per session without the emulator.
+`reconciliation` joins it against PLProductContent / ProductIndexData: every input
+SKU is checked, and mismatches are grouped by rule.
+
+`golden_diff` — the run's output against the golden file of the batch
+(tests/_golden.py, fixtures/golden/<batch>.json.gz): per-document hashes and
+per-collection Merkle trees, narrowed to the changed documents with field-level
+deltas. With PIPELINE_GOLDEN=update (`make golden-update`) the golden file is
+rewritten from this run instead.
+"""
+
+import os
+
+import pytest
+
+from tests._docsize import SIZE_PROFILED_COLLECTIONS, profile_collections
+from tests._env import FIXTURES_CSV
+from tests._etl_cache import fixtures_fingerprint
+from tests._etl_log import EtlSummary
+from tests._golden import GOLDEN_DIR, GoldenDiff, diff_golden, fingerprint_collections, load_golden, save_golden
+from tests._id_index import CollectionIdIndex
+from tests._locales import LocaleReport, batch_locales
+from tests._reconcile import FixtureStore, ReconciliationReport, reconcile
+from tests._snapshot import PIPELINE_COLLECTIONS
+from tests._validation import ValidationReport, validate_collections
+
+PIPELINE_GOLDEN           = os.environ.get("PIPELINE_GOLDEN", "compare").lower()   # compare | update
+GOLDEN_FILE               = GOLDEN_DIR / f"{FIXTURES_CSV.name}.json.gz"
+
+
+@pytest.fixture(scope="session")
+def etl_summary(pipeline_result) -> EtlSummary:
+    """Parsed summary of the session's data-loader run (or of the cached run it restored)."""
+    return pipeline_result.summary
+
+
+@pytest.fixture(scope="session")
+def collection_ids(pipeline_result, firestore_client) -> CollectionIdIndex:
+    """Keys-only ID index of every pipeline output collection (built after the ETL run)."""
+    index = CollectionIdIndex(firestore_client)
+    index.prefetch(PIPELINE_COLLECTIONS)
+    return index
+
+
+@pytest.fixture(scope="session")
+def validation_report(collection_ids, firestore_client) -> ValidationReport:
+    """One partitioned parallel scan of every pipeline document against tests/_validation.py."""
+    return validate_collections(firestore_client, collection_ids, PIPELINE_COLLECTIONS)
+
+
+@pytest.fixture(scope="session")
+def size_profiles(collection_ids, firestore_client) -> dict:
+    """{collection: SizeProfile} for every PLProductContent / ProductIndexData document."""
+    return profile_collections(firestore_client, collection_ids, SIZE_PROFILED_COLLECTIONS)
+
+
+@pytest.fixture(scope="session")
+def locale_report(etl_summary, collection_ids) -> LocaleReport:
+    """Documents per locale and collection, with the run's throughput; appended to reports/pipeline/locales.json."""
+    report = LocaleReport.build(batch_locales(FIXTURES_CSV), etl_summary, collection_ids, PIPELINE_COLLECTIONS)
+    report.write()
+    print(report, flush=True)
+    return report
+
+
+@pytest.fixture(scope="session")
+def fixture_store() -> FixtureStore:
+    """Input products of FIXTURES_CSV, indexed by SKU, base SKU and locale."""
+    return FixtureStore(FIXTURES_CSV)
+
+
+@pytest.fixture(scope="session")
+def reconciliation(fixture_store, collection_ids, firestore_client) -> ReconciliationReport:
+    """Every input SKU joined against the ETL output; mismatches grouped by rule of RULES."""
+    report = reconcile(fixture_store, firestore_client, collection_ids)
+    print(report, flush=True)
+    return report
+
+
+@pytest.fixture(scope="session")
+def golden_diff(collection_ids, firestore_client) -> GoldenDiff:
+    """Documents changed since the golden file; the golden file is rewritten instead under PIPELINE_GOLDEN=update."""
+    batch = fixtures_fingerprint(FIXTURES_CSV)
+    if PIPELINE_GOLDEN == "update":
+        save_golden(GOLDEN_FILE, fingerprint_collections(firestore_client, collection_ids, PIPELINE_COLLECTIONS), batch)
+        pytest.skip(f"Golden file written: {GOLDEN_FILE}")
+    if not GOLDEN_FILE.exists():
+        pytest.skip(f"No golden file {GOLDEN_FILE.name} — create it with `make golden-update`")
+    golden, recorded = load_golden(GOLDEN_FILE)
+    if recorded != batch:
+        pytest.skip(f"{GOLDEN_FILE.name} was recorded from a different {FIXTURES_CSV.name} batch — `make golden-update`")
+    diff = diff_golden(firestore_client, collection_ids, golden, f"golden/{GOLDEN_FILE.name}")
+    print(diff, flush=True)
+    return diff
@@ -23,68 +23,63 @@ KNOWN_SKUS = ["66838000", "40806000"]
 KNOWN_PRODUCT_INDEX_IDS = ["66838_0_de_DE", "40806_0_de_DE"]
 
 
-# ── Helper ────────────────────────────────────────────────────────────────────
-
-def collection_doc_ids(client, collection_name: str) -> set:
-    return {doc.id for doc in client.collection(collection_name).stream()}
-
-
 # ── Tests ─────────────────────────────────────────────────────────────────────
+# ID lookups are answered from the session-scoped `collection_ids` index
+# (tests/pipeline/conftest.py) — each collection is listed once, keys-only.
 
 class TestCollectionsPopulated:
 
-    def test_pl_product_content_is_populated(self, pipeline_result, firestore_client):
-        ids = collection_doc_ids(firestore_client, "PLProductContent")
+    def test_pl_product_content_is_populated(self, collection_ids):
+        ids = collection_ids.ids("PLProductContent")
         assert len(ids) > 0, "PLProductContent should not be empty after pipeline run"
 
-    def test_pl_category_is_populated(self, pipeline_result, firestore_client):
-        ids = collection_doc_ids(firestore_client, "PLCategory")
+    def test_pl_category_is_populated(self, collection_ids):
+        ids = collection_ids.ids("PLCategory")
         assert len(ids) > 0, "PLCategory should not be empty after pipeline run"
 
-    def test_pl_variant_is_populated(self, pipeline_result, firestore_client):
-        ids = collection_doc_ids(firestore_client, "PLVariant")
+    def test_pl_variant_is_populated(self, collection_ids):
+        ids = collection_ids.ids("PLVariant")
         assert len(ids) > 0, "PLVariant should not be empty after pipeline run"
 
-    def test_product_index_data_is_populated(self, pipeline_result, firestore_client):
-        ids = collection_doc_ids(firestore_client, "ProductIndexData")
+    def test_product_index_data_is_populated(self, collection_ids):
+        ids = collection_ids.ids("ProductIndexData")
         assert len(ids) > 0, "ProductIndexData should not be empty after pipeline run"
 
-    def test_category_routing_is_populated(self, pipeline_result, firestore_client):
-        ids = collection_doc_ids(firestore_client, "CategoryRouting")
+    def test_category_routing_is_populated(self, collection_ids):
+        ids = collection_ids.ids("CategoryRouting")
         assert len(ids) > 0, "CategoryRouting should not be empty after pipeline run"
 
 
 class TestDocumentIds:
 
     @pytest.mark.parametrize("sku", KNOWN_SKUS)
-    def test_pl_product_content_document_exists_for_known_sku(self, pipeline_result, firestore_client, sku):
+    def test_pl_product_content_document_exists_for_known_sku(self, collection_ids, sku):
         doc_id = f"{sku}_{LOCALE}"
-        doc = firestore_client.collection("PLProductContent").document(doc_id).get()
-        assert doc.exists, (
+        assert collection_ids.contains("PLProductContent", doc_id), (
             f"Expected document '{doc_id}' in PLProductContent.\n"
-            f"Existing IDs (first 10): {list(collection_doc_ids(firestore_client, 'PLProductContent'))[:10]}"
+            f"Existing IDs (first 10): {collection_ids.sample('PLProductContent')}"
         )
 
     @pytest.mark.parametrize("index_id", KNOWN_PRODUCT_INDEX_IDS)
-    def test_product_index_data_document_exists(self, pipeline_result, firestore_client, index_id):
-        doc = firestore_client.collection("ProductIndexData").document(index_id).get()
-        assert doc.exists, (
+    def test_product_index_data_document_exists(self, collection_ids, index_id):
+        assert collection_ids.contains("ProductIndexData", index_id), (
             f"Expected document '{index_id}' in ProductIndexData.\n"
-            f"Existing IDs (first 10): {list(collection_doc_ids(firestore_client, 'ProductIndexData'))[:10]}"
+            f"Existing IDs (first 10): {collection_ids.sample('ProductIndexData')}"
         )
 
     @pytest.mark.parametrize("sku", KNOWN_SKUS)
-    def test_pl_product_content_id_format_is_sku_locale(self, pipeline_result, firestore_client, sku):
+    def test_pl_product_content_id_format_is_sku_locale(self, collection_ids, sku):
         """Document IDs must follow the {SKU}_{language}_{market} pattern."""
         doc_id = f"{sku}_{LOCALE}"
-        doc = firestore_client.collection("PLProductContent").document(doc_id).get()
-        assert doc.exists, f"Document ID format check failed — '{doc_id}' not found"
+        assert collection_ids.contains("PLProductContent", doc_id), (
+            f"Document ID format check failed — '{doc_id}' not found"
+        )
 
-    def test_pl_category_ids_contain_locale(self, pipeline_result, firestore_client):
+    def test_pl_category_ids_contain_locale(self, collection_ids):
         """Category document IDs should contain the language/market."""
-        ids = collection_doc_ids(firestore_client, "PLCategory")
+        ids = collection_ids.ids("PLCategory")
         locale_ids = [i for i in ids if LANGUAGE in i or MARKET in i]
         assert len(locale_ids) > 0, (
             f"No PLCategory documents contained language '{LANGUAGE}' or market '{MARKET}' in their ID.\n"
-            f"Sample IDs: {list(ids)[:10]}"
+            f"Sample IDs: {collection_ids.sample('PLCategory')}"
         )
@@ -0,0 +1,31 @@
+"""
+Document size tests — Firestore storage size (tests/_docsize.py) of every
+PLProductContent and ProductIndexData document, not a json.dumps estimate.
+
+Failures show the largest documents and which fields carry their bytes, so a
+product creeping toward the 1 MiB limit is caught here instead of as a failed
+production write. The full profile is written to reports/doc_sizes.json.
+"""
+
+import pytest
+
+from tests._docsize import FIRESTORE_MAX_DOC_BYTES, SIZE_PROFILED_COLLECTIONS
+
+
+pytestmark = [pytest.mark.pipeline, pytest.mark.requires_emulator]
+
+SAFETY_LIMIT = 900_000   # bytes — headroom below FIRESTORE_MAX_DOC_BYTES
+
+
+@pytest.mark.parametrize("collection", SIZE_PROFILED_COLLECTIONS)
+class TestDocumentSizes:
+
+    def test_every_document_was_sized(self, size_profiles, collection_ids, collection):
+        assert size_profiles[collection].count == len(collection_ids.ids(collection))
+
+    def test_largest_document_below_safety_limit(self, size_profiles, collection):
+        profile = size_profiles[collection]
+        assert profile.max < SAFETY_LIMIT, (
+            f"{collection}: largest document is {profile.max} bytes "
+            f"(safety limit {SAFETY_LIMIT}, Firestore max {FIRESTORE_MAX_DOC_BYTES})\n{profile}"
+        )
@@ -7,6 +7,8 @@ Assertions are based on the known content of fixtures/csv/ (de/DE batch).
 
 import pytest
 
+from tests._docsize import document_size
+
 
 pytestmark = [pytest.mark.pipeline, pytest.mark.requires_emulator]
 
@@ -82,10 +84,9 @@ class TestPLProductContentStructure:
         assert self._doc["DocumentID"] == f"{self.SKU}_{LOCALE}"
 
     def test_document_not_oversized(self):
-        import json
-        size = len(json.dumps(self._doc).encode("utf-8"))
+        size = document_size("PLProductContent", f"{self.SKU}_{LOCALE}", self._doc)
         assert size < 900_000, (
-            f"Document {self.SKU}_{LOCALE} is {size} bytes — "
+            f"Document {self.SKU}_{LOCALE} is {size} bytes (Firestore storage size) — "
             f"exceeds the 900KB safety limit (Firestore max: 1MB)"
         )
 
@@ -187,11 +188,11 @@ class TestPLVariantStructure:
                 f"Fields: {list(data.keys())}"
             )
 
-    def test_variant_ids_contain_known_sku(self, pipeline_result, firestore_client):
-        ids = {doc.id for doc in firestore_client.collection("PLVariant").stream()}
+    def test_variant_ids_contain_known_sku(self, collection_ids):
+        ids = collection_ids.ids("PLVariant")
         # At least one variant doc should reference a known SKU
         known_skus = ["66838000", "40806000"]
         matches = [i for i in ids if any(sku in i for sku in known_skus)]
         assert len(matches) > 0, (
-            f"No PLVariant documents matched known SKUs. Sample IDs: {list(ids)[:10]}"
+            f"No PLVariant documents matched known SKUs. Sample IDs: {collection_ids.sample('PLVariant')}"
         )
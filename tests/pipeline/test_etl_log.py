@@ -0,0 +1,80 @@
+"""
+StageParser unit tests — stage and outcome extraction from recorded data-loader
+lines (tests/_etl_log.py). No emulator, no ETL run.
+"""
+
+import pytest
+
+from tests._etl_log import StageParser, parse_output
+
+
+pytestmark = pytest.mark.pipeline
+
+SAMPLE_LINES = (
+    (0.0, "Extracting 5_tag.csv ..."),
+    (1.0, "  12,345 rows read from 5_tag.csv"),
+    (2.0, "Extracting A_product_category_index.csv ..."),
+    (2.5, "Extracting H_product_data_specification_index.csv ..."),
+    (3.0, "Transforming 1,234 products"),
+    (5.0, "Uploading PLProductContent batch 1/3"),
+    (6.5, "Verification passed for PLProductContent"),
+    (7.0, "ETL PIPELINE COMPLETED SUCCESSFULLY"),
+)
+
+
+@pytest.fixture
+def summary():
+    parser = StageParser()
+    for t, line in SAMPLE_LINES:
+        parser.feed(line, t)
+    return parser.finish(0, 7.5)
+
+
+class TestStageParser:
+
+    def test_every_csv_file_is_listed(self, summary):
+        assert summary.files == [
+            "5_tag.csv", "A_product_category_index.csv", "H_product_data_specification_index.csv",
+        ]
+
+    def test_index_files_get_extract_stages(self, summary):
+        assert summary.stage("extract:A_product_category_index.csv") is not None
+        assert summary.stage("extract:H_product_data_specification_index.csv") is not None
+
+    def test_stage_runs_until_the_next_stage_starts(self, summary):
+        assert summary.stage("extract:5_tag.csv")["seconds"] == 2.0
+        assert summary.stage("extract:5_tag.csv")["lines"] == 2
+        assert summary.stage("transform")["seconds"] == 2.0
+        assert summary.stage("load:PLProductContent")["seconds"] == 1.5
+
+    def test_verification_line_is_not_a_load(self, summary):
+        assert [s["name"] for s in summary.stages][-2:] == ["load:PLProductContent", "verify"]
+
+    def test_outcome_flags_and_counts(self, summary):
+        assert summary.completed and summary.verification_passed
+        assert summary.records == 12_345
+        assert summary.products == 1_234
+        assert summary.collections == ["PLProductContent"]
+
+    def test_stderr_does_not_set_outcome_flags(self):
+        parser = StageParser()
+        parser.feed("Extracting 5_tag.csv ...", 0.0)
+        for line in ("Verification passed for PLCategory", "ETL PIPELINE COMPLETED SUCCESSFULLY",
+                     "Extracting 1_product_data.csv ..."):
+            parser.feed(line, 1.0, "stderr")
+        summary = parser.finish(1, 2.0)
+        assert not summary.completed and not summary.verification_passed
+        assert summary.files == ["5_tag.csv"]
+        assert summary.collections == []
+        assert summary.stage("verify") is not None
+
+    def test_offline_parse_reads_flags_from_stdout_only(self):
+        parsed = parse_output("Extracting 5_tag.csv ...", "ETL PIPELINE COMPLETED SUCCESSFULLY", returncode=0)
+        assert not parsed.completed
+        assert parsed.files == ["5_tag.csv"]
+
+    def test_offline_parse_has_no_durations(self):
+        parsed = parse_output("\n".join(line for _, line in SAMPLE_LINES), returncode=0)
+        assert parsed.source == "parsed"
+        assert all(s["seconds"] is None for s in parsed.stages)
+        assert "A_product_category_index.csv" in parsed.files
@@ -0,0 +1,31 @@
+"""
+Full-collection validation — every document the ETL writes, not one hand-picked
+sample, is checked against the per-collection invariants registered in
+tests/_validation.py (required fields, types, ID format, 900KB size guard).
+
+The scan runs once per session (`validation_report` fixture); each test reports
+the violations of one collection as a compact rule → count → sample-IDs table.
+"""
+
+import pytest
+
+from tests._snapshot import PIPELINE_COLLECTIONS
+
+
+pytestmark = [pytest.mark.pipeline, pytest.mark.requires_emulator]
+
+
+@pytest.mark.parametrize("collection", PIPELINE_COLLECTIONS)
+class TestFullCollection:
+
+    def test_every_document_was_scanned(self, validation_report, collection_ids, collection):
+        assert validation_report.scanned[collection] == len(collection_ids.ids(collection)), (
+            f"{collection}: scanned {validation_report.scanned[collection]} docs, "
+            f"index lists {len(collection_ids.ids(collection))} — cursor ranges lost documents"
+        )
+
+    def test_no_invariant_violations(self, validation_report, collection):
+        assert validation_report.count(collection) == 0, (
+            f"{collection}: {validation_report.count(collection)} invariant violations\n"
+            f"{validation_report.summary(collection)}"
+        )
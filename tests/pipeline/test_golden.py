@@ -0,0 +1,24 @@
+"""
+Golden-output diff — after a data-loader change, exactly which documents of the five
+output collections changed, and which of their fields.
+
+The `golden_diff` fixture hashes every document and compares per-collection Merkle trees
+with the batch's golden file (tests/_golden.py), so only the changed buckets are compared.
+Failures list the added, removed and changed document IDs with field deltas. Once a change
+is intended, record it with `make golden-update` and commit fixtures/golden/.
+"""
+
+import pytest
+
+from tests._snapshot import PIPELINE_COLLECTIONS
+
+
+pytestmark = [pytest.mark.pipeline, pytest.mark.requires_emulator]
+
+
+@pytest.mark.parametrize("collection", PIPELINE_COLLECTIONS)
+def test_output_matches_golden(golden_diff, collection):
+    assert golden_diff.count(collection) == 0, (
+        f"{collection}: {golden_diff.count(collection)} documents differ from {golden_diff.golden}\n"
+        f"{golden_diff.summary(collection)}"
+    )
@@ -0,0 +1,48 @@
+"""
+Per-locale pipeline tests — every locale of the batch under test reaches Firestore.
+
+On fixtures/csv/ this is de_DE alone. On a batch derived by scripts/derive_locales.py
+(`make test-pipeline-locales`) each cloned locale must come out with the same
+document counts as the locale it was cloned from. The session's per-locale
+counts and the run's throughput are printed and appended to reports/pipeline/locales.json.
+
+The batch's locales are only known once `locale_report` has read them, so each test
+checks every locale and names all that fail.
+"""
+
+import pytest
+
+from tests._locales import DEFAULT_LOCALE
+from tests._snapshot import PIPELINE_COLLECTIONS
+
+
+pytestmark = [pytest.mark.pipeline, pytest.mark.requires_emulator]
+
+
+def test_every_locale_was_loaded(locale_report):
+    empty = [l for l in locale_report.locales if locale_report.count(l, "PLProductContent") == 0]
+    assert not empty, f"No PLProductContent documents for {empty}\n{locale_report}"
+
+
+def test_locales_match_source_locale(locale_report):
+    cloned = [l for l in locale_report.locales if l != DEFAULT_LOCALE]
+    if DEFAULT_LOCALE not in locale_report.locales or not cloned:
+        pytest.skip(f"no locales cloned from {DEFAULT_LOCALE}")
+    mismatched = {
+        locale: {
+            c: (locale_report.count(DEFAULT_LOCALE, c), locale_report.count(locale, c))
+            for c in PIPELINE_COLLECTIONS
+            if locale_report.count(DEFAULT_LOCALE, c) != locale_report.count(locale, c)
+        }
+        for locale in cloned
+    }
+    mismatched = {locale: diff for locale, diff in mismatched.items() if diff}
+    assert not mismatched, (
+        f"Document counts differ from {DEFAULT_LOCALE} "
+        f"({{locale: {{collection: ({DEFAULT_LOCALE}, locale)}}}}): {mismatched}\n{locale_report}"
+    )
+
+
+def test_no_documents_for_unexpected_locales(locale_report):
+    unexpected = sorted(set(locale_report.counts) - set(locale_report.locales))
+    assert not unexpected, f"Documents for locales not in the batch: {unexpected}\n{locale_report}"
@@ -1,49 +1,48 @@
 """
 Pipeline execution tests — verifies the data-loader process itself
 runs successfully (exit code, no critical errors in output).
+
+Assertions read the parsed EtlSummary (`etl_summary`, tests/_etl_log.py); failure
+messages show it — stage timings, critical lines, the last output lines and the
+path of the full log under reports/pipeline/ — instead of the whole stdout.
 """
 
 import pytest
 
+from tests._snapshot import PIPELINE_COLLECTIONS
+
 
 pytestmark = [pytest.mark.pipeline, pytest.mark.requires_emulator]
 
 
 class TestPipelineExecution:
 
-    def test_pipeline_exits_zero(self, pipeline_result):
+    def test_pipeline_exits_zero(self, pipeline_result, etl_summary):
         assert pipeline_result.returncode == 0, (
-            f"ETL pipeline exited with code {pipeline_result.returncode}.\n"
-            f"STDOUT:\n{pipeline_result.stdout}\n"
-            f"STDERR:\n{pipeline_result.stderr}"
+            f"ETL pipeline exited with code {pipeline_result.returncode}.\n{etl_summary}"
         )
 
-    def test_pipeline_reports_completion(self, pipeline_result):
-        assert "ETL PIPELINE COMPLETED SUCCESSFULLY" in pipeline_result.stdout, (
-            "Expected completion message not found in pipeline output.\n"
-            f"STDOUT:\n{pipeline_result.stdout}"
+    def test_pipeline_reports_completion(self, etl_summary):
+        assert etl_summary.completed, (
+            f"Expected completion message not found in pipeline output.\n{etl_summary}"
         )
 
-    def test_pipeline_no_critical_errors(self, pipeline_result):
-        stdout = pipeline_result.stdout
+    def test_pipeline_no_critical_errors(self, etl_summary):
         # Critical errors cause an early exit — they appear before the summary
-        assert "Cannot continue: Missing essential" not in stdout
-        assert "Critical extraction errors" not in stdout
+        assert not etl_summary.critical, f"Critical errors in pipeline output.\n{etl_summary}"
 
-    def test_pipeline_extracted_products(self, pipeline_result):
-        assert "1_product_data.csv" in pipeline_result.stdout, (
-            "Pipeline output should mention 1_product_data.csv extraction"
+    def test_pipeline_extracted_products(self, etl_summary):
+        assert "1_product_data.csv" in etl_summary.files, (
+            f"Pipeline output should mention 1_product_data.csv extraction — saw {etl_summary.files}"
         )
 
-    def test_pipeline_loaded_all_collections(self, pipeline_result):
-        stdout = pipeline_result.stdout
-        for collection in ["PLProductContent", "PLCategory",
-                           "PLVariant", "ProductIndexData", "CategoryRouting"]:
-            assert collection in stdout, (
-                f"Expected '{collection}' to appear in pipeline output"
+    def test_pipeline_loaded_all_collections(self, etl_summary):
+        for collection in PIPELINE_COLLECTIONS:
+            assert collection in etl_summary.collections, (
+                f"Expected '{collection}' to appear in pipeline output — saw {etl_summary.collections}"
             )
 
-    def test_pipeline_verification_passed(self, pipeline_result):
-        assert "Verification passed" in pipeline_result.stdout, (
-            "Firestore verification step should pass after load"
+    def test_pipeline_verification_passed(self, etl_summary):
+        assert etl_summary.verification_passed, (
+            f"Firestore verification step should pass after load\n{etl_summary}"
         )
@@ -0,0 +1,40 @@
+"""
+CSV → Firestore reconciliation — every input product of the batch, not only the
+two known SKUs, is looked up in PLProductContent and ProductIndexData.
+
+The input side is loaded once per session into indexed SQLite tables (`fixture_store`),
+the output side is streamed next to it, and each rule of tests/_reconcile.py is a
+single SQL join (`reconciliation` fixture). Each test reports one rule's mismatches
+as a count plus sample keys. Rules the batch has no data for are skipped; e.g.
+BaseSKU!=input needs the base_sku column of 1_product_data.csv.
+"""
+
+import pytest
+
+from tests._reconcile import RULES
+
+
+pytestmark = [pytest.mark.pipeline, pytest.mark.requires_emulator]
+
+
+def test_every_input_product_was_reconciled(reconciliation, collection_ids):
+    # One PLProductContent document per input SKU and locale — counted from the emulator's
+    # document IDs, independently of the SQLite store the report was built from
+    documents = len(collection_ids.ids("PLProductContent"))
+    assert reconciliation.products == documents > 0, (
+        f"{reconciliation.products} input SKUs reconciled, {documents} PLProductContent documents\n"
+        f"{reconciliation}"
+    )
+
+
+@pytest.mark.parametrize("rule", [r.name for r in RULES])
+def test_no_mismatches(reconciliation, rule):
+    if rule in reconciliation.skipped:
+        pytest.skip(f"{rule}: the batch has no input data for this rule")
+    assert reconciliation.count(rule) == 0, (
+        f"{rule}: {reconciliation.count(rule)} mismatches\n{reconciliation.summary(rule)}"
+    )
+
+
+def test_reconciliation_runs_in_seconds(reconciliation):
+    assert reconciliation.seconds < 60, f"Reconciliation took {reconciliation.seconds:.1f}s\n{reconciliation}"
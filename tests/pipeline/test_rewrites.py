@@ -0,0 +1,47 @@
+"""
+ETL re-run write-avoidance audit — main.py run twice on the same batch should not
+rewrite the documents its first run already wrote.
+
+Opt-in (PIPELINE_RERUN=on, `make test-pipeline-rerun`): the `pipeline_rerun` fixture
+runs the data-loader a second time without clearing the emulator. It counts the
+Firestore writes that run issues, compares every document's update_time before and
+after it (tests/_rewrites.py) and appends the audit to reports/pipeline/rewrites.json,
+so the count of wasted writes can be tracked over time.
+"""
+
+import pytest
+
+from tests._snapshot import PIPELINE_COLLECTIONS
+
+
+pytestmark = [pytest.mark.pipeline, pytest.mark.requires_emulator]
+
+
+@pytest.mark.parametrize("collection", PIPELINE_COLLECTIONS)
+class TestRerun:
+
+    def test_rerun_keeps_document_set(self, pipeline_rerun, collection):
+        counts = pipeline_rerun.counts[collection]
+        assert counts["created"] == counts["deleted"] == 0, (
+            f"{collection}: re-run on an unchanged batch created {counts['created']} and deleted "
+            f"{counts['deleted']} documents\n{pipeline_rerun}"
+        )
+
+    def test_rerun_issues_no_writes(self, pipeline_rerun, collection):
+        """Writes of identical data leave update_time alone but are still billed."""
+        issued = pipeline_rerun.writes(collection)
+        assert issued is not None, (
+            f"The re-run's Firestore writes were not counted — the tests/_firestore_writes hook did "
+            f"not load into the data-loader\n{pipeline_rerun}"
+        )
+        assert issued == 0, (
+            f"{collection}: re-run on an unchanged batch issued {issued} writes for "
+            f"{pipeline_rerun.counts[collection]['before']} documents\n{pipeline_rerun}"
+        )
+
+    def test_rerun_changes_no_content(self, pipeline_rerun, collection):
+        assert pipeline_rerun.counts[collection]["rewritten"] == 0, (
+            f"{collection}: {pipeline_rerun.counts[collection]['rewritten']} of "
+            f"{pipeline_rerun.counts[collection]['before']} documents rewritten by a re-run on an "
+            f"unchanged batch\n{pipeline_rerun}"
+        )
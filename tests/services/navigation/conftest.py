@@ -2,8 +2,8 @@
 Phase 4 — NavigationApi conftest.
 
 Module-scoped fixture: clears PLCategory, seeds 2 controlled documents
-(NAV_PARENT + NAV_CHILD), waits for NavigationApi /health, then yields
-(requests_session, firestore_client).
+(NAV_PARENT + NAV_CHILD, fixtures/seeds/navigation.json), waits for NavigationApi
+/health, then yields (requests_session, firestore_client).
 
 Infrastructure required: docker compose --profile phase4 up -d
 (with seed_config.py already run before starting the containers).
@@ -15,6 +15,9 @@ import time
 import pytest
 import requests
 
+from tests._reset import reset_firestore
+from tests._seeding import seed_manifest
+
 # ─── Connection constants ─────────────────────────────────────────────────────
 
 FIRESTORE_EMULATOR_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
@@ -22,48 +25,10 @@ NAVIGATION_API_HOST     = os.environ.get("NAVIGATION_API_HOST", "localhost:8083"
 
 # ─── Test document IDs ────────────────────────────────────────────────────────
 
+# Document bodies live in fixtures/seeds/navigation.json
 NAV_PARENT_DOC_ID = "9001_de_DE"
 NAV_CHILD_DOC_ID  = "9002_de_DE"
 
-# ─── Test document data ───────────────────────────────────────────────────────
-
-NAV_PARENT_DOC = {
-    "ID": 9001,
-    "Language": "de",
-    "Market": "DE",
-    "Name": "Test Navigation Category",
-    "Slug": "test-navigation-category",
-    "MenuVisibility": True,
-    "Priority": 1,
-    "Type": "category",
-    "Path": "/test-navigation-category",
-    "ParentId": None,
-    "Ancestors": [],
-    "Image": None,
-}
-
-NAV_CHILD_DOC = {
-    "ID": 9002,
-    "Language": "de",
-    "Market": "DE",
-    "Name": "Test Sub Category",
-    "Slug": "test-sub-category",
-    "MenuVisibility": True,
-    "Priority": 2,
-    "Type": "category",
-    "Path": "/test-navigation-category/test-sub-category",
-    "ParentId": 9001,
-    "Ancestors": [
-        {
-            "CategoryId": 9001,
-            "CategoryName": "Test Navigation Category",
-            "CategorySlug": "test-navigation-category",
-            "Path": "/test-navigation-category",
-        }
-    ],
-    "Image": None,
-}
-
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 
@@ -102,25 +67,22 @@ def _wait_for_navigation_api(timeout: int = 180) -> None:
 
 
 @pytest.fixture(scope="module")
-def navigation_result(firestore_client):
+def navigation_result(service_firestore_client):
     """
     Seed PLCategory, wait for NavigationApi, and yield (session, firestore_client).
 
     Yields:
         (session, firestore_client) where:
           - session          — requests.Session (use with full URL http://NAVIGATION_API_HOST/...)
-          - firestore_client — google.cloud.firestore.Client (connected to emulator)
+          - firestore_client — google.cloud.firestore.Client (emulator, shared `demo-project`)
     """
     os.environ["FIRESTORE_EMULATOR_HOST"] = FIRESTORE_EMULATOR_HOST
 
     # ── Clear PLCategory ───────────────────────────────────────────────────────
-    col = firestore_client.collection("PLCategory")
-    for snap in col.stream():
-        snap.reference.delete()
+    reset_firestore(service_firestore_client, ["PLCategory"])
 
     # ── Seed controlled documents ──────────────────────────────────────────────
-    col.document(NAV_PARENT_DOC_ID).set(NAV_PARENT_DOC)
-    col.document(NAV_CHILD_DOC_ID).set(NAV_CHILD_DOC)
+    seed_manifest(service_firestore_client, "navigation")
 
     # ── Wait for NavigationApi to be healthy ───────────────────────────────────
     _wait_for_navigation_api()
@@ -129,4 +91,4 @@ def navigation_result(firestore_client):
     session = requests.Session()
     session.headers.update({"Accept": "application/json"})
 
-    yield session, firestore_client
+    yield session, service_firestore_client
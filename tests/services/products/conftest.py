@@ -2,8 +2,9 @@
 Phase 4 — ProductsApi conftest.
 
 Module-scoped fixture: clears PLProductContent, PLVariant, PLCategory, seeds
-controlled documents (one product + one variant + one category), waits for
-ProductsApi /health, then yields (requests_session, firestore_client).
+controlled documents (one product + one variant + one category, from
+fixtures/seeds/products.json), waits for ProductsApi /health, then yields
+(requests_session, firestore_client).
 
 Infrastructure required: docker compose --profile phase4 up -d
 (with seed_config.py already run before starting the containers).
@@ -15,6 +16,9 @@ import time
 import pytest
 import requests
 
+from tests._reset import reset_firestore
+from tests._seeding import seed_manifest
+
 # ─── Connection constants ─────────────────────────────────────────────────────
 
 FIRESTORE_EMULATOR_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
@@ -22,76 +26,11 @@ PRODUCTS_API_HOST       = os.environ.get("PRODUCTS_API_HOST", "localhost:8084")
 
 # ─── Test document IDs ────────────────────────────────────────────────────────
 
+# Document bodies live in fixtures/seeds/products.json
 PRODUCTS_CONTENT_DOC_ID  = "PROD-001_de_DE"
 PRODUCTS_VARIANT_DOC_ID  = "PROD_0_de_DE"
 PRODUCTS_CATEGORY_DOC_ID = "5001_de_DE"
 
-# ─── Test document data ───────────────────────────────────────────────────────
-
-PRODUCTS_CATEGORY_DOC = {
-    "ID": 5001,
-    "Language": "de",
-    "Market": "DE",
-    "Name": "Test Products Category",
-    "Slug": "test-products-category",
-    "MenuVisibility": True,
-    "Priority": 1,
-    "Type": "category",
-    "Path": "/test-products-category",
-    "ParentId": None,
-    "Ancestors": [],
-    "Image": None,
-}
-
-PRODUCTS_CONTENT_DOC = {
-    "SKU": "PROD-001",
-    "Language": "de",
-    "Market": "DE",
-    "ID": 1001,
-    "EAN": 1234567890,
-    "Slug": "prod-001",
-    "BaseSKU": "PROD",
-    "Sequence": "0",
-    "Title": "Test Product 001",
-    "Status": "Active",
-    "Finish": 1,
-    "CategoryIDs": [5001],
-    "DefaultCategoryID": 5001,
-    "CategorySlugs": ["test-products-category"],
-    "StandardImages": [],
-    "OtherImages": [],
-    "AlternativeProducts": [],
-    "SuggestedProducts": [],
-    "InstallationTypes": [],
-    "Materials": [],
-    "Included": [],
-    "NotIncluded": [],
-    "Tags": [],
-    "Features": [],
-    "Finishes": [],
-    "SpareParts": [],
-    "Specifications": [],
-    "Awards": [],
-}
-
-PRODUCTS_VARIANT_DOC = {
-    "SKU": "PROD-001",
-    "Language": "de",
-    "Market": "DE",
-    "GroupId": 0,
-    "Variants": [
-        {
-            "SKU": "PROD-001",
-            "FinishId": 1,
-            "FinishCode": "AL",
-            "FinishName": "Alpine White",
-            "SizeLabel": None,
-            "FinishIcon": None,
-            "ColourNameGrohe": None,
-        }
-    ],
-}
-
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 
@@ -126,41 +65,26 @@ def _wait_for_products_api(timeout: int = 300) -> None:
     )
 
 
-def _clear_collection(firestore_client, name: str) -> None:
-    col = firestore_client.collection(name)
-    for snap in col.stream():
-        snap.reference.delete()
-
-
 # ─── Fixture ──────────────────────────────────────────────────────────────────
 
 
 @pytest.fixture(scope="module")
-def products_result(firestore_client):
+def products_result(service_firestore_client):
     """
     Seed PLProductContent, PLVariant, PLCategory; wait for ProductsApi; yield.
 
     Yields:
         (session, firestore_client) where:
           - session          — requests.Session (use with full URL http://PRODUCTS_API_HOST/...)
-          - firestore_client — google.cloud.firestore.Client (connected to emulator)
+          - firestore_client — google.cloud.firestore.Client (emulator, shared `demo-project`)
     """
     os.environ["FIRESTORE_EMULATOR_HOST"] = FIRESTORE_EMULATOR_HOST
 
     # ── Clear relevant collections ─────────────────────────────────────────────
-    for col_name in ("PLProductContent", "PLVariant", "PLCategory"):
-        _clear_collection(firestore_client, col_name)
+    reset_firestore(service_firestore_client, ["PLProductContent", "PLVariant", "PLCategory"])
 
     # ── Seed controlled documents ──────────────────────────────────────────────
-    firestore_client.collection("PLCategory").document(PRODUCTS_CATEGORY_DOC_ID).set(
-        PRODUCTS_CATEGORY_DOC
-    )
-    firestore_client.collection("PLProductContent").document(PRODUCTS_CONTENT_DOC_ID).set(
-        PRODUCTS_CONTENT_DOC
-    )
-    firestore_client.collection("PLVariant").document(PRODUCTS_VARIANT_DOC_ID).set(
-        PRODUCTS_VARIANT_DOC
-    )
+    seed_manifest(service_firestore_client, "products")
 
     # ── Wait for ProductsApi to be healthy ─────────────────────────────────────
     _wait_for_products_api()
@@ -169,4 +93,4 @@ def products_result(firestore_client):
     session = requests.Session()
     session.headers.update({"Accept": "application/json"})
 
-    yield session, firestore_client
+    yield session, service_firestore_client
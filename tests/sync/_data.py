@@ -3,11 +3,16 @@ Shared test constants and helpers for sync tests.
 
 Imported by both conftest.py (fixture setup) and test_sync_logic.py (assertions).
 Using unrealistic BaseSKUs (10000–40000) to avoid clashing with real fixture data.
+
+build_manifest() generates the same four scenarios at any size, in consecutive
+base-SKU ranges from FIRST_BASE_SKU (scripts/bench_sync.py, tests/indexing/_contention.py).
 """
 
 import hashlib
 import json
 
+from tests._seeding import manifest_document
+
 # ── Document IDs ──────────────────────────────────────────────────────────────
 # Format: {BaseSKU}_{Sequence}_{Language}_{Market}
 
@@ -18,33 +23,93 @@ PRODUCT_DELETED_ID   = "40000_0_de_DE"   # NOT in ProductIndexData       → exp
 
 # ── ProductIndexData payloads (stored in main collection) ────────────────────
 # Minimal dicts — sync stores the whole dict verbatim; no schema validation here.
+# Defined in fixtures/seeds/sync.json so the seeded data and the assertions share one source.
 
-PRODUCT_NEW_DATA = {
-    "base_sku": "10000",
-    "locale": "de_de",
-    "name": "Test New Product",
-    "all_category_ids": ["cat_new"],
-    "image_url": "https://img.example.com/new.jpg",
-}
-
-PRODUCT_CHANGED_DATA = {
-    "base_sku": "20000",
-    "locale": "de_de",
-    "name": "Test Changed Product",
-    "all_category_ids": ["cat_changed"],
-    "image_url": "https://img.example.com/changed.jpg",
-}
-
-PRODUCT_UNCHANGED_DATA = {
-    "base_sku": "30000",
-    "locale": "de_de",
-    "name": "Test Unchanged Product",
-    "all_category_ids": ["cat_unchanged"],
-    "image_url": "https://img.example.com/unchanged.jpg",
-}
+PRODUCT_NEW_DATA       = manifest_document("sync", "ProductIndexData", PRODUCT_NEW_ID)
+PRODUCT_CHANGED_DATA   = manifest_document("sync", "ProductIndexData", PRODUCT_CHANGED_ID)
+PRODUCT_UNCHANGED_DATA = manifest_document("sync", "ProductIndexData", PRODUCT_UNCHANGED_ID)
 
 # ── Helper ─────────────────────────────────────────────────────────────────────
 
 def compute_hash(data: dict) -> str:
     """Replicate sync_product_index.py._compute_hash for pre-computing expected hashes."""
     return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+# ── Bulk datasets ─────────────────────────────────────────────────────────────
+# Generated seed manifests (tests/_seeding.py) with the four scenarios above at scale.
+
+FIRST_BASE_SKU = 1_000_000      # far above real base SKUs and the 10000–40000 above
+SCENARIOS      = ("new", "changed", "unchanged", "deleted")
+MAIN           = "ProductIndexData"
+QUEUE          = "products-index-updates"
+
+
+def scenario_ranges(size: int, ratios) -> dict:
+    """{scenario: (first base SKU, count)}; counts sum to `size` (largest remainder)."""
+    total = sum(ratios)
+    exact = [size * r / total for r in ratios]
+    counts = [int(x) for x in exact]
+    for i in sorted(range(len(exact)), key=lambda i: counts[i] - exact[i])[:size - sum(counts)]:
+        counts[i] += 1
+    ranges, start = {}, FIRST_BASE_SKU
+    for scenario, count in zip(SCENARIOS, counts):
+        ranges[scenario] = (start, count)
+        start += count
+    return ranges
+
+
+def scenario_of(doc_id: str, ranges: dict) -> str:
+    n = int(doc_id.split("_", 1)[0])
+    return next((s for s, (start, count) in ranges.items() if start <= n < start + count), None)
+
+
+def _product(n: str = "{n}") -> dict:
+    """ProductIndexData template — a few finishes and categories, like the ETL's documents."""
+    return {
+        "base_sku":         n,
+        "locale":           "de_de",
+        "name":             f"Bench Product {n}",
+        "all_category_ids": ["cat_bench", f"cat_{n}"],
+        "image_url":        f"https://img.example.com/{n}.jpg",
+        "is_historical":    False,
+        "colors":           ["chrome", "matt-black"],
+        "tag_definitions":  [{"id": 7, "name": "Bench"}],
+        "finish_definitions": [
+            {"id": i, "sku": f"{n}{code}", "ean": f"40059{n}{i}", "slug": f"bench-{n}-{code}",
+             "image": f"https://img.example.com/{n}{code}.jpg", "color": color}
+            for i, (code, color) in enumerate((("000", "chrome"), ("DC0", "supersteel"), ("KF0", "matt-black")))
+        ],
+    }
+
+
+def _update(content_hash, finished: bool, n: str = "{n}") -> dict:
+    return {
+        "content_hash":          content_hash,
+        "culture":               "de_de",
+        "finished":              finished,
+        "operation":             "Update",
+        "domain_id":             "9175162892",
+        "identifier":            f"{n}-0",
+        "data":                  {"document": {"fields": {}, "id": f"{n}-0", "locale": "de_de"}},
+        "incremental_update_id": None,
+        "status":                "unknown",
+    }
+
+
+def build_manifest(ranges: dict, finished: bool = True) -> dict:
+    """Seed manifest for `ranges`; queued records start as `finished` (False: not yet indexed)."""
+    def gen(scenario, template):
+        start, count = ranges[scenario]
+        return {"start": start, "count": count, "id": "{n}_0_de_DE", "template": template}
+
+    return {
+        "options": {"mode": "bulk"},
+        "collections": {
+            MAIN:  {"generate": [gen(s, _product()) for s in ("new", "changed", "unchanged")]},
+            QUEUE: {"generate": [
+                gen("changed",   _update("stale_hash_that_does_not_match", finished)),
+                gen("unchanged", _update({"$sha256_of": f"{MAIN}/{{n}}_0_de_DE"}, finished)),
+                gen("deleted",   _update("hash_of_a_product_that_no_longer_exists", finished)),
+            ]},
+        },
+    }
@@ -0,0 +1,189 @@
+"""
+Expected-state oracle for sync_product_index.py, at any scale.
+
+Given ProductIndexData and the products-index-updates state before the sync, every
+queue document's outcome is determined (scenarios as in _data.py):
+
+  in ProductIndexData, not queued             → operation=Update, finished=False, hash=h
+  in both, queued hash ≠ h                    → operation=Update, finished=False, hash=h
+  in both, queued hash = h                    → untouched (prior operation / finished)
+  queued only                                 → operation=Delete, finished=False ¹
+  every Update record                         → identifier "{BaseSKU}-{Sequence}"
+
+  h = compute_hash(ProductIndexData document)
+  ¹ a record that was already a Delete keeps its finished flag
+
+The prior queue state comes from the seed manifest (`prior_from_manifest`) or is
+captured from the emulator before the sync (`capture_queue`). Only (hash, operation,
+finished) is kept per ID. ProductIndexData is read with the partitioned scan; each
+range is cut into HASH_CHUNK-document chunks and hashed on a process pool, with at
+most one chunk in flight per scan thread. The expected state is one small tuple per
+ID, sorted by ID. The actual collection is streamed in document-ID order, projected
+onto the checked fields, and merge-joined against it. Neither side's payloads are
+held in memory, so a 100k-document run is verified in seconds:
+
+  [oracle] 100,000 expected, 100,000 actual, 4 workers, hash 2.1s, total 6.8s — 0 mismatches
+    (new 25,000  changed 25,000  unchanged 40,000  deleted 10,000)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+
+from tests._id_index import CollectionIdIndex, scan_partitioned
+from tests._mismatches import MismatchReport
+from tests._seeding import manifest_documents
+from tests.sync._data import compute_hash
+
+MAIN        = "ProductIndexData"
+QUEUE       = "products-index-updates"
+FIELDS      = ("operation", "finished", "content_hash", "identifier")
+HASH_CHUNK  = 500
+SCENARIOS   = ("new", "changed", "unchanged", "deleted")
+
+
+# ── Prior queue state ─────────────────────────────────────────────────────────
+
+def _prior(data: dict) -> tuple:
+    return data.get("content_hash"), data.get("operation"), data.get("finished")
+
+
+def prior_from_manifest(name) -> dict:
+    """{doc_id: (content_hash, operation, finished)} of the manifest's products-index-updates."""
+    return {doc_id: _prior(data) for doc_id, data in manifest_documents(name, QUEUE)}
+
+
+def capture_queue(client: firestore.Client) -> dict:
+    """Same as prior_from_manifest, read from the emulator — call it before the sync runs."""
+    return {snap.id: _prior(snap.to_dict())
+            for snap in client.collection(QUEUE).select(["content_hash", "operation", "finished"]).stream()}
+
+
+# ── Expected state ────────────────────────────────────────────────────────────
+
+def _hash_chunk(docs: list) -> list:
+    """Pool worker: [(doc_id, compute_hash(data))]."""
+    return [(doc_id, compute_hash(data)) for doc_id, data in docs]
+
+
+def _identifier(doc_id: str) -> str:
+    base, sequence = doc_id.split("_")[:2]
+    return f"{base}-{sequence}"
+
+
+def hash_products(client: firestore.Client, index, pool: ProcessPoolExecutor) -> dict:
+    """{doc_id: content hash} of every ProductIndexData document, hashed on `pool`."""
+
+    def visit(collection, snapshots):
+        hashes, chunk, pending = [], [], None
+        for snap in snapshots:
+            chunk.append((snap.id, snap.to_dict()))
+            if len(chunk) == HASH_CHUNK:
+                if pending:
+                    hashes.extend(pending.result())
+                pending, chunk = pool.submit(_hash_chunk, chunk), []
+        if pending:
+            hashes.extend(pending.result())
+        hashes.extend(_hash_chunk(chunk))
+        return hashes
+
+    hashes = {}
+    for _, rows in scan_partitioned(client, index, [MAIN], visit):
+        hashes.update(rows)
+    return hashes
+
+
+def expected_state(hashes: dict, prior: dict) -> tuple:
+    """([(doc_id, *FIELDS values)] sorted by ID, {scenario: count}).
+
+    None in a field means "not checked"."""
+    expected, counts = [], dict.fromkeys(SCENARIOS, 0)
+    for doc_id in sorted(hashes.keys() | prior.keys()):
+        h = hashes.get(doc_id)
+        old_hash, old_operation, old_finished = prior.get(doc_id, (None, None, None))
+        if h is None:
+            finished = old_finished if old_operation == "Delete" else False
+            expected.append((doc_id, "Delete", finished, None, None))
+            counts["deleted"] += 1
+        elif doc_id in prior and old_hash == h:
+            expected.append((doc_id, old_operation, old_finished, h, None))
+            counts["unchanged"] += 1
+        else:
+            expected.append((doc_id, "Update", False, h, _identifier(doc_id)))
+            counts["changed" if doc_id in prior else "new"] += 1
+    return expected, counts
+
+
+# ── Merge-join ────────────────────────────────────────────────────────────────
+
+@dataclass
+class OracleReport(MismatchReport):
+    """products-index-updates vs the oracle's expected state; mismatching IDs per rule."""
+
+    expected: int = 0
+    actual: int = 0
+    workers: int = 0
+    hash_seconds: float = 0.0
+    seconds: float = 0.0
+    scenarios: dict = field(default_factory=dict)     # {scenario: expected documents}
+
+    def __str__(self) -> str:
+        head = (f"[oracle] {self.expected:,} expected, {self.actual:,} actual, {self.workers} workers, "
+                f"hash {self.hash_seconds:.1f}s, total {self.seconds:.1f}s — {self.count()} mismatches\n"
+                f"  ({'  '.join(f'{s} {n:,}' for s, n in self.scenarios.items())})")
+        body = self.summary()
+        return f"{head}\n{body}" if body else head
+
+
+def stream_queue(client: firestore.Client):
+    """products-index-updates in document-ID order, projected onto FIELDS."""
+    query = client.collection(QUEUE).select(list(FIELDS)).order_by(FieldPath.document_id())
+    for snap in query.stream():
+        data = snap.to_dict()
+        yield snap.id, tuple(data.get(f) for f in FIELDS)
+
+
+def compare_fields(expected: tuple, values: dict, report) -> None:
+    """Default comparison: every checked field must equal the expected value."""
+    for name, want in zip(FIELDS, expected[1:]):
+        if want is not None and values[name] != want:
+            report.add(name, expected[0], f"{values[name]!r} != {want!r}")
+
+
+def merge_join(expected: list, actual, report: OracleReport, compare=compare_fields) -> None:
+    """Walk both ID-sorted sides once; `compare` each matched pair and record differences on `report`."""
+    expected, actual = iter(expected), iter(actual)
+    exp, act = next(expected, None), next(actual, None)
+    while exp is not None or act is not None:
+        if act is None or (exp is not None and exp[0] < act[0]):
+            report.add("missing", exp[0])
+            exp = next(expected, None)
+            continue
+        report.actual += 1
+        if exp is None or act[0] < exp[0]:
+            report.add("unexpected", act[0])
+            act = next(actual, None)
+            continue
+        compare(exp, dict(zip(FIELDS, act[1])), report)
+        exp, act = next(expected, None), next(actual, None)
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def verify_sync(client: firestore.Client, prior: dict, workers: int = None) -> OracleReport:
+    """Diff products-index-updates against the state a correct sync leaves, given the `prior` queue."""
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = hash_products(client, CollectionIdIndex(client), pool)
+    report = OracleReport(workers=workers, hash_seconds=time.perf_counter() - start)
+    expected, report.scenarios = expected_state(hashes, prior)
+    del hashes
+    report.expected = len(expected)
+    merge_join(expected, stream_queue(client), report)
+    report.seconds = time.perf_counter() - start
+    return report
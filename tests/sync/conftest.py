@@ -3,8 +3,9 @@ Fixtures for Layer 2 sync tests (sync_product_index.py).
 
 Strategy
 --------
-Four test products are seeded directly into the Firestore emulator — no ETL pipeline
-needed. This keeps sync tests fast (seconds, not minutes).
+Four test products are seeded directly into the Firestore emulator from the
+fixtures/seeds/sync.json manifest — no ETL pipeline needed. This keeps sync tests
+fast (seconds, not minutes).
 
 The sync script is run once per module with `--sync-database (default)`. Both the
 ProductIndexData collection (main DB) and products-index-updates collection (sync DB)
@@ -17,9 +18,16 @@ Scenario matrix
   PRODUCT_UNCHANGED in both; sync doc has matching hash      → sync skips (no write)
   PRODUCT_DELETED   in products-index-updates only           → sync sets operation=Delete
 
-The fixture clears both collections before seeding and cleans up test docs afterward.
-If the full pipeline ran first (make test-all), its data is cleared here; pipeline
-tests have already completed by the time pytest reaches tests/sync/ (alphabetical order).
+The layer runs in its own emulator project (`<PROJECT_ID>-sync`), so resetting it
+before seeding (one bulk-delete request via tests/_reset.py) never touches the
+post-ETL state that pipeline tests — and their session-scoped ID index — read from,
+whatever order pytest-xdist schedules the two layers in. Test docs are cleaned up
+afterward.
+
+`sync_oracle` checks the same run as a whole: tests/sync/_oracle.py derives the
+expected products-index-updates state from ProductIndexData and the seeded queue,
+then merge-joins it against the actual collection, so the check holds for any
+seed manifest, not only these four IDs.
 """
 
 import os
@@ -31,15 +39,15 @@ from pathlib import Path
 import pytest
 from google.cloud import firestore
 
+from tests._env import EMULATOR_HOST, PROJECT_ID   # per-xdist-worker project (demo-project-gw0, ...)
+from tests._reset import reset_firestore
+from tests._seeding import seed_manifest
+from tests.sync._oracle import OracleReport, prior_from_manifest, verify_sync
 from tests.sync._data import (
-    PRODUCT_CHANGED_DATA,
     PRODUCT_CHANGED_ID,
     PRODUCT_DELETED_ID,
-    PRODUCT_NEW_DATA,
     PRODUCT_NEW_ID,
-    PRODUCT_UNCHANGED_DATA,
     PRODUCT_UNCHANGED_ID,
-    compute_hash,
 )
 
 # ── Paths ─────────────────────────────────────────────────────────────────────
@@ -55,96 +63,50 @@ else:
 if not DATA_LOADER_PYTHON.exists():
     DATA_LOADER_PYTHON = Path(sys.executable)
 
-EMULATOR_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST", "localhost:8080")
-PROJECT_ID    = "demo-project"
-SYNC_DATABASE = "(default)"   # Named databases not supported by the gcloud emulator
+SYNC_DATABASE   = "(default)"   # Named databases not supported by the gcloud emulator
+SYNC_PROJECT_ID = f"{PROJECT_ID}-sync"
+SYNC_MANIFEST   = "sync"
+
 
+@pytest.fixture(scope="session")
+def sync_firestore_client(emulator_available):
+    """Firestore client on the sync layer's own project — isolated from pipeline data."""
+    if not emulator_available:
+        pytest.skip("Firestore emulator not running — start it with: make infra-up")
 
-# ── Helpers ───────────────────────────────────────────────────────────────────
+    os.environ["FIRESTORE_EMULATOR_HOST"] = EMULATOR_HOST
 
-def _delete_all_docs(client: firestore.Client, collection_name: str) -> None:
-    """Delete every document in a collection using batched writes (500 per batch)."""
-    batch = client.batch()
-    count = 0
-    for doc in client.collection(collection_name).stream():
-        batch.delete(doc.reference)
-        count += 1
-        if count >= 500:
-            batch.commit()
-            batch = client.batch()
-            count = 0
-    if count > 0:
-        batch.commit()
+    return firestore.Client(project=SYNC_PROJECT_ID)
 
 
 # ── Module-scoped fixture ─────────────────────────────────────────────────────
 
 @pytest.fixture(scope="module")
-def sync_result(firestore_client):
+def sync_result(sync_firestore_client):
     """
     Seed Firestore, run sync_product_index.py once, yield (CompletedProcess, client).
 
     Module-scoped so the sync runs once and all TestSyncLogic methods share the result.
-    The `firestore_client` fixture from tests/conftest.py handles emulator availability;
-    if the emulator is not running it skips at that level.
+    The `sync_firestore_client` fixture handles emulator availability; if the emulator
+    is not running it skips at that level.
     """
-    # ── Clear both collections (may contain real ETL data from pipeline tests) ─
-    _delete_all_docs(firestore_client, "ProductIndexData")
-    _delete_all_docs(firestore_client, "products-index-updates")
-
-    # ── Seed ProductIndexData (new + changed + unchanged; NOT deleted) ─────────
-    pid = firestore_client.collection("ProductIndexData")
-    pid.document(PRODUCT_NEW_ID).set(PRODUCT_NEW_DATA)
-    pid.document(PRODUCT_CHANGED_ID).set(PRODUCT_CHANGED_DATA)
-    pid.document(PRODUCT_UNCHANGED_ID).set(PRODUCT_UNCHANGED_DATA)
-
-    # ── Seed products-index-updates (pre-existing sync state) ─────────────────
-    piu = firestore_client.collection("products-index-updates")
-
-    # CHANGED: stale hash → sync will detect difference and rewrite
-    piu.document(PRODUCT_CHANGED_ID).set({
-        "content_hash": "stale_hash_that_does_not_match",
-        "culture": "de_de",
-        "finished": True,    # should be reset to False when sync rewrites
-        "operation": "Update",
-        "domain_id": "9175162892",
-        "identifier": "20000-0",
-        "data": {"document": {"fields": {}, "id": "20000-0", "locale": "de_de"}},
-        "incremental_update_id": None,
-        "status": "unknown",
-    })
-
-    # UNCHANGED: correct hash → sync will compare equal and skip (no write)
-    piu.document(PRODUCT_UNCHANGED_ID).set({
-        "content_hash": compute_hash(PRODUCT_UNCHANGED_DATA),
-        "culture": "de_de",
-        "finished": True,    # should remain True — sync never writes this doc
-        "operation": "Update",
-        "domain_id": "9175162892",
-        "identifier": "30000-0",
-        "data": {"document": {"fields": {}, "id": "30000-0", "locale": "de_de"}},
-        "incremental_update_id": None,
-        "status": "unknown",
-    })
-
-    # DELETED: in sync but not in ProductIndexData → sync will set operation=Delete
-    piu.document(PRODUCT_DELETED_ID).set({
-        "content_hash": "some_old_hash",
-        "culture": "de_de",
-        "finished": False,
-        "operation": "Update",   # will be changed to "Delete"
-        "domain_id": "9175162892",
-        "identifier": "40000-0",
-        "data": {"document": {"fields": {}, "id": "40000-0", "locale": "de_de"}},
-        "incremental_update_id": None,
-        "status": "unknown",
-    })
+    firestore_client = sync_firestore_client
+
+    # ── Reset the sync project (leftovers from a previous run) ────────────────
+    reset_firestore(firestore_client)
+
+    # ── Seed both collections from fixtures/seeds/sync.json ───────────────────
+    # ProductIndexData:        new + changed + unchanged (NOT deleted)
+    # products-index-updates:  changed (stale hash, finished=True),
+    #                          unchanged (matching hash via $sha256_of, finished=True),
+    #                          deleted (operation=Update → sync will set Delete)
+    seed_manifest(firestore_client, SYNC_MANIFEST)
 
     # ── Run sync ──────────────────────────────────────────────────────────────
     env = {
         **os.environ,
         "FIRESTORE_EMULATOR_HOST": EMULATOR_HOST,
-        "GCLOUD_PROJECT":          PROJECT_ID,
+        "GCLOUD_PROJECT":          SYNC_PROJECT_ID,
         "PYTHONUTF8":              "1",
     }
 
@@ -170,3 +132,12 @@ def sync_result(firestore_client):
         firestore_client.collection("ProductIndexData").document(doc_id).delete()
     for doc_id in (PRODUCT_NEW_ID, PRODUCT_CHANGED_ID, PRODUCT_UNCHANGED_ID, PRODUCT_DELETED_ID):
         firestore_client.collection("products-index-updates").document(doc_id).delete()
+
+
+@pytest.fixture(scope="module")
+def sync_oracle(sync_result) -> OracleReport:
+    """The sync run's products-index-updates against the oracle's expected state for SYNC_MANIFEST."""
+    _, client = sync_result
+    report = verify_sync(client, prior_from_manifest(SYNC_MANIFEST))
+    print(report, flush=True)
+    return report
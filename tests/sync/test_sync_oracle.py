@@ -0,0 +1,34 @@
+"""
+Layer 2 — whole-collection sync verification.
+
+Where test_sync_logic.py checks the four scenario IDs field by field, these tests
+compare every products-index-updates document against the expected state that
+tests/sync/_oracle.py derives from ProductIndexData and the seeded queue (hashes
+computed on a process pool, merge-joined on document ID). The same check verifies
+100k-document runs of scripts/bench_sync.py.
+"""
+
+import pytest
+
+from tests.sync._data import PRODUCT_CHANGED_ID, PRODUCT_DELETED_ID, PRODUCT_NEW_ID, PRODUCT_UNCHANGED_ID
+from tests.sync._oracle import FIELDS
+
+
+RULES = ("missing", "unexpected", *FIELDS)
+
+
+@pytest.mark.sync
+class TestSyncOracle:
+
+    def test_oracle_covers_every_scenario(self, sync_oracle):
+        assert sync_oracle.scenarios == {"new": 1, "changed": 1, "unchanged": 1, "deleted": 1}, (
+            f"Expected one document per scenario "
+            f"({PRODUCT_NEW_ID}, {PRODUCT_CHANGED_ID}, {PRODUCT_UNCHANGED_ID}, {PRODUCT_DELETED_ID})\n{sync_oracle}"
+        )
+
+    @pytest.mark.parametrize("rule", RULES)
+    def test_no_mismatches(self, sync_oracle, rule):
+        assert sync_oracle.count(rule) == 0, (
+            f"{rule}: {sync_oracle.count(rule)} products-index-updates documents differ from the oracle\n"
+            f"{sync_oracle.summary(rule)}"
+        )